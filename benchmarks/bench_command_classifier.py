@@ -0,0 +1,110 @@
+"""Benchmark per-call latency of command rule matching.
+
+Compares a linear scan over the rule list against the compiled
+:class:`CommandRuleIndex` at growing catalog sizes.  Catalogs beyond the
+built-in ``COMMAND_RULES`` are padded with synthetic rules for in-house
+tools, each keyed on a subcommand, a flag or an argument glob, so the
+index sees the same mix of bucket kinds as the real rules.
+
+Commands are parsed up front; only rule matching is timed.
+
+Usage::
+
+    python benchmarks/bench_command_classifier.py --calls 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+
+from chaos_auditor.scenarios.command_parser import SimpleCommand, parse_command
+from chaos_auditor.scenarios.command_safety import (
+    BLOCKED_COMMANDS,
+    COMMAND_RULES,
+    GRAYLIST_COMMANDS,
+    SAFE_COMMANDS,
+    SEVERITY,
+    CommandRule,
+    CommandRuleIndex,
+)
+
+CATALOG_SIZES = (10, 1_000, 10_000)
+
+_SYNTHETIC_TOOLS = 200
+
+
+def rules_with(count: int) -> list[CommandRule]:
+    """Return *count* rules: ``COMMAND_RULES`` first, then synthetic ones."""
+    rules = list(COMMAND_RULES[:count])
+    for i in range(count - len(rules)):
+        exe = f"tool{i % _SYNTHETIC_TOOLS}"
+        classification = "blocked" if i % 3 == 0 else "confirm"
+        reason = f"Synthetic rule {i}"
+        if i % 5 == 4:
+            rules.append(CommandRule(exe, classification, reason, arg_glob=f"/srv/{i}/*"))
+        elif i % 2:
+            rules.append(CommandRule(exe, classification, reason, flags=frozenset({f"--opt{i}"})))
+        else:
+            rules.append(CommandRule(exe, classification, reason, args=frozenset({f"sub{i}"})))
+    return rules
+
+
+def _workload() -> list[SimpleCommand]:
+    commands = [s.command for s in BLOCKED_COMMANDS + GRAYLIST_COMMANDS + SAFE_COMMANDS]
+    commands += [f"tool{i} sub{i * 7} --verbose /srv/data" for i in range(0, 400, 13)]
+    return [simple for command in commands for simple in parse_command(command).all_commands]
+
+
+def _linear(rules: list[CommandRule]) -> Callable[[SimpleCommand], CommandRule | None]:
+    def lookup(command: SimpleCommand) -> CommandRule | None:
+        best: CommandRule | None = None
+        for rule in rules:
+            if rule.matches(command) and (
+                best is None or SEVERITY[rule.classification] > SEVERITY[best.classification]
+            ):
+                best = rule
+        return best
+
+    return lookup
+
+
+def _latency(
+    lookup: Callable[[SimpleCommand], CommandRule | None],
+    workload: list[SimpleCommand],
+    calls: int,
+) -> float:
+    """Best-of-three mean latency in microseconds."""
+    rounds = max(1, calls // len(workload))
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for command in workload:
+                lookup(command)
+        best = min(best, time.perf_counter() - start)
+    return best / (rounds * len(workload)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    workload = _workload()
+    print(f"{'rules':>7}  {'linear us/call':>15}  {'index us/call':>14}  {'speedup':>8}")
+    for size in CATALOG_SIZES:
+        rules = rules_with(size)
+        linear = _linear(rules)
+        index = CommandRuleIndex(rules)
+        for command in workload:
+            if index.lookup(command) != linear(command):
+                raise SystemExit(f"index diverged from linear scan at {size} rules")
+        linear_us = _latency(linear, workload, max(1, args.calls * 10 // size))
+        index_us = _latency(index.lookup, workload, args.calls)
+        print(f"{size:>7}  {linear_us:>15.2f}  {index_us:>14.2f}  {linear_us / index_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Benchmark secret redaction throughput on multi-megabyte logs.
+
+Compares the per-pattern substitution loop against :class:`SecretEngine`
+as the number of secret patterns grows.  Extra patterns are synthetic
+in-house token formats appended to ``SECRET_PATTERNS``.  A second,
+secret-free log without any anchor literal shows the prefilter fast path.
+The last line adds the entropy detector to the default patterns.
+
+Usage::
+
+    python benchmarks/bench_secret_redaction.py --megabytes 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from collections.abc import Callable
+
+from chaos_auditor.scenarios.entropy_detection import DEFAULT_ENTROPY_DETECTOR
+from chaos_auditor.scenarios.secret_detection import (
+    REDACTION_MARKER,
+    SECRET_PATTERNS,
+    SecretEngine,
+    SecretScenario,
+    redact_secrets,
+)
+
+PATTERN_COUNTS = (8, 32, 128, 512)
+
+_SYNTHETIC_STEMS = ("tok", "svc", "ci", "int", "pat", "live")
+
+_LOG_LINES = [
+    "2024-05-01T12:00:{:02d}Z INFO  request id={} path=/api/v1/items status=200 took=12ms",
+    "2024-05-01T12:00:{:02d}Z DEBUG cache miss key=user:{} ttl=300",
+    "2024-05-01T12:00:{:02d}Z WARN  task-{} retrying after connection reset by peer",
+    "drwxr-xr-x  2 root root 4096 May  1 12:{:02d} build-{}",
+]
+
+_CLEAN_LINES = [
+    "-rw-r--r--  1 root root {1:>8} May  1 12:{0:02d} report-{1}.json",
+    "root      {1:>6}  0.0  0.1  12:{0:02d}   0:00 /usr/sbin/nginx -g daemon off;",
+    '{{"id": {1}, "status": "ok", "elapsed_ms": {0}}}',
+]
+
+
+def build_log(
+    megabytes: float,
+    secret_every: int = 5000,
+    seed: int = 0,
+    templates: list[str] = _LOG_LINES,
+) -> str:
+    """Build a synthetic log of roughly *megabytes*, with a secret every *secret_every* lines.
+
+    ``secret_every=0`` produces a log without secrets.
+    """
+    rng = random.Random(seed)
+    target = int(megabytes * 1024 * 1024)
+    lines: list[str] = []
+    size = 0
+    i = 0
+    while size < target:
+        if secret_every and i % secret_every == secret_every - 1:
+            line = f"env dump: {rng.choice(SECRET_PATTERNS).input_text}"
+        else:
+            line = rng.choice(templates).format(i % 60, i)
+        lines.append(line)
+        size += len(line) + 1
+        i += 1
+    return "\n".join(lines)
+
+
+def scenarios_with(count: int) -> list[SecretScenario]:
+    """Return ``SECRET_PATTERNS`` padded with synthetic provider patterns."""
+    extra = []
+    for i in range(max(0, count - len(SECRET_PATTERNS))):
+        prefix = f"{_SYNTHETIC_STEMS[i % len(_SYNTHETIC_STEMS)]}{i:04d}_"
+        extra.append(
+            SecretScenario(
+                input_text=prefix + "a" * 24,
+                expected_redacted=True,
+                description=f"Synthetic token {i}",
+                provider="synthetic",
+                pattern=prefix + "[a-zA-Z0-9]{24,}",
+            )
+        )
+    return [*SECRET_PATTERNS, *extra]
+
+
+def _per_pattern(scenarios: list[SecretScenario]) -> Callable[[str], str]:
+    compiled = [re.compile(s.pattern) for s in scenarios]
+
+    def redact(text: str) -> str:
+        for pattern in compiled:
+            text = pattern.sub(REDACTION_MARKER, text)
+        return text
+
+    return redact
+
+
+def _throughput(redact: Callable[[str], str], text: str, repeat: int) -> tuple[float, str]:
+    best = float("inf")
+    result = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = redact(text)
+        best = min(best, time.perf_counter() - start)
+    return len(text) / best / (1024 * 1024), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=4.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = build_log(args.megabytes)
+    clean = build_log(args.megabytes, secret_every=0, templates=_CLEAN_LINES)
+    print(f"log size: {len(text) / (1024 * 1024):.1f} MiB")
+    print(
+        f"{'patterns':>8}  {'per-pattern MiB/s':>18}  {'engine MiB/s':>13}  "
+        f"{'speedup':>8}  {'clean log MiB/s':>16}"
+    )
+    for count in PATTERN_COUNTS:
+        scenarios = scenarios_with(count)
+        engine = SecretEngine(scenarios)
+        loop_rate, expected = _throughput(_per_pattern(scenarios), text, args.repeat)
+        engine_rate, actual = _throughput(engine.redact, text, args.repeat)
+        if actual != expected:
+            raise SystemExit(f"engine output diverged from per-pattern loop at {count} patterns")
+        clean_rate, _ = _throughput(engine.redact, clean, args.repeat)
+        print(
+            f"{count:>8}  {loop_rate:>18.1f}  {engine_rate:>13.1f}  "
+            f"{engine_rate / loop_rate:>7.2f}x  {clean_rate:>16.1f}"
+        )
+    entropy_rate, _ = _throughput(
+        lambda t: redact_secrets(t, entropy=DEFAULT_ENTROPY_DETECTOR), text, args.repeat
+    )
+    print(f"default patterns + entropy detector: {entropy_rate:.1f} MiB/s")
+
+
+if __name__ == "__main__":
+    main()
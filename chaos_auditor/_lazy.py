@@ -0,0 +1,38 @@
+"""Lazy package namespaces (PEP 562).
+
+Package ``__init__`` modules list which submodule defines each public
+name; a name is imported on first attribute access, so importing a
+package costs nothing until something from it is used.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+
+def resolve(package: str, exports: dict[str, str], namespace: dict[str, Any], name: str) -> Any:
+    """Import *name* from its submodule and cache it in the package *namespace*.
+
+    Parameters
+    ----------
+    package:
+        The package's ``__name__``.
+    exports:
+        Public name -> submodule (relative to *package*) defining it.
+    namespace:
+        The package's ``globals()``.
+    name:
+        The attribute being looked up.
+    """
+    module = exports.get(name)
+    if module is None:
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{package}.{module}"), name)
+    namespace[name] = value
+    return value
+
+
+def exports_by_name(modules: dict[str, tuple[str, ...]]) -> dict[str, str]:
+    """Invert a submodule -> names table."""
+    return {name: module for module, names in modules.items() for name in names}
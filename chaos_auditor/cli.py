@@ -5,10 +5,12 @@ Provides the ``csa`` command with sub-commands for each audit phase:
 - ``csa recon``   — run contextual reconnaissance
 - ``csa attack``  — generate and execute attack vectors
 - ``csa report``  — produce the Chaos Report
+- ``csa guard serve`` — run the local guard daemon for agent hooks
 """
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 import click
@@ -37,10 +39,63 @@ def main(ctx: click.Context, config: Path | None) -> None:
 
 @main.command()
 @click.option("--repo", "-r", required=True, help="Target repository URL or local path.")
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    help="Reuse per-file results of earlier runs and analyse only changed files.",
+)
+@click.option(
+    "--cache-file",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Recon cache to use (default: one per target under ~/.local/state/csa/recon).",
+)
+@click.option("--output-format", type=click.Choice(["text", "json"]), default="text")
 @click.pass_context
-def recon(ctx: click.Context, repo: str) -> None:
+def recon(
+    ctx: click.Context, repo: str, cache: bool, cache_file: str | None, output_format: str
+) -> None:
     """Phase 1: Contextual Reconnaissance — map tech stack, endpoints, and dependencies."""
-    raise NotImplementedError("Recon phase not yet implemented.")
+    import tempfile
+    from dataclasses import asdict
+
+    from chaos_auditor.recon.recon_cache import ReconResult, recon_cache_path, run_recon
+    from chaos_auditor.recon.repo_mapper import clone_repo
+
+    def run(root: Path, target: str | Path) -> ReconResult:
+        path = cache_file if cache_file is not None else recon_cache_path(target)
+        return run_recon(root, cache_file=path, use_cache=cache)
+
+    if Path(repo).is_dir():
+        result = run(Path(repo), Path(repo))
+    elif "://" in repo or repo.startswith("git@"):
+        with tempfile.TemporaryDirectory(prefix="csa-recon-") as tmp:
+            try:
+                root = clone_repo(repo, Path(tmp) / "repo")
+            except RuntimeError as exc:
+                raise click.ClickException(str(exc)) from exc
+            result = run(root, repo)
+    else:
+        raise click.BadParameter(f"{repo!r} is neither a directory nor a URL", param_hint="--repo")
+
+    if output_format == "json":
+        click.echo(json.dumps(asdict(result), indent=2, default=str))
+        return
+    profile, surface = result.profile, result.surface
+    for label, values in [
+        ("Languages", profile.languages),
+        ("Frameworks", profile.frameworks),
+        ("Build systems", profile.build_systems),
+        ("Manifests", [str(p.relative_to(profile.path)) for p in profile.package_files]),
+    ]:
+        click.echo(f"{label}: {', '.join(values) or '-'}")
+    click.echo(f"Endpoints ({len(surface.endpoints)}):")
+    for e in surface.endpoints:
+        auth = "auth" if e.auth_required else "open"
+        click.echo(f"  {e.method:7s} {e.path}  [{auth}]  {e.source}")
+    click.echo(f"Webhooks: {', '.join(surface.webhooks) or '-'}")
+    click.echo(f"Database schemas: {', '.join(surface.db_schemas) or '-'}")
+    click.echo(f"Analysed {result.analysed} files, reused {result.reused} cached results.")
 
 
 @main.command()
@@ -75,5 +130,25 @@ def report(ctx: click.Context, output: str) -> None:
     raise NotImplementedError("Report generation not yet implemented.")
 
 
+@main.group()
+def guard() -> None:
+    """Local guard daemon answering command, path, content and redaction checks."""
+
+
+@guard.command("serve")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Unix socket to listen on (default: $XDG_RUNTIME_DIR/csa-guard.sock).",
+)
+def guard_serve(socket_path: str | None) -> None:
+    """Keep the rule sets loaded and serve checks over a Unix socket until interrupted."""
+    from chaos_auditor.guard.server import run
+
+    run(socket_path, on_ready=lambda path: click.echo(f"Guard listening on {path}", err=True))
+
+
 if __name__ == "__main__":
     main()
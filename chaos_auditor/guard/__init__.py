@@ -0,0 +1,18 @@
+"""Guard daemon — scenario checks as a long-lived local service.
+
+``csa guard serve`` loads the scenario rule sets once and answers
+command classification, path and content checks and secret redaction
+over a Unix domain socket (see :mod:`chaos_auditor.guard.server`).
+Hooks talk to it through :class:`GuardClient`, which does not import
+the scenario catalogs.
+"""
+
+from chaos_auditor.guard.client import GuardClient
+from chaos_auditor.guard.protocol import GuardError, Op, default_socket_path
+
+__all__ = [
+    "GuardClient",
+    "GuardError",
+    "Op",
+    "default_socket_path",
+]
@@ -0,0 +1,170 @@
+"""Blocking client for the guard daemon.
+
+Imports only the standard library and :mod:`chaos_auditor.guard.protocol`,
+so a hook can start, ask and exit without loading the scenario catalogs.
+One client holds one connection; use one client per thread.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+from types import TracebackType
+
+from chaos_auditor.guard.protocol import (
+    HEADER,
+    MAX_FRAME_SIZE,
+    GuardError,
+    Op,
+    Status,
+    Verdict,
+    check_socket_dir,
+    decode_body,
+    decode_verdict,
+    default_socket_path,
+    encode_frame,
+    peer_uid,
+)
+
+
+def _absolute(path: str, cwd: str | None) -> str:
+    if path.startswith(("/", "~")):
+        return path
+    return os.path.join(os.getcwd() if cwd is None else cwd, path)
+
+
+class GuardClient:
+    """Connection to a running ``csa guard serve`` daemon.
+
+    Parameters
+    ----------
+    path:
+        Socket path; defaults to
+        :func:`~chaos_auditor.guard.protocol.default_socket_path`.
+    timeout:
+        Seconds to wait for a response, or ``None`` to wait forever.
+
+    Requests raise :class:`PermissionError` when the socket directory is
+    not private to the current user or the daemon runs as another user.
+    """
+
+    def __init__(self, path: str | None = None, timeout: float | None = 5.0) -> None:
+        self.path = path if path is not None else default_socket_path()
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+        self._header = bytearray(HEADER.size)
+
+    def _connect(self) -> socket.socket:
+        check_socket_dir(self.path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+            uid = peer_uid(sock)
+            if uid is not None and uid != os.getuid():
+                raise PermissionError(f"guard socket {self.path} is served by uid {uid}")
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        return sock
+
+    def _recv_into(self, sock: socket.socket, buffer: bytearray) -> None:
+        view = memoryview(buffer)
+        while view:
+            received = sock.recv_into(view)
+            if not received:
+                raise ConnectionResetError("guard daemon closed the connection")
+            view = view[received:]
+
+    def _exchange(self, frame: bytes) -> tuple[int, bytearray]:
+        sock = self._sock if self._sock is not None else self._connect()
+        try:
+            sock.sendall(frame)
+            self._recv_into(sock, self._header)
+            length, status = HEADER.unpack(self._header)
+            if length > MAX_FRAME_SIZE:
+                raise GuardError(f"response of {length} bytes exceeds {MAX_FRAME_SIZE}")
+            data = bytearray(length)
+            self._recv_into(sock, data)
+        except BaseException:
+            self.close()
+            raise
+        return status, data
+
+    def request(self, op: int, body: str) -> str:
+        """Send one request and return the response body.
+
+        Raises
+        ------
+        GuardError
+            If the daemon rejects the request.
+        OSError
+            If the daemon cannot be reached or drops the connection.
+        """
+        frame = encode_frame(op, body)
+        reused = self._sock is not None
+        try:
+            status, data = self._exchange(frame)
+        except ConnectionError:
+            if not reused:
+                raise
+            # The daemon restarted since the last request.  Requests have
+            # no side effects, so sending it again is safe.
+            status, data = self._exchange(frame)
+        if status != Status.OK:
+            raise GuardError(decode_body(data))
+        return decode_body(data)
+
+    def ping(self) -> bool:
+        """Whether the daemon answers."""
+        return self.request(Op.PING, "ping") == "ping"
+
+    def classify_command(self, command: str) -> Verdict:
+        """Remote :func:`~chaos_auditor.scenarios.classify_command`."""
+        return decode_verdict(self.request(Op.CLASSIFY_COMMAND, command))
+
+    def classify_interpreter_command(self, command: str) -> Verdict:
+        """Remote :func:`~chaos_auditor.scenarios.classify_interpreter_command`."""
+        return decode_verdict(self.request(Op.CLASSIFY_INTERPRETER, command))
+
+    def check_read_safety(self, path: str, *, cwd: str | None = None) -> Verdict:
+        """Remote :func:`~chaos_auditor.scenarios.check_read_safety`.
+
+        A relative *path* is resolved here, against *cwd* or this
+        process's working directory, not the daemon's.
+        """
+        return decode_verdict(self.request(Op.CHECK_READ, _absolute(path, cwd)))
+
+    def check_write_safety(self, path: str, *, cwd: str | None = None) -> Verdict:
+        """Remote :func:`~chaos_auditor.scenarios.check_write_safety`.
+
+        A relative *path* is resolved here, against *cwd* or this
+        process's working directory, not the daemon's.
+        """
+        return decode_verdict(self.request(Op.CHECK_WRITE, _absolute(path, cwd)))
+
+    def scan_write_content(self, content: str) -> Verdict:
+        """Remote :func:`~chaos_auditor.scenarios.scan_write_content`."""
+        return decode_verdict(self.request(Op.SCAN_CONTENT, content))
+
+    def redact_secrets(self, text: str) -> str:
+        """Remote :func:`~chaos_auditor.scenarios.redact_secrets`."""
+        return self.request(Op.REDACT, text)
+
+    def close(self) -> None:
+        """Close the connection; the next request reconnects."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def __enter__(self) -> GuardClient:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
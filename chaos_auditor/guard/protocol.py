@@ -0,0 +1,134 @@
+"""Wire format shared by the guard daemon and its client.
+
+Every message is a single frame: a five-byte header holding the body
+length as a big-endian ``uint32`` and a one-byte opcode (requests) or
+status (responses), followed by the UTF-8 body.  Verdicts travel as
+``classification`` or ``classification NUL reason``.
+
+Only the daemon's own user may talk to it: the socket lives in a
+directory private to that user (see :func:`check_socket_dir`), and both
+ends check the other's uid with ``SO_PEERCRED`` where the platform has
+it (:func:`peer_uid`).
+
+This module imports nothing from the scenario catalogs, so clients
+start quickly.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import stat
+import struct
+from enum import IntEnum
+
+HEADER = struct.Struct("!IB")
+
+# struct ucred: pid, uid, gid.
+_PEER_CREDENTIALS = struct.Struct("3i")
+
+# Largest frame body either side accepts.
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+Verdict = tuple[str, str | None]
+
+
+class Op(IntEnum):
+    """Request opcodes."""
+
+    PING = 0
+    CLASSIFY_COMMAND = 1
+    CLASSIFY_INTERPRETER = 2
+    CHECK_READ = 3
+    CHECK_WRITE = 4
+    SCAN_CONTENT = 5
+    REDACT = 6
+
+
+class Status(IntEnum):
+    """Response status codes."""
+
+    OK = 0
+    ERROR = 1
+
+
+class GuardError(RuntimeError):
+    """The guard daemon rejected a request or broke the protocol."""
+
+
+def default_socket_path() -> str:
+    """Per-user socket path: ``$XDG_RUNTIME_DIR/csa-guard.sock`` or one in the temp dir.
+
+    The fallback is ``csa-guard-<uid>/guard.sock``, in a directory the
+    daemon creates private to its user (:func:`check_socket_dir`).
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "csa-guard.sock")
+    import tempfile  # not at module level: it costs more than the rest of a client start
+
+    return os.path.join(tempfile.gettempdir(), f"csa-guard-{os.getuid()}", "guard.sock")
+
+
+def check_socket_dir(path: str, *, create: bool = False) -> None:
+    """Make sure the directory holding socket *path* is private to the current user.
+
+    Parameters
+    ----------
+    path:
+        Socket path.
+    create:
+        Create the directory, mode ``0700``, if it does not exist.
+
+    Raises
+    ------
+    PermissionError
+        If the directory is a symlink, is not a directory, belongs to
+        another user or is accessible by group or others.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if create:
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+    info = os.lstat(directory)
+    uid = os.getuid()
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != uid or info.st_mode & 0o077:
+        raise PermissionError(
+            f"socket directory {directory} must be a directory of uid {uid} with mode 0700, "
+            f"got uid {info.st_uid} and mode {stat.filemode(info.st_mode)}"
+        )
+
+
+def peer_uid(sock: socket.socket) -> int | None:
+    """Uid of the process at the other end of Unix socket *sock*, if the platform tells."""
+    option = getattr(socket, "SO_PEERCRED", None)
+    if option is None:
+        return None
+    credentials = sock.getsockopt(socket.SOL_SOCKET, option, _PEER_CREDENTIALS.size)
+    _, uid, _ = _PEER_CREDENTIALS.unpack(credentials)
+    return int(uid)
+
+
+def encode_frame(code: int, body: str) -> bytes:
+    """Return the frame carrying *body* under opcode or status *code*."""
+    data = body.encode("utf-8", "surrogatepass")
+    if len(data) > MAX_FRAME_SIZE:
+        raise ValueError(f"frame body must be at most {MAX_FRAME_SIZE} bytes, got {len(data)}")
+    return HEADER.pack(len(data), code) + data
+
+
+def decode_body(data: bytes | bytearray) -> str:
+    """Inverse of the body encoding used by :func:`encode_frame`."""
+    return data.decode("utf-8", "surrogatepass")
+
+
+def encode_verdict(verdict: Verdict) -> str:
+    classification, reason = verdict
+    return classification if reason is None else f"{classification}\0{reason}"
+
+
+def decode_verdict(body: str) -> Verdict:
+    classification, _, reason = body.partition("\0")
+    return classification, reason if _ else None
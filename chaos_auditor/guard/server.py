@@ -0,0 +1,190 @@
+"""The guard daemon: scenario checks served over a Unix domain socket.
+
+Hooks that run once per agent action cannot afford to import the
+scenario catalogs and compile their rule sets every time.  The daemon
+does it once and answers requests framed as described in
+:mod:`chaos_auditor.guard.protocol`; each connection may send any
+number of requests, answered in order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import signal
+import socket
+import stat
+from collections.abc import Callable
+
+from chaos_auditor.guard.protocol import (
+    HEADER,
+    MAX_FRAME_SIZE,
+    Op,
+    Status,
+    check_socket_dir,
+    decode_body,
+    default_socket_path,
+    encode_frame,
+    encode_verdict,
+    peer_uid,
+)
+from chaos_auditor.scenarios.command_safety import classify_command
+from chaos_auditor.scenarios.content_scanning import scan_write_content
+from chaos_auditor.scenarios.file_access import check_read_safety, check_write_safety
+from chaos_auditor.scenarios.interpreter_evasion import classify_interpreter_command
+from chaos_auditor.scenarios.secret_detection import redact_secrets
+
+HANDLERS: dict[int, Callable[[str], str]] = {
+    Op.PING: lambda body: body,
+    Op.CLASSIFY_COMMAND: lambda body: encode_verdict(classify_command(body)),
+    Op.CLASSIFY_INTERPRETER: lambda body: encode_verdict(classify_interpreter_command(body)),
+    Op.CHECK_READ: lambda body: encode_verdict(check_read_safety(body)),
+    Op.CHECK_WRITE: lambda body: encode_verdict(check_write_safety(body)),
+    Op.SCAN_CONTENT: lambda body: encode_verdict(scan_write_content(body)),
+    Op.REDACT: redact_secrets,
+}
+
+
+def _respond(op: int, body: bytes) -> bytes:
+    handler = HANDLERS.get(op)
+    if handler is None:
+        return encode_frame(Status.ERROR, f"unknown opcode {op}")
+    try:
+        return encode_frame(Status.OK, handler(decode_body(body)))
+    except Exception as exc:  # report to the client instead of dropping the connection
+        return encode_frame(Status.ERROR, f"{type(exc).__name__}: {exc}")
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Unlink a socket left behind by a dead daemon; refuse to replace a live one."""
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"a guard daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+
+class GuardServer:
+    """Asyncio server answering guard requests on a Unix domain socket.
+
+    Requests are handled on worker threads, so a slow check does not
+    stall the other connections.  Connections from other users are
+    closed unanswered.
+
+    Parameters
+    ----------
+    path:
+        Socket path; defaults to
+        :func:`~chaos_auditor.guard.protocol.default_socket_path`.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path if path is not None else default_socket_path()
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task[None]] = set()
+
+    async def start(self) -> None:
+        """Warm the rule sets, then bind and listen in a directory private to the owner."""
+        for handler in HANDLERS.values():
+            handler("true")
+        check_socket_dir(self.path, create=True)
+        _remove_stale_socket(self.path)
+        old_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle, self.path)
+        finally:
+            os.umask(old_umask)
+
+    async def serve_forever(self) -> None:
+        """Serve until :meth:`close` is called or the task is cancelled."""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop listening, drop open connections and remove the socket file."""
+        if self._server is not None:
+            self._server.close()
+            for task in self._connections:
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections.add(task)
+        try:
+            uid = peer_uid(writer.get_extra_info("socket"))
+            while uid is None or uid == os.getuid():
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                length, op = HEADER.unpack(header)
+                if length > MAX_FRAME_SIZE:
+                    writer.write(
+                        encode_frame(
+                            Status.ERROR,
+                            f"frame body must be at most {MAX_FRAME_SIZE} bytes, got {length}",
+                        )
+                    )
+                    await writer.drain()
+                    break
+                body = await reader.readexactly(length)
+                response = await loop.run_in_executor(None, _respond, op, body)
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+
+def run(path: str | None = None, *, on_ready: Callable[[str], None] | None = None) -> None:
+    """Run a :class:`GuardServer` until SIGINT or SIGTERM.
+
+    Parameters
+    ----------
+    path:
+        Socket path; see :class:`GuardServer`.
+    on_ready:
+        Called with the socket path once the daemon is listening.
+    """
+
+    async def main() -> None:
+        server = GuardServer(path)
+        await server.start()
+        task = asyncio.current_task()
+        assert task is not None
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, task.cancel)
+        if on_ready is not None:
+            on_ready(server.path)
+        await server.serve_forever()
+
+    with contextlib.suppress(asyncio.CancelledError):
+        asyncio.run(main())
@@ -2,21 +2,66 @@
 
 Modules in this package map the target's technology stack, attack surface,
 and known dependency vulnerabilities before any active testing begins.
+Each module is imported on first use of one of its names.
 """
 
-from chaos_auditor.recon.dependency_audit import VulnerablePackage, audit_dependencies, scan_manifests
-from chaos_auditor.recon.repo_mapper import RepoProfile, clone_repo, detect_stack
-from chaos_auditor.recon.surface_analyzer import AttackSurface, Endpoint, map_attack_surface, map_endpoints
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from chaos_auditor._lazy import exports_by_name, resolve
+
+if TYPE_CHECKING:
+    from chaos_auditor.recon.dependency_audit import (
+        VulnerablePackage,
+        audit_dependencies,
+        scan_manifests,
+    )
+    from chaos_auditor.recon.recon_cache import ReconResult, run_recon
+    from chaos_auditor.recon.repo_index import IndexedFile, RepoIndex
+    from chaos_auditor.recon.repo_mapper import RepoProfile, clone_repo, detect_stack
+    from chaos_auditor.recon.repo_walker import WalkedFile, walk_repo
+    from chaos_auditor.recon.surface_analyzer import (
+        AttackSurface,
+        Endpoint,
+        map_attack_surface,
+        map_endpoints,
+    )
+
+_EXPORTS = exports_by_name(
+    {
+        "dependency_audit": ("VulnerablePackage", "audit_dependencies", "scan_manifests"),
+        "recon_cache": ("ReconResult", "run_recon"),
+        "repo_index": ("IndexedFile", "RepoIndex"),
+        "repo_mapper": ("RepoProfile", "clone_repo", "detect_stack"),
+        "repo_walker": ("WalkedFile", "walk_repo"),
+        "surface_analyzer": ("AttackSurface", "Endpoint", "map_attack_surface", "map_endpoints"),
+    }
+)
 
 __all__ = [
     "AttackSurface",
     "Endpoint",
+    "IndexedFile",
+    "ReconResult",
+    "RepoIndex",
     "RepoProfile",
     "VulnerablePackage",
+    "WalkedFile",
     "audit_dependencies",
     "clone_repo",
     "detect_stack",
     "map_attack_surface",
     "map_endpoints",
+    "run_recon",
     "scan_manifests",
+    "walk_repo",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    return resolve(__name__, _EXPORTS, globals(), name)
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -9,8 +9,36 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from chaos_auditor import Severity
+from chaos_auditor.recon.repo_walker import walk_repo
+
+if TYPE_CHECKING:
+    from chaos_auditor.recon.repo_index import RepoIndex
+
+# Files that declare dependencies, by name; see manifest_kind for
+# requirements*.txt and .NET project files.
+MANIFEST_FILES = frozenset(
+    {
+        "package.json",
+        "requirements.txt",
+        "pyproject.toml",
+        "setup.py",
+        "setup.cfg",
+        "Pipfile",
+        "go.mod",
+        "Cargo.toml",
+        "pom.xml",
+        "build.gradle",
+        "build.gradle.kts",
+        "Gemfile",
+        "composer.json",
+        "mix.exs",
+        "pubspec.yaml",
+        "packages.config",
+    }
+)
 
 
 @dataclass
@@ -24,20 +52,42 @@ class VulnerablePackage:
     fixed_version: str | None = None
 
 
-def scan_manifests(repo_root: Path) -> list[Path]:
+def manifest_kind(name: str) -> str | None:
+    """Return the kind of manifest a file name is, or ``None``.
+
+    The kind is the name itself for :data:`MANIFEST_FILES`,
+    ``"requirements.txt"`` for every ``requirements*.txt`` and
+    ``".csproj"`` for .NET project files.
+    """
+    if name in MANIFEST_FILES:
+        return name
+    if name.startswith("requirements") and name.endswith(".txt"):
+        return "requirements.txt"
+    if name.endswith((".csproj", ".fsproj", ".vbproj")):
+        return ".csproj"
+    return None
+
+
+def scan_manifests(repo_root: Path, *, index: RepoIndex | None = None) -> list[Path]:
     """Locate all package manifest files in the repository.
 
     Parameters
     ----------
     repo_root:
         Path to the target repository root.
+    index:
+        Prebuilt index of *repo_root*; without one, the tree is walked.
 
     Returns
     -------
     list[Path]
-        Paths to detected manifest files.
+        Paths to detected manifest files, sorted.
     """
-    raise NotImplementedError
+    if index is not None:
+        paths = [f.path for f in index if manifest_kind(f.name) is not None]
+    else:
+        paths = [f.path for f in walk_repo(repo_root) if manifest_kind(f.name) is not None]
+    return sorted(repo_root / path for path in paths)
 
 
 def audit_dependencies(manifest: Path) -> list[VulnerablePackage]:
@@ -0,0 +1,303 @@
+"""Incremental recon — reuse per-file results from earlier runs.
+
+Stack detection and attack-surface mapping read the contents of only a
+few kinds of files: package manifests, sources in languages with route
+declarations, and extensionless scripts, whose shebang gives their
+language.  :func:`run_recon` keeps what those reads produced — the
+sniffed language, manifest markers and endpoints — in a JSON file per
+repository, under :func:`default_recon_cache_dir`, and on the next run
+reads and analyses again only the files whose fingerprint changed:
+
+- a tracked file whose work tree copy matches the git index is keyed by
+  its blob id, so checkouts, clones and ``touch`` keep its entry;
+- any other file, and every file outside a git work tree, is keyed by
+  its mtime and size.
+
+Everything else recon reports comes from file names and is recomputed
+from the walk.  The cache header carries a hash of the recon sources; a
+cache that is corrupt or written by other sources is ignored, and files
+deleted since the last run drop out when it is saved.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from chaos_auditor import __version__
+from chaos_auditor.recon.dependency_audit import manifest_kind
+from chaos_auditor.recon.repo_index import RepoIndex
+from chaos_auditor.recon.repo_mapper import (
+    BUILD_FILES,
+    MANIFEST_MARKERS,
+    MAX_MANIFEST_BYTES,
+    RepoProfile,
+    manifest_signals,
+)
+from chaos_auditor.recon.repo_walker import WalkedFile, language_for
+from chaos_auditor.recon.surface_analyzer import (
+    MAX_SOURCE_BYTES,
+    ROUTE_LANGUAGES,
+    AttackSurface,
+    Endpoint,
+    extract_endpoints,
+    is_schema_file,
+    webhook_paths,
+)
+
+RECON_CACHE_FORMAT = 1
+
+# Modules whose source decides what a cached result contains.
+RECON_MODULES = (
+    "chaos_auditor.recon.dependency_audit",
+    "chaos_auditor.recon.recon_cache",
+    "chaos_auditor.recon.repo_index",
+    "chaos_auditor.recon.repo_mapper",
+    "chaos_auditor.recon.repo_walker",
+    "chaos_auditor.recon.surface_analyzer",
+)
+
+# Per path: [fingerprint, language, [[field, label], ...],
+# [[method, path, auth_required, parameters, source], ...]].
+_Record = list[Any]
+
+
+@dataclass
+class ReconResult:
+    """Outcome of :func:`run_recon`."""
+
+    profile: RepoProfile
+    surface: AttackSurface
+    analysed: int  # files read and analysed in this run
+    reused: int  # files whose cached results were reused
+
+
+def default_recon_cache_dir() -> str:
+    """``$XDG_STATE_HOME/csa/recon``, falling back to ``~/.local/state``."""
+    state = os.environ.get("XDG_STATE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "state"
+    )
+    return os.path.join(state, "csa", "recon")
+
+
+def recon_cache_path(target: str | Path) -> str:
+    """Cache file for a target: a local path (resolved) or a remote URL."""
+    key = target if isinstance(target, str) and "://" in target else str(Path(target).resolve())
+    name = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return os.path.join(default_recon_cache_dir(), f"{name}.json")
+
+
+def source_hash() -> str:
+    """Hash identifying the recon sources a cache must have been written by."""
+    digest = hashlib.sha256(repr((RECON_CACHE_FORMAT, __version__)).encode())
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for module in RECON_MODULES:
+        with open(os.path.join(root, *module.split(".")) + ".py", "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+
+def needs_content(name: str) -> bool:
+    """Whether recon results for files named *name* depend on their contents."""
+    return (
+        "." not in name
+        or language_for(name) in ROUTE_LANGUAGES
+        or manifest_kind(name) in MANIFEST_MARKERS
+    )
+
+
+def _git(repo_root: Path, *args: str) -> bytes | None:
+    try:
+        done = subprocess.run(
+            ["git", "-C", str(repo_root), *args],
+            capture_output=True,
+            check=False,
+        )
+    except OSError:
+        return None
+    return done.stdout if done.returncode == 0 else None
+
+
+def git_blob_ids(repo_root: Path) -> dict[str, str]:
+    """Blob ids of the tracked files under *repo_root* whose work tree copy is unmodified.
+
+    Paths are relative to *repo_root*.  Empty outside a git work tree or
+    without ``git``.
+    """
+    staged = _git(repo_root, "ls-files", "--stage", "-z")
+    modified = _git(repo_root, "ls-files", "--modified", "-z")
+    if staged is None or modified is None:
+        return {}
+    dirty = set(modified.split(b"\0"))
+    blobs: dict[str, str] = {}
+    for entry in staged.split(b"\0"):
+        info, _, path = entry.partition(b"\t")
+        fields = info.split()
+        # Skip submodules (mode 160000) and unmerged entries (stage > 0).
+        if len(fields) != 3 or fields[0] == b"160000" or fields[2] != b"0" or path in dirty:
+            continue
+        blobs[os.fsdecode(path)] = fields[1].decode()
+    return blobs
+
+
+def _fingerprint(path: str, size: int, mtime_ns: int, blobs: dict[str, str]) -> str:
+    blob = blobs.get(path)
+    return f"git:{blob}" if blob is not None else f"stat:{mtime_ns}:{size}"
+
+
+def load_recon_cache(path: str) -> dict[str, _Record]:
+    """Per-file records of the cache at *path*; empty if missing, corrupt or stale."""
+    try:
+        with open(path, "rb") as f:
+            body = json.load(f)
+        if body["format"] != RECON_CACHE_FORMAT or body["source_hash"] != source_hash():
+            return {}
+        files: dict[str, _Record] = body["files"]
+        if not all(isinstance(r, list) and len(r) == 4 for r in files.values()):
+            return {}
+        return files
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return {}
+
+
+def save_recon_cache(path: str, files: dict[str, _Record]) -> None:
+    """Write per-file records to *path* atomically."""
+    body = {"format": RECON_CACHE_FORMAT, "source_hash": source_hash(), "files": files}
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".recon-")
+    try:
+        with os.fdopen(fd, "w") as out:
+            json.dump(body, out, separators=(",", ":"))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _analyse(index: RepoIndex, path: str, language: str | None, fp: str) -> _Record:
+    name = path.rpartition("/")[2]
+    signals: list[tuple[str, str]] = []
+    kind = manifest_kind(name)
+    if kind is not None and kind in MANIFEST_MARKERS:
+        signals = manifest_signals(kind, index.read(path, MAX_MANIFEST_BYTES))
+    endpoints: list[Endpoint] = []
+    if language in ROUTE_LANGUAGES:
+        endpoints = extract_endpoints(path, index.read(path, MAX_SOURCE_BYTES), language)
+    return [
+        fp,
+        language,
+        [list(s) for s in signals],
+        [[e.method, e.path, e.auth_required, e.parameters, e.source] for e in endpoints],
+    ]
+
+
+def _endpoints(records: Iterable[_Record]) -> list[Endpoint]:
+    return [
+        Endpoint(m, p, auth, list(params), src) for r in records for m, p, auth, params, src in r[3]
+    ]
+
+
+def run_recon(
+    repo_root: Path,
+    *,
+    cache_file: str | None = None,
+    use_cache: bool = True,
+    workers: int | None = None,
+) -> ReconResult:
+    """Detect the stack and map the attack surface of *repo_root*, incrementally.
+
+    The results equal those of
+    :func:`~chaos_auditor.recon.repo_mapper.detect_stack` and
+    :func:`~chaos_auditor.recon.surface_analyzer.map_attack_surface`
+    given a :class:`~chaos_auditor.recon.repo_index.RepoIndex`.
+
+    Parameters
+    ----------
+    repo_root:
+        Path to the target repository root.
+    cache_file:
+        Cache to read and update; defaults to :func:`recon_cache_path`
+        of *repo_root*.
+    use_cache:
+        ``False`` analyses every file and neither reads nor writes a
+        cache.
+    workers:
+        Threads walking the tree; see
+        :func:`~chaos_auditor.recon.repo_walker.walk_repo`.
+
+    Returns
+    -------
+    ReconResult
+        Stack profile, attack surface, and how many files were analysed
+        and reused.
+    """
+    path = cache_file if cache_file is not None else recon_cache_path(repo_root)
+    cached = load_recon_cache(path) if use_cache else {}
+    blobs = git_blob_ids(repo_root) if use_cache else {}
+
+    def changed(file: WalkedFile) -> bool:
+        if not needs_content(file.name):
+            return False
+        assert file.size is not None and file.mtime_ns is not None
+        record = cached.get(file.path)
+        return record is None or record[0] != _fingerprint(
+            file.path, file.size, file.mtime_ns, blobs
+        )
+
+    index = RepoIndex.build(repo_root, workers=workers, cache_if=changed)
+    records: dict[str, _Record] = {}
+    analysed = 0
+    for file in index:
+        if not needs_content(file.name):
+            continue
+        fp = _fingerprint(file.path, file.size, file.mtime_ns, blobs)
+        record = cached.get(file.path)
+        if record is None or record[0] != fp:
+            record = _analyse(index, file.path, file.language, fp)
+            analysed += 1
+        records[file.path] = record
+    if use_cache and (analysed or records.keys() != cached.keys()):
+        save_recon_cache(path, records)
+
+    counts: Counter[str] = Counter()
+    found: dict[str, set[str]] = {"frameworks": set(), "build_systems": set()}
+    package_files: list[Path] = []
+    for file in index:
+        record = records.get(file.path)
+        language = record[1] if record is not None else file.language
+        if language is not None:
+            counts[language] += 1
+        build = BUILD_FILES.get(file.name)
+        if build is not None:
+            found["build_systems"].add(build)
+        kind = manifest_kind(file.name)
+        if kind is None:
+            continue
+        package_files.append(repo_root / file.path)
+        if kind == ".csproj":
+            found["build_systems"].add("msbuild")
+        for field_name, label in record[2] if record is not None else ():
+            found[field_name].add(label)
+    profile = RepoProfile(
+        path=repo_root,
+        languages=sorted(counts, key=lambda lang: (-counts[lang], lang)),
+        frameworks=sorted(found["frameworks"]),
+        build_systems=sorted(found["build_systems"]),
+        package_files=sorted(package_files),
+    )
+    endpoints = _endpoints(records.values())
+    surface = AttackSurface(
+        endpoints=endpoints,
+        webhooks=webhook_paths(endpoints),
+        db_schemas=[f.path for f in index if is_schema_file(f.path)],
+    )
+    return ReconResult(profile, surface, analysed, len(records) - analysed)
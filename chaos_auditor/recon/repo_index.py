@@ -0,0 +1,187 @@
+"""Repository index — one traversal of a target, shared by every recon pass.
+
+:class:`RepoIndex` holds the file list of a repository (paths, sizes,
+mtimes and language tags) and the contents of its small files that
+recon passes read: sources, manifests, build files and extensionless
+scripts, which are tagged with the language of their shebang.  It is built by a single
+:func:`~chaos_auditor.recon.repo_walker.walk_repo`, whose worker
+threads read the small files as they list them, and every recon
+function accepts it through its ``index`` parameter::
+
+    index = RepoIndex.build(repo_root)
+    profile = detect_stack(repo_root, index=index)
+    surface = map_attack_surface(repo_root, index=index)
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from chaos_auditor.recon.dependency_audit import manifest_kind
+from chaos_auditor.recon.repo_walker import (
+    DEFAULT_PRUNE_DIRS,
+    SNIFF_BYTES,
+    WalkedFile,
+    language_for,
+    sniff_language,
+    walk_repo,
+)
+
+# Files up to this size are cached by default...
+DEFAULT_MAX_FILE_BYTES = 256 * 1024
+
+# ...until the cached contents reach this total.
+DEFAULT_MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class IndexedFile:
+    """A file in a :class:`RepoIndex`."""
+
+    path: str  # relative to the root, with "/" separators
+    size: int
+    mtime_ns: int
+    language: str | None  # see language_for and sniff_language
+
+    @property
+    def name(self) -> str:
+        """The final path component."""
+        return self.path.rpartition("/")[2]
+
+
+def _worth_caching(name: str) -> bool:
+    """Whether recon passes read files named *name*."""
+    return "." not in name or language_for(name) is not None or manifest_kind(name) is not None
+
+
+class RepoIndex:
+    """Files of a repository, listed once, with small contents cached.
+
+    Build it with :meth:`build`.  The index is a snapshot: it is never
+    refreshed, and it is safe to share between threads.
+
+    Parameters
+    ----------
+    root:
+        Repository root.
+    files:
+        Indexed files, in any order.
+    contents:
+        Cached contents by relative path.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        files: list[IndexedFile],
+        contents: dict[str, bytes] | None = None,
+    ) -> None:
+        self.root = root
+        self.files = tuple(sorted(files, key=lambda f: f.path))
+        self._by_path = {f.path: f for f in self.files}
+        self._contents = contents if contents is not None else {}
+
+    @classmethod
+    def build(
+        cls,
+        root: Path,
+        *,
+        workers: int | None = None,
+        prune_dirs: frozenset[str] = DEFAULT_PRUNE_DIRS,
+        gitignore: bool = True,
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+        max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+        cache_if: Callable[[WalkedFile], bool] | None = None,
+    ) -> RepoIndex:
+        """Index *root* in one traversal.
+
+        Parameters
+        ----------
+        root:
+            Repository root.
+        workers, prune_dirs, gitignore:
+            See :func:`~chaos_auditor.recon.repo_walker.walk_repo`.
+        max_file_bytes:
+            Largest file whose contents are cached.
+        max_cache_bytes:
+            Total size of cached contents; files met once it is reached
+            are read from disk when asked for.
+        cache_if:
+            Which files within those limits to cache, called on the
+            walker threads with the file's size and mtime; defaults to
+            the files recon passes read.
+
+        Returns
+        -------
+        RepoIndex
+            The index.
+        """
+        if max_file_bytes < 0:
+            raise ValueError(f"max_file_bytes must be non-negative, got {max_file_bytes}")
+        if max_cache_bytes < 0:
+            raise ValueError(f"max_cache_bytes must be non-negative, got {max_cache_bytes}")
+        lock = threading.Lock()
+        budget = max_cache_bytes
+        wanted = cache_if if cache_if is not None else lambda file: _worth_caching(file.name)
+
+        def read_if(file: WalkedFile) -> bool:
+            nonlocal budget
+            assert file.size is not None
+            if file.size > max_file_bytes or not wanted(file):
+                return False
+            with lock:
+                if file.size > budget:
+                    return False
+                budget -= file.size
+            return True
+
+        files: list[IndexedFile] = []
+        contents: dict[str, bytes] = {}
+        walk = walk_repo(
+            root, workers=workers, prune_dirs=prune_dirs, gitignore=gitignore, read_if=read_if
+        )
+        for file in walk:
+            assert file.size is not None and file.mtime_ns is not None
+            name, content = file.name, file.content
+            language = language_for(name)
+            if content is not None:
+                contents[file.path] = content
+                if language is None and "." not in name:
+                    language = sniff_language(content[:SNIFF_BYTES])
+            files.append(IndexedFile(file.path, file.size, file.mtime_ns, language))
+        return cls(root, files, contents)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __iter__(self) -> Iterator[IndexedFile]:
+        return iter(self.files)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._by_path
+
+    def get(self, path: str) -> IndexedFile | None:
+        """Return the file at relative *path*, or ``None``."""
+        return self._by_path.get(path)
+
+    def cached(self, path: str) -> bool:
+        """Whether the contents of *path* are held in memory."""
+        return path in self._contents
+
+    def read(self, path: str, size: int = -1) -> bytes:
+        """Return the first *size* bytes (all if negative) of the file at *path*.
+
+        Cached contents are served from memory; other files are read
+        from disk and not cached.  Unreadable files read as ``b""``.
+        """
+        content = self._contents.get(path)
+        if content is not None:
+            return content if size < 0 else content[:size]
+        try:
+            with open(self.root / path, "rb") as f:
+                return f.read(size)
+        except OSError:
+            return b""
@@ -4,13 +4,181 @@ Responsible for:
 - Cloning or referencing a local/remote repository.
 - Identifying languages, frameworks, and build systems.
 - Producing a :class:`RepoProfile` consumed by downstream phases.
+
+Stack detection walks the tree once with
+:func:`~chaos_auditor.recon.repo_walker.walk_repo`, or reads a
+:class:`~chaos_auditor.recon.repo_index.RepoIndex`.  Languages come from
+file names, and from the first bytes of files without an extension.
+Build systems come from file names.  Frameworks (and Python build
+backends) come from the contents of package manifests, and a manifest
+is only read while one of the markers it could reveal is still missing.
 """
 
 from __future__ import annotations
 
+import re
+import subprocess
+from collections import Counter
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from chaos_auditor.recon.dependency_audit import manifest_kind
+from chaos_auditor.recon.repo_index import IndexedFile, RepoIndex
+from chaos_auditor.recon.repo_walker import (
+    SHEBANG_LANGUAGES,
+    SNIFF_BYTES,
+    WalkedFile,
+    language_for,
+    sniff_language,
+    walk_repo,
+)
+
+# Manifest bytes searched for framework markers.
+MAX_MANIFEST_BYTES = 1 << 20
+
+BUILD_FILES = {
+    "Makefile": "make",
+    "GNUmakefile": "make",
+    "CMakeLists.txt": "cmake",
+    "meson.build": "meson",
+    "WORKSPACE": "bazel",
+    "MODULE.bazel": "bazel",
+    "pom.xml": "maven",
+    "build.gradle": "gradle",
+    "build.gradle.kts": "gradle",
+    "build.sbt": "sbt",
+    "build.xml": "ant",
+    "Cargo.toml": "cargo",
+    "go.mod": "go modules",
+    "package.json": "npm",
+    "yarn.lock": "yarn",
+    "pnpm-lock.yaml": "pnpm",
+    "setup.py": "setuptools",
+    "Pipfile": "pipenv",
+    "poetry.lock": "poetry",
+    "Gemfile": "bundler",
+    "composer.json": "composer",
+    "mix.exs": "mix",
+    "pubspec.yaml": "pub",
+    "Package.swift": "swiftpm",
+}
+
+
+def _dependency(name: str) -> re.Pattern[bytes]:
+    """A dependency name as a whole token, case-insensitively."""
+    return re.compile(rb"(?<![\w.@/-])" + re.escape(name.encode()) + rb"(?![\w.-])", re.I)
+
+
+def _package_json(name: str) -> re.Pattern[bytes]:
+    return re.compile(rb'"' + re.escape(name.encode()) + rb'"\s*:')
+
+
+def _mentions(text: str) -> re.Pattern[bytes]:
+    return re.compile(re.escape(text.encode()), re.I)
+
+
+_PYTHON = tuple(
+    ("frameworks", label, _dependency(name))
+    for label, name in [
+        ("django", "django"),
+        ("flask", "flask"),
+        ("fastapi", "fastapi"),
+        ("starlette", "starlette"),
+        ("tornado", "tornado"),
+        ("aiohttp", "aiohttp"),
+    ]
+)
+_JVM = (
+    ("frameworks", "spring boot", _mentions("spring-boot")),
+    ("frameworks", "quarkus", _mentions("io.quarkus")),
+    ("frameworks", "micronaut", _mentions("io.micronaut")),
+)
+_BACKENDS = {
+    "hatchling.build": "hatch",
+    "setuptools.build_meta": "setuptools",
+    "poetry.core.masonry.api": "poetry",
+    "flit_core.buildapi": "flit",
+    "pdm.backend": "pdm",
+    "maturin": "maturin",
+}
+
+# Per manifest kind: (RepoProfile field, label, pattern) markers.
+MANIFEST_MARKERS: dict[str, tuple[tuple[str, str, re.Pattern[bytes]], ...]] = {
+    "package.json": tuple(
+        ("frameworks", label, _package_json(name))
+        for label, name in [
+            ("react", "react"),
+            ("vue", "vue"),
+            ("angular", "@angular/core"),
+            ("svelte", "svelte"),
+            ("next.js", "next"),
+            ("express", "express"),
+            ("nestjs", "@nestjs/core"),
+            ("fastify", "fastify"),
+            ("koa", "koa"),
+        ]
+    ),
+    "requirements.txt": _PYTHON,
+    "pyproject.toml": _PYTHON
+    + tuple(
+        ("build_systems", label, re.compile(rb"build-backend\s*=\s*[\"']" + re.escape(b.encode())))
+        for b, label in _BACKENDS.items()
+    ),
+    "setup.py": _PYTHON,
+    "setup.cfg": _PYTHON,
+    "Pipfile": _PYTHON,
+    "go.mod": (
+        ("frameworks", "gin", _mentions("github.com/gin-gonic/gin")),
+        ("frameworks", "echo", _mentions("github.com/labstack/echo")),
+        ("frameworks", "fiber", _mentions("github.com/gofiber/fiber")),
+        ("frameworks", "gorilla/mux", _mentions("github.com/gorilla/mux")),
+    ),
+    "pom.xml": _JVM,
+    "build.gradle": _JVM,
+    "build.gradle.kts": _JVM,
+    "Gemfile": (
+        ("frameworks", "rails", _dependency("rails")),
+        ("frameworks", "sinatra", _dependency("sinatra")),
+    ),
+    "composer.json": (
+        ("frameworks", "laravel", _mentions("laravel/framework")),
+        ("frameworks", "symfony", _mentions("symfony/framework-bundle")),
+    ),
+    "Cargo.toml": (
+        ("frameworks", "actix-web", _dependency("actix-web")),
+        ("frameworks", "axum", _dependency("axum")),
+        ("frameworks", "rocket", _dependency("rocket")),
+    ),
+    "mix.exs": (("frameworks", "phoenix", _dependency(":phoenix")),),
+}
+
+
+def manifest_signals(kind: str, content: bytes) -> list[tuple[str, str]]:
+    """Return the ``(RepoProfile field, label)`` markers found in a manifest.
+
+    Parameters
+    ----------
+    kind:
+        Manifest kind, from
+        :func:`~chaos_auditor.recon.dependency_audit.manifest_kind`.
+    content:
+        Contents of the manifest, up to :data:`MAX_MANIFEST_BYTES`.
+    """
+    return [
+        (f, label)
+        for f, label, pattern in MANIFEST_MARKERS.get(kind, ())
+        if pattern.search(content)
+    ]
+
+
+def _read(path: Path, size: int) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            return f.read(size)
+    except OSError:
+        return b""
+
 
 @dataclass
 class RepoProfile:
@@ -37,21 +205,96 @@ def clone_repo(url: str, dest: Path) -> Path:
     -------
     Path
         The root of the cloned repository.
+
+    Raises
+    ------
+    RuntimeError
+        If ``git`` is missing or the clone fails.
     """
-    raise NotImplementedError
+    try:
+        subprocess.run(
+            ["git", "clone", "--quiet", "--depth", "1", "--", url, str(dest)],
+            capture_output=True,
+            check=True,
+        )
+    except FileNotFoundError as exc:
+        raise RuntimeError("git is required to clone a repository") from exc
+    except subprocess.CalledProcessError as exc:
+        detail = exc.stderr.decode(errors="replace").strip()
+        raise RuntimeError(f"git clone {url} failed: {detail}") from exc
+    return dest
 
 
-def detect_stack(repo_root: Path) -> RepoProfile:
+def detect_stack(
+    repo_root: Path, *, index: RepoIndex | None = None, workers: int | None = None
+) -> RepoProfile:
     """Analyse a repository and return its :class:`RepoProfile`.
 
+    Gitignored, vendored and dependency directories are skipped (see
+    :func:`~chaos_auditor.recon.repo_walker.walk_repo`).  Without an
+    index, files without an extension are sniffed for a shebang only
+    until every shebang language has been seen.
+
     Parameters
     ----------
     repo_root:
         Path to the root of the target repository.
+    index:
+        Prebuilt index of *repo_root*; without one, the tree is walked.
+    workers:
+        Threads walking the tree; see
+        :func:`~chaos_auditor.recon.repo_walker.walk_repo`.
 
     Returns
     -------
     RepoProfile
-        Detected technology stack metadata.
+        Detected technology stack metadata.  Languages are ordered by
+        file count, most used first; the other lists are sorted.
     """
-    raise NotImplementedError
+    files: Iterable[WalkedFile | IndexedFile]
+    read: Callable[[str, int], bytes]
+    if index is not None:
+        files, read = index, index.read
+    else:
+        files = walk_repo(repo_root, workers=workers)
+
+        def read(path: str, size: int) -> bytes:
+            return _read(repo_root / path, size)
+
+    counts: Counter[str] = Counter()
+    found: dict[str, set[str]] = {"frameworks": set(), "build_systems": set()}
+    package_files: list[Path] = []
+    unsniffed = set(SHEBANG_LANGUAGES.values())
+    for file in files:
+        name = file.name
+        if isinstance(file, IndexedFile):
+            language = file.language
+        else:
+            language = language_for(name)
+            if language is None and unsniffed and "." not in name and not name.isupper():
+                language = sniff_language(read(file.path, SNIFF_BYTES))
+                unsniffed.discard(language)
+        if language is not None:
+            counts[language] += 1
+        build = BUILD_FILES.get(name)
+        if build is not None:
+            found["build_systems"].add(build)
+        kind = manifest_kind(name)
+        if kind is None:
+            continue
+        package_files.append(repo_root / file.path)
+        if kind == ".csproj":
+            found["build_systems"].add("msbuild")
+        markers = [m for m in MANIFEST_MARKERS.get(kind, ()) if m[1] not in found[m[0]]]
+        if markers:
+            content = read(file.path, MAX_MANIFEST_BYTES)
+            for field_name, label, pattern in markers:
+                if pattern.search(content):
+                    found[field_name].add(label)
+    return RepoProfile(
+        path=repo_root,
+        languages=sorted(counts, key=lambda lang: (-counts[lang], lang)),
+        frameworks=sorted(found["frameworks"]),
+        build_systems=sorted(found["build_systems"]),
+        package_files=sorted(package_files),
+    )
@@ -4,13 +4,89 @@ Scans source code and configuration files to enumerate:
 - HTTP/gRPC/WebSocket endpoints and their auth requirements.
 - Webhook receivers and outbound integrations.
 - Database schema definitions and migration files.
+
+Endpoints are found by matching the route declarations of common web
+frameworks (Flask, FastAPI, Django, Express, NestJS, Spring, Gin/Echo
+and ``net/http``, Rails and Sinatra, Laravel) in source files.  Whether
+an endpoint requires authentication is a heuristic: it does when an
+auth marker (``login_required``, an auth middleware or guard, a JWT or
+permission check...) appears in its declaration, the decorators above
+it or the three lines below it.
 """
 
 from __future__ import annotations
 
+import re
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from chaos_auditor.recon.repo_index import RepoIndex
+from chaos_auditor.recon.repo_walker import language_for, walk_repo
+
+# Source bytes searched for route declarations.
+MAX_SOURCE_BYTES = 1 << 20
+
+_QUOTED = rb"""[rbuf]{0,2}(?P<q>["'`])(?P<path>[^"'`\n]*)(?P=q)"""
+
+# Route declarations by language; each has groups "method" (absent for
+# Django) and "path".  Group "rest" holds the rest of a Python
+# declaration line, for its methods=[...].
+_ROUTES: dict[str, tuple[re.Pattern[bytes], ...]] = {
+    "Python": (
+        re.compile(
+            rb"^[ \t]*@\w+(?:\.\w+)*\.(?P<method>get|post|put|patch|delete|head|options|route"
+            rb"|api_route|websocket)\(\s*" + _QUOTED + rb"(?P<rest>[^\n]*)",
+            re.M,
+        ),
+        re.compile(rb"\b(?:re_)?path\(\s*" + _QUOTED),
+    ),
+    "JavaScript": (
+        re.compile(
+            rb"\b(?:app|router|server|api|fastify)\.(?P<method>get|post|put|patch|delete|all"
+            rb"|head|options)\(\s*" + _QUOTED
+        ),
+        re.compile(rb"@(?P<method>Get|Post|Put|Patch|Delete|All)\(\s*(?:" + _QUOTED + rb")?\s*\)"),
+    ),
+    "Java": (
+        re.compile(
+            rb"@(?P<method>Get|Post|Put|Patch|Delete|Request)Mapping\(\s*"
+            rb"(?:(?:value|path)\s*=\s*)?\{?\s*" + _QUOTED
+        ),
+    ),
+    "Go": (
+        re.compile(
+            rb"\.(?P<method>GET|POST|PUT|PATCH|DELETE|Get|Post|Put|Patch|Delete|HandleFunc"
+            rb"|Handle)\(\s*" + _QUOTED
+        ),
+    ),
+    "Ruby": (
+        re.compile(rb"^[ \t]*(?P<method>get|post|put|patch|delete|match)\s+\(?" + _QUOTED, re.M),
+    ),
+    "PHP": (
+        re.compile(rb"Route::(?P<method>get|post|put|patch|delete|any|match)\(\s*" + _QUOTED, re.I),
+    ),
+}
+_ROUTES["TypeScript"] = _ROUTES["JavaScript"]
+_ROUTES["Kotlin"] = _ROUTES["Java"]
+
+# Languages whose sources are searched for routes.
+ROUTE_LANGUAGES = frozenset(_ROUTES)
+
+_ANY_METHOD = frozenset({"ALL", "ANY", "MATCH", "HANDLE", "HANDLEFUNC", "REQUEST"})
+_METHODS_ARG = re.compile(rb"methods\s*=\s*[\[(]([^\])]*)")
+_WORD = re.compile(rb"\w+")
+_AUTH = re.compile(
+    rb"login_required|\bauth(?:_\w+|enticat\w*|oriz\w*|middleware|guard|required|token)?\b"
+    rb"|require_?auth|jwt|permission|current_user|\b(?:Secured|PreAuthorize|RolesAllowed"
+    rb"|UseGuards)\b|isAuthenticated|requires?_(?:login|user|role)",
+    re.I,
+)
+_PARAMS = re.compile(r"\{(\w+)[^}]*\}|<(?:\w+:)?(\w+)>|(?<=/):(\w+)|\(\?P<(\w+)>")
+_WEBHOOK = re.compile(r"web-?hooks?|callbacks?|/hooks?(?:/|$)", re.I)
+_MIGRATION_DIRS = frozenset({"migrations", "migrate", "alembic"})
+_SCHEMA_NAMES = frozenset({"schema.rb", "structure.sql", "schema.prisma"})
+
 
 @dataclass
 class Endpoint:
@@ -20,6 +96,7 @@ class Endpoint:
     path: str
     auth_required: bool = False
     parameters: list[str] = field(default_factory=list)
+    source: str | None = None  # "path:line" of the declaration
 
 
 @dataclass
@@ -31,33 +108,165 @@ class AttackSurface:
     db_schemas: list[str] = field(default_factory=list)
 
 
-def map_endpoints(repo_root: Path) -> list[Endpoint]:
+def _methods(method: bytes | None, rest: bytes | None) -> list[str]:
+    if method is None:
+        return ["ANY"]
+    name = method.decode().upper()
+    if name in ("ROUTE", "API_ROUTE"):
+        declared = _METHODS_ARG.search(rest) if rest else None
+        if declared is None:
+            return ["GET"]
+        return [m.decode().upper() for m in _WORD.findall(declared.group(1))] or ["GET"]
+    if name == "WEBSOCKET":
+        return ["WS"]
+    return ["ANY"] if name in _ANY_METHOD else [name]
+
+
+def _route_path(raw: bytes, django: bool) -> str:
+    path = raw.decode("utf-8", "replace")
+    if django:
+        path = path.lstrip("^").rstrip("$")
+    return path if path.startswith("/") else "/" + path
+
+
+def _line_start(content: bytes, offset: int) -> int:
+    return content.rfind(b"\n", 0, offset) + 1
+
+
+def _auth_window(content: bytes, m: re.Match[bytes], lo: int, hi: int) -> bytes:
+    """The declaration, the decorators above it and three lines below."""
+    start = _line_start(content, m.start())
+    while start > lo:
+        above = _line_start(content, start - 1)
+        if not content[above:start].lstrip().startswith(b"@"):
+            break
+        start = above
+    end = m.end()
+    for _ in range(4):
+        newline = content.find(b"\n", end, hi)
+        if newline < 0:
+            end = hi
+            break
+        end = newline + 1
+    if m.start("path") < 0:
+        return content[start:end]
+    # The route path itself ("/auth/login") says nothing about auth.
+    return content[start : m.start("path")] + content[m.end("path") : end]
+
+
+def extract_endpoints(path: str, content: bytes, language: str | None = None) -> list[Endpoint]:
+    """Return the endpoints declared in one source file.
+
+    Parameters
+    ----------
+    path:
+        Path of the file, used for its language and in
+        :attr:`Endpoint.source`.
+    content:
+        Contents of the file.
+    language:
+        Language of the file; defaults to :func:`language_for` its name.
+
+    Returns
+    -------
+    list[Endpoint]
+        Endpoints in declaration order.
+    """
+    language = language if language is not None else language_for(path.rpartition("/")[2])
+    patterns = _ROUTES.get(language or "")
+    if not patterns:
+        return []
+    matches = sorted((m for p in patterns for m in p.finditer(content)), key=lambda m: m.start())
+    endpoints: list[Endpoint] = []
+    for i, m in enumerate(matches):
+        groups = m.groupdict()
+        route = _route_path(groups["path"] or b"", django="method" not in groups)
+        lo = matches[i - 1].end() if i else 0
+        hi = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        auth = _AUTH.search(_auth_window(content, m, lo, hi)) is not None
+        params = list(dict.fromkeys(p for g in _PARAMS.findall(route) for p in g if p))
+        line = content.count(b"\n", 0, m.start()) + 1
+        for method in _methods(groups.get("method"), groups.get("rest")):
+            endpoints.append(Endpoint(method, route, auth, list(params), f"{path}:{line}"))
+    return endpoints
+
+
+def _sources(repo_root: Path, index: RepoIndex | None) -> Iterator[tuple[str, str, bytes]]:
+    """Yield ``(relative path, language, contents)`` of files that can declare routes, by path."""
+    if index is not None:
+        for file in index:
+            if file.language in _ROUTES:
+                yield file.path, file.language, index.read(file.path, MAX_SOURCE_BYTES)
+        return
+    found = ((f.path, language_for(f.name)) for f in walk_repo(repo_root))
+    for path, language in sorted((p, lang) for p, lang in found if lang in _ROUTES):
+        try:
+            with open(repo_root / path, "rb") as f:
+                yield path, language, f.read(MAX_SOURCE_BYTES)
+        except OSError:
+            continue
+
+
+def map_endpoints(repo_root: Path, *, index: RepoIndex | None = None) -> list[Endpoint]:
     """Extract API endpoints from source code and route definitions.
 
     Parameters
     ----------
     repo_root:
         Path to the target repository root.
+    index:
+        Prebuilt index of *repo_root*; without one, the tree is walked.
 
     Returns
     -------
     list[Endpoint]
-        Discovered endpoints with method, path, and auth metadata.
+        Discovered endpoints with method, path, and auth metadata,
+        ordered by file and line.
     """
-    raise NotImplementedError
+    endpoints: list[Endpoint] = []
+    for path, language, content in _sources(repo_root, index):
+        endpoints.extend(extract_endpoints(path, content, language))
+    return endpoints
+
 
+def webhook_paths(endpoints: Iterable[Endpoint]) -> list[str]:
+    """Sorted paths of the endpoints that look like webhook or callback receivers."""
+    return sorted({e.path for e in endpoints if _WEBHOOK.search(e.path)})
 
-def map_attack_surface(repo_root: Path) -> AttackSurface:
+
+def is_schema_file(path: str) -> bool:
+    """Whether the file at relative *path* defines or migrates a database schema."""
+    parts = path.split("/")
+    name = parts[-1]
+    if name in _SCHEMA_NAMES or name.endswith((".sql", ".prisma")):
+        return True
+    return language_for(name) is not None and not _MIGRATION_DIRS.isdisjoint(parts[:-1])
+
+
+def map_attack_surface(repo_root: Path, *, index: RepoIndex | None = None) -> AttackSurface:
     """Build a full :class:`AttackSurface` model for the target.
 
+    Webhooks are the paths of endpoints that look like webhook or
+    callback receivers; database schemas are the paths of SQL, Prisma
+    and Rails schema files and of sources in migration directories.
+
     Parameters
     ----------
     repo_root:
         Path to the target repository root.
+    index:
+        Prebuilt index of *repo_root*; without one, it is built here.
 
     Returns
     -------
     AttackSurface
         Complete attack-surface mapping.
     """
-    raise NotImplementedError
+    if index is None:
+        index = RepoIndex.build(repo_root)
+    endpoints = map_endpoints(repo_root, index=index)
+    return AttackSurface(
+        endpoints=endpoints,
+        webhooks=webhook_paths(endpoints),
+        db_schemas=[f.path for f in index if is_schema_file(f.path)],
+    )
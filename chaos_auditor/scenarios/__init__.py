@@ -3,66 +3,199 @@
 Pre-built security audit scenarios organized by category, adapted from
 real-world AI agent safety testing patterns. Each scenario defines
 inputs, expected outcomes, and severity classifications.
+
+The catalogs are imported on first use of one of their names, so
+``import chaos_auditor.scenarios`` does not compile every rule set.
 """
 
-from chaos_auditor.scenarios.command_safety import (
-    BLOCKED_COMMANDS,
-    GRAYLIST_COMMANDS,
-    SAFE_COMMANDS,
-    CommandScenario,
-    classify_command,
-)
-from chaos_auditor.scenarios.file_access import (
-    READ_BLOCKED_PATHS,
-    WRITE_BLOCKED_PATHS,
-    FileAccessScenario,
-    check_read_safety,
-    check_write_safety,
-)
-from chaos_auditor.scenarios.secret_detection import (
-    SECRET_PATTERNS,
-    SecretScenario,
-    redact_secrets,
-)
-from chaos_auditor.scenarios.interpreter_evasion import (
-    EVASION_PATTERNS,
-    SCRIPT_GRAYLIST,
-    EvasionScenario,
-    classify_interpreter_command,
-)
-from chaos_auditor.scenarios.content_scanning import (
-    DANGEROUS_CONTENT,
-    SAFE_CONTENT,
-    ContentScenario,
-    scan_write_content,
-)
-from chaos_auditor.scenarios.injection_defense import (
-    wrap_tool_output,
-    detect_write_then_execute,
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from chaos_auditor._lazy import exports_by_name, resolve
+
+if TYPE_CHECKING:
+    from chaos_auditor.scenarios.action_guard import Action, ActionGuard, evaluate_action
+    from chaos_auditor.scenarios.batch import (
+        BatchResult,
+        check_read_paths,
+        check_write_paths,
+        classify_commands,
+        classify_interpreter_commands,
+        scan_write_contents,
+    )
+    from chaos_auditor.scenarios.classification_cache import (
+        classification_cache_stats,
+        invalidate_classification_caches,
+    )
+    from chaos_auditor.scenarios.command_parser import (
+        ParsedCommand,
+        parse_command,
+    )
+    from chaos_auditor.scenarios.command_safety import (
+        BLOCKED_COMMANDS,
+        GRAYLIST_COMMANDS,
+        SAFE_COMMANDS,
+        CommandScenario,
+        classify_command,
+    )
+    from chaos_auditor.scenarios.content_scanning import (
+        DANGEROUS_CONTENT,
+        SAFE_CONTENT,
+        ContentScenario,
+        scan_write_content,
+        scan_write_stream,
+    )
+    from chaos_auditor.scenarios.deobfuscation import deobfuscate
+    from chaos_auditor.scenarios.entropy_detection import (
+        DEFAULT_ENTROPY_DETECTOR,
+        EntropyDetector,
+    )
+    from chaos_auditor.scenarios.file_access import (
+        READ_BLOCKED_PATHS,
+        WRITE_BLOCKED_PATHS,
+        FileAccessScenario,
+        check_read_safety,
+        check_write_safety,
+    )
+    from chaos_auditor.scenarios.injection_defense import (
+        ToolOutputPipeline,
+        WriteTracker,
+        detect_write_then_execute,
+        wrap_tool_output,
+    )
+    from chaos_auditor.scenarios.interpreter_evasion import (
+        EVASION_PATTERNS,
+        SCRIPT_GRAYLIST,
+        EvasionScenario,
+        classify_interpreter_command,
+    )
+    from chaos_auditor.scenarios.pattern_safety import (
+        GuardedPattern,
+        pattern_safety_stats,
+        redos_risk,
+    )
+    from chaos_auditor.scenarios.secret_detection import (
+        SECRET_PATTERNS,
+        SecretScenario,
+        redact_secrets,
+        redact_stream,
+        scan_directory,
+    )
+
+_EXPORTS = exports_by_name(
+    {
+        "action_guard": ("Action", "ActionGuard", "evaluate_action"),
+        "batch": (
+            "BatchResult",
+            "check_read_paths",
+            "check_write_paths",
+            "classify_commands",
+            "classify_interpreter_commands",
+            "scan_write_contents",
+        ),
+        "classification_cache": ("classification_cache_stats", "invalidate_classification_caches"),
+        "command_parser": ("ParsedCommand", "parse_command"),
+        "command_safety": (
+            "BLOCKED_COMMANDS",
+            "GRAYLIST_COMMANDS",
+            "SAFE_COMMANDS",
+            "CommandScenario",
+            "classify_command",
+        ),
+        "content_scanning": (
+            "DANGEROUS_CONTENT",
+            "SAFE_CONTENT",
+            "ContentScenario",
+            "scan_write_content",
+            "scan_write_stream",
+        ),
+        "deobfuscation": ("deobfuscate",),
+        "entropy_detection": ("DEFAULT_ENTROPY_DETECTOR", "EntropyDetector"),
+        "file_access": (
+            "READ_BLOCKED_PATHS",
+            "WRITE_BLOCKED_PATHS",
+            "FileAccessScenario",
+            "check_read_safety",
+            "check_write_safety",
+        ),
+        "injection_defense": (
+            "ToolOutputPipeline",
+            "WriteTracker",
+            "detect_write_then_execute",
+            "wrap_tool_output",
+        ),
+        "interpreter_evasion": (
+            "EVASION_PATTERNS",
+            "SCRIPT_GRAYLIST",
+            "EvasionScenario",
+            "classify_interpreter_command",
+        ),
+        "pattern_safety": ("GuardedPattern", "pattern_safety_stats", "redos_risk"),
+        "secret_detection": (
+            "SECRET_PATTERNS",
+            "SecretScenario",
+            "redact_secrets",
+            "redact_stream",
+            "scan_directory",
+        ),
+    }
 )
 
 __all__ = [
+    "Action",
+    "ActionGuard",
     "BLOCKED_COMMANDS",
+    "BatchResult",
     "CommandScenario",
     "ContentScenario",
     "DANGEROUS_CONTENT",
+    "DEFAULT_ENTROPY_DETECTOR",
     "EVASION_PATTERNS",
+    "EntropyDetector",
     "EvasionScenario",
     "FileAccessScenario",
     "GRAYLIST_COMMANDS",
+    "GuardedPattern",
+    "ParsedCommand",
     "READ_BLOCKED_PATHS",
     "SAFE_COMMANDS",
     "SAFE_CONTENT",
     "SCRIPT_GRAYLIST",
     "SECRET_PATTERNS",
     "SecretScenario",
+    "ToolOutputPipeline",
     "WRITE_BLOCKED_PATHS",
-    "classify_command",
-    "classify_interpreter_command",
+    "WriteTracker",
+    "check_read_paths",
     "check_read_safety",
+    "check_write_paths",
     "check_write_safety",
+    "classification_cache_stats",
+    "classify_command",
+    "classify_commands",
+    "classify_interpreter_command",
+    "classify_interpreter_commands",
+    "deobfuscate",
     "detect_write_then_execute",
+    "evaluate_action",
+    "invalidate_classification_caches",
+    "parse_command",
+    "pattern_safety_stats",
     "redact_secrets",
+    "redact_stream",
+    "redos_risk",
+    "scan_directory",
     "scan_write_content",
+    "scan_write_contents",
+    "scan_write_stream",
     "wrap_tool_output",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    return resolve(__name__, _EXPORTS, globals(), name)
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
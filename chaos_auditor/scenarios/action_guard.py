@@ -0,0 +1,264 @@
+"""One guard decision over every check that applies to an agent action.
+
+An action (a shell command, a file read, a file write with its
+content) goes through several independent checks.  Any ``"blocked"``
+verdict settles the decision, so :class:`ActionGuard` runs the checks
+cheapest-per-block first and stops at the first block.  Each check's
+cost (an exponential moving average of its run time) and block rate
+are measured as the guard runs, and the order is recomputed from them
+every few evaluations.
+
+The verdict does not depend on the order: it is ``"blocked"`` if any
+check blocks, else the most severe verdict of all the checks, with ties
+going to the check that comes first in :data:`CHECKS`.  Only which
+reason is reported when several checks block can vary.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+
+from chaos_auditor.scenarios.command_safety import SEVERITY, classify_command
+from chaos_auditor.scenarios.content_scanning import scan_write_content
+from chaos_auditor.scenarios.file_access import check_read_safety, check_write_safety
+from chaos_auditor.scenarios.injection_defense import WriteTracker, detect_write_then_execute
+from chaos_auditor.scenarios.interpreter_evasion import classify_interpreter_command
+
+Verdict = tuple[str, str | None]
+
+# Evaluations between two recomputations of the check order.
+DEFAULT_REORDER_INTERVAL = 256
+
+# Weight of the newest run time in a check's moving-average cost.
+COST_SMOOTHING = 0.05
+
+
+@dataclass(frozen=True)
+class Action:
+    """An agent action to guard; fields that do not apply stay ``None``."""
+
+    command: str | None = None
+    read_path: str | None = None
+    write_path: str | None = None
+    content: str | None = None  # content about to be written to write_path
+    recently_written: set[str] | WriteTracker | None = field(default=None, compare=False)
+    cwd: str | None = None  # directory relative paths are resolved against
+
+
+@dataclass(frozen=True)
+class GuardCheck:
+    """A check :class:`ActionGuard` can run on an action."""
+
+    name: str
+    applies: Callable[[Action], bool]
+    run: Callable[[Action], Verdict]
+
+
+def _run_command(action: Action) -> Verdict:
+    assert action.command is not None
+    return classify_command(action.command)
+
+
+def _run_interpreter(action: Action) -> Verdict:
+    assert action.command is not None
+    return classify_interpreter_command(action.command)
+
+
+def _run_write_then_execute(action: Action) -> Verdict:
+    assert action.command is not None and action.recently_written is not None
+    return detect_write_then_execute(action.command, action.recently_written, action.cwd)
+
+
+def _run_read_path(action: Action) -> Verdict:
+    assert action.read_path is not None
+    return check_read_safety(action.read_path, cwd=action.cwd)
+
+
+def _run_write_path(action: Action) -> Verdict:
+    assert action.write_path is not None
+    return check_write_safety(action.write_path, cwd=action.cwd)
+
+
+def _run_content(action: Action) -> Verdict:
+    assert action.content is not None
+    return scan_write_content(action.content)
+
+
+# In the order the checks used to run one after another.
+CHECKS: tuple[GuardCheck, ...] = (
+    GuardCheck("command", lambda a: a.command is not None, _run_command),
+    GuardCheck("interpreter", lambda a: a.command is not None, _run_interpreter),
+    GuardCheck(
+        "write_then_execute",
+        lambda a: a.command is not None and bool(a.recently_written),
+        _run_write_then_execute,
+    ),
+    GuardCheck("read_path", lambda a: a.read_path is not None, _run_read_path),
+    GuardCheck("write_path", lambda a: a.write_path is not None, _run_write_path),
+    GuardCheck("content", lambda a: a.content is not None, _run_content),
+)
+
+
+@dataclass(frozen=True)
+class CheckStats:
+    """Runtime statistics of one check in an :class:`ActionGuard`."""
+
+    runs: int
+    blocks: int
+    cost: float  # moving average of the run time, in seconds
+
+    @property
+    def block_rate(self) -> float:
+        """Fraction of runs that blocked."""
+        return self.blocks / self.runs if self.runs else 0.0
+
+
+class ActionGuard:
+    """Runs guard checks in adaptive cost-per-block order.
+
+    Checks are ranked by ``cost / P(block)``, the order that minimizes
+    the expected time to the first block.  ``P(block)`` is estimated
+    with add-one smoothing, so a check that has never blocked still
+    ranks by its cost and is not pushed out of reach; checks that have
+    not run yet go first, so that they get measured.  Statistics are
+    updated without locking: a lost update under contention only skews
+    the estimates.
+
+    Parameters
+    ----------
+    checks:
+        Checks to run; their order breaks ties and sets the initial order.
+    reorder_every:
+        Evaluations between two recomputations of the order.
+    clock:
+        Timer used to measure check costs.
+    """
+
+    def __init__(
+        self,
+        checks: Sequence[GuardCheck] = CHECKS,
+        *,
+        reorder_every: int = DEFAULT_REORDER_INTERVAL,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if reorder_every <= 0:
+            raise ValueError(f"reorder_every must be positive, got {reorder_every}")
+        self.checks = tuple(checks)
+        self.reorder_every = reorder_every
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all statistics and go back to the initial order."""
+        with self._lock:
+            self._order = tuple(range(len(self.checks)))
+            self._runs = [0] * len(self.checks)
+            self._blocks = [0] * len(self.checks)
+            self._costs = [0.0] * len(self.checks)
+            self._evaluations = 0
+
+    @property
+    def order(self) -> tuple[str, ...]:
+        """Names of the checks in the order they currently run."""
+        return tuple(self.checks[i].name for i in self._order)
+
+    def stats(self) -> dict[str, CheckStats]:
+        """Statistics per check name."""
+        return {
+            check.name: CheckStats(self._runs[i], self._blocks[i], self._costs[i])
+            for i, check in enumerate(self.checks)
+        }
+
+    def _rank(self, index: int) -> tuple[float, int]:
+        runs = self._runs[index]
+        if not runs:
+            return 0.0, index
+        return self._costs[index] * (runs + 2) / (self._blocks[index] + 1), index
+
+    def reorder(self) -> None:
+        """Recompute the order from the current statistics."""
+        with self._lock:
+            self._order = tuple(sorted(range(len(self.checks)), key=self._rank))
+
+    def evaluate(self, action: Action) -> Verdict:
+        """Return the guard verdict for *action*.
+
+        Returns
+        -------
+        tuple[str, str | None]
+            (classification, reason) — ``"blocked"``, ``"confirm"``, or
+            ``"safe"``.
+        """
+        clock = self._clock
+        verdict: Verdict = ("safe", None)
+        source = len(self.checks)
+        for index in self._order:
+            check = self.checks[index]
+            if not check.applies(action):
+                continue
+            start = clock()
+            result = check.run(action)
+            elapsed = clock() - start
+            runs = self._runs[index] = self._runs[index] + 1
+            cost = self._costs[index]
+            self._costs[index] = elapsed if runs == 1 else cost + COST_SMOOTHING * (elapsed - cost)
+            if result[0] == "blocked":
+                self._blocks[index] += 1
+                verdict = result
+                break
+            severity, current = SEVERITY[result[0]], SEVERITY[verdict[0]]
+            if severity > current or (severity == current and severity and index < source):
+                verdict, source = result, index
+        self._evaluations += 1
+        if self._evaluations % self.reorder_every == 0:
+            self.reorder()
+        return verdict
+
+
+ACTION_GUARD = ActionGuard()
+
+
+def evaluate_action(
+    *,
+    command: str | None = None,
+    read_path: str | None = None,
+    write_path: str | None = None,
+    content: str | None = None,
+    recently_written: set[str] | WriteTracker | None = None,
+    cwd: str | None = None,
+) -> Verdict:
+    """Run every applicable guard check on an agent action.
+
+    Uses the shared :data:`ACTION_GUARD`, which orders the checks by
+    measured cost and block rate and stops at the first block.
+
+    Parameters
+    ----------
+    command:
+        Shell command the agent wants to run.
+    read_path:
+        File the agent wants to read.
+    write_path:
+        File the agent wants to write.
+    content:
+        Content the agent wants to write.
+    recently_written:
+        Paths the agent wrote recently; enables write-then-execute
+        detection for *command*.
+    cwd:
+        Directory the agent's relative paths are taken from; defaults to
+        the current working directory.
+
+    Returns
+    -------
+    tuple[str, str | None]
+        (classification, reason) — ``"blocked"``, ``"confirm"``, or
+        ``"safe"``.  Reason is ``None`` for safe actions.
+    """
+    return ACTION_GUARD.evaluate(
+        Action(command, read_path, write_path, content, recently_written, cwd)
+    )
@@ -0,0 +1,207 @@
+"""Batch entry points for the scenario checks.
+
+Re-auditing archived agent sessions means running the same checks over
+hundreds of thousands of commands, file contents and paths.  The batch
+functions here deduplicate their input, run each distinct item once
+(optionally on a process pool) and return a :class:`BatchResult`: one
+small integer code per item into shared label and reason tables instead
+of a Python tuple per item.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+
+from chaos_auditor.scenarios.classification_cache import normalize_command
+from chaos_auditor.scenarios.command_safety import classify_command
+from chaos_auditor.scenarios.content_scanning import scan_write_content
+from chaos_auditor.scenarios.file_access import (
+    check_read_safety,
+    check_write_safety,
+    normalize_path,
+)
+from chaos_auditor.scenarios.interpreter_evasion import classify_interpreter_command
+
+Verdict = tuple[str, str | None]
+
+# Distinct items per task handed to a worker process.
+DEFAULT_CHUNK_SIZE = 512
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Columnar ``(classification, reason)`` results of a batch check.
+
+    ``labels[label_codes[i]]`` and ``reasons[reason_codes[i]]`` are the
+    classification and reason of input item *i*.
+    """
+
+    labels: tuple[str, ...]
+    reasons: tuple[str | None, ...]
+    label_codes: array[int]
+    reason_codes: array[int]
+
+    def __len__(self) -> int:
+        return len(self.label_codes)
+
+    def __getitem__(self, index: int) -> Verdict:
+        return self.labels[self.label_codes[index]], self.reasons[self.reason_codes[index]]
+
+    def __iter__(self) -> Iterator[Verdict]:
+        labels, reasons = self.labels, self.reasons
+        for label, reason in zip(self.label_codes, self.reason_codes, strict=True):
+            yield labels[label], reasons[reason]
+
+    def counts(self) -> dict[str, int]:
+        """Number of items per classification."""
+        tally = [0] * len(self.labels)
+        for code in self.label_codes:
+            tally[code] += 1
+        return {label: n for label, n in zip(self.labels, tally, strict=True) if n}
+
+    def indices(self, classification: str) -> list[int]:
+        """Positions of the items classified as *classification*."""
+        try:
+            wanted = self.labels.index(classification)
+        except ValueError:
+            return []
+        return [i for i, code in enumerate(self.label_codes) if code == wanted]
+
+
+def _apply(check: Callable[[str], Verdict], items: Sequence[str]) -> list[Verdict]:
+    return [check(item) for item in items]
+
+
+def _run_batch(
+    check: Callable[[str], Verdict],
+    items: Iterable[str],
+    key: Callable[[str], str],
+    workers: int | None,
+    chunksize: int,
+) -> BatchResult:
+    item_keys: list[int] = []
+    distinct: dict[str, int] = {}
+    representatives: list[str] = []
+    for item in items:
+        k = key(item)
+        slot = distinct.get(k)
+        if slot is None:
+            slot = distinct[k] = len(representatives)
+            representatives.append(item)
+        item_keys.append(slot)
+
+    workers = workers if workers is not None else 1
+    if workers <= 1 or len(representatives) <= chunksize:
+        verdicts = _apply(check, representatives)
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # ~10 ms; only needed here
+
+        chunks = [
+            representatives[i : i + chunksize] for i in range(0, len(representatives), chunksize)
+        ]
+        verdicts = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(_apply, [check] * len(chunks), chunks):
+                verdicts.extend(result)
+
+    label_table: dict[str, int] = {}
+    reason_table: dict[str | None, int] = {}
+    verdict_labels = array("B", (label_table.setdefault(v[0], len(label_table)) for v in verdicts))
+    verdict_reasons = array(
+        "I", (reason_table.setdefault(v[1], len(reason_table)) for v in verdicts)
+    )
+    return BatchResult(
+        labels=tuple(label_table),
+        reasons=tuple(reason_table),
+        label_codes=array("B", (verdict_labels[slot] for slot in item_keys)),
+        reason_codes=array("I", (verdict_reasons[slot] for slot in item_keys)),
+    )
+
+
+def _identity(item: str) -> str:
+    return item
+
+
+def classify_commands(
+    commands: Iterable[str],
+    *,
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+) -> BatchResult:
+    """Run :func:`classify_command` over many commands.
+
+    Commands that normalize to the same string are classified once.
+
+    Parameters
+    ----------
+    commands:
+        Shell command strings.
+    workers:
+        Number of worker processes.  ``None`` or ``1`` classifies in the
+        calling process, which is fastest unless there are many thousands
+        of distinct commands.
+    chunksize:
+        Distinct commands per task sent to a worker.
+
+    Returns
+    -------
+    BatchResult
+        One verdict per input command, in input order.
+    """
+    return _run_batch(classify_command, commands, normalize_command, workers, chunksize)
+
+
+def classify_interpreter_commands(
+    commands: Iterable[str],
+    *,
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+) -> BatchResult:
+    """Run :func:`classify_interpreter_command` over many commands.
+
+    See :func:`classify_commands` for the parameters.
+    """
+    return _run_batch(classify_interpreter_command, commands, normalize_command, workers, chunksize)
+
+
+def scan_write_contents(
+    contents: Iterable[str],
+    *,
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+) -> BatchResult:
+    """Run :func:`scan_write_content` over many file contents.
+
+    Identical contents are scanned once.  See :func:`classify_commands`
+    for the parameters.
+    """
+    return _run_batch(scan_write_content, contents, _identity, workers, chunksize)
+
+
+def check_read_paths(
+    paths: Iterable[str],
+    *,
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+) -> BatchResult:
+    """Run :func:`check_read_safety` over many paths.
+
+    Paths that normalize to the same path are checked once.  See
+    :func:`classify_commands` for the parameters.
+    """
+    return _run_batch(check_read_safety, paths, normalize_path, workers, chunksize)
+
+
+def check_write_paths(
+    paths: Iterable[str],
+    *,
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+) -> BatchResult:
+    """Run :func:`check_write_safety` over many paths.
+
+    See :func:`check_read_paths`.
+    """
+    return _run_batch(check_write_safety, paths, normalize_path, workers, chunksize)
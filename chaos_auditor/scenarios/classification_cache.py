@@ -0,0 +1,193 @@
+"""Bounded LRU caches in front of the command classifiers.
+
+Agents issue the same handful of commands over and over, so
+:func:`~chaos_auditor.scenarios.command_safety.classify_command` and
+:func:`~chaos_auditor.scenarios.interpreter_evasion.classify_interpreter_command`
+remember their verdicts keyed by :func:`normalize_command`.  Every cache
+registers itself by name; :func:`invalidate_classification_caches` clears
+them all after a rule catalog changes and :func:`classification_cache_stats`
+reports hit, miss and eviction counters.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+DEFAULT_CACHE_SIZE = 4096
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Quoted words whose unquoted form means the same thing to the shell.
+_TRIVIAL_WORD_RE = re.compile(r"[A-Za-z0-9_./:@%+,-]+")
+_QUOTED_RE = re.compile(r"'([^']*)'|\"((?:[^\"\\$`]|\\.)*)\"")
+_BLANKS_RE = re.compile(r"[ \t]+")
+# Already normalized unless it has quotes, escapes, tabs, or stray spaces.
+_NEEDS_WORK_RE = re.compile(r"['\"\\\t]|  |^ | $")
+_PLAIN_RE = re.compile(r"[^ \t'\"\\]+")
+
+
+def normalize_command(command: str) -> str:
+    """Return a canonical form of *command* for use as a cache key.
+
+    Runs of spaces and tabs outside quotes collapse to one space, leading
+    and trailing blanks are dropped, and quotes around words made only of
+    characters the shell treats literally are removed (``'ls' "-la"`` ->
+    ``ls -la``).  Newlines, quoted whitespace and anything that could
+    expand are kept verbatim, so two commands with the same key always
+    parse to the same argv.
+
+    Parameters
+    ----------
+    command:
+        Raw shell command string.
+
+    Returns
+    -------
+    str
+        The normalized command.
+    """
+    if not _NEEDS_WORK_RE.search(command):
+        return command
+    parts: list[str] = []
+    pos = 0
+    length = len(command)
+    while pos < length:
+        ch = command[pos]
+        if ch in " \t":
+            blanks = _BLANKS_RE.match(command, pos)
+            assert blanks is not None
+            parts.append(" ")
+            pos = blanks.end()
+        elif ch in "'\"":
+            quoted = _QUOTED_RE.match(command, pos)
+            if quoted is None:
+                # Unbalanced quote: keep the remainder untouched.
+                parts.append(command[pos:])
+                break
+            body = quoted.group(1) if ch == "'" else quoted.group(2)
+            parts.append(body if _TRIVIAL_WORD_RE.fullmatch(body) else quoted.group(0))
+            pos = quoted.end()
+        elif ch == "\\" and pos + 1 < length:
+            parts.append(command[pos : pos + 2])
+            pos += 2
+        else:
+            plain = _PLAIN_RE.match(command, pos)
+            end = plain.end() if plain is not None else pos + 1
+            parts.append(command[pos:end])
+            pos = end
+    return "".join(parts).strip(" ")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of a :class:`ClassificationCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+_REGISTRY: dict[str, ClassificationCache[Any, Any]] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+class ClassificationCache(Generic[K, V]):
+    """Thread-safe bounded LRU mapping with hit/miss/eviction counters."""
+
+    def __init__(self, name: str, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        if maxsize < 0:
+            raise ValueError(f"maxsize must be non-negative, got {maxsize}")
+        self.name = name
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._generation = 0  # bumped by clear()
+        with _REGISTRY_LOCK:
+            _REGISTRY[name] = self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_or_compute(self, key: K, compute: Callable[[K], V]) -> V:
+        """Return the cached value for *key*, computing and storing it on a miss.
+
+        *compute* runs outside the lock, so concurrent misses on the same
+        key may compute it more than once; the last result is kept.  A
+        result computed across a :meth:`clear` is returned but not stored,
+        since it may come from the rules the clear invalidated.
+        """
+        with self._lock:
+            generation = self._generation
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+            else:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return value
+        value = compute(key)
+        if self.maxsize:
+            with self._lock:
+                if self._generation != generation:
+                    return value
+                self._data[key] = value
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self._evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry.  Counters are kept."""
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+
+    def reset_stats(self) -> None:
+        """Zero the hit, miss and eviction counters."""
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._data),
+                maxsize=self.maxsize,
+            )
+
+
+def invalidate_classification_caches() -> None:
+    """Clear every classification cache, e.g. after a rule catalog changed."""
+    with _REGISTRY_LOCK:
+        caches = list(_REGISTRY.values())
+    for cache in caches:
+        cache.clear()
+
+
+def classification_cache_stats() -> dict[str, CacheStats]:
+    """Return the counters of every classification cache, keyed by name."""
+    with _REGISTRY_LOCK:
+        caches = list(_REGISTRY.items())
+    return {name: cache.stats() for name, cache in caches}
@@ -0,0 +1,423 @@
+"""Shared shell-command parser for the command classifiers.
+
+Turns a raw command string into a small parse tree — pipelines of simple
+commands with their argv and redirections, plus the nested command
+strings run through ``sh -c`` / ``eval`` and the commands wrapped by
+``sudo``, ``env``, ``xargs`` and friends.  Every classifier accepts the
+resulting :class:`ParsedCommand`, and :func:`parse_command` caches its
+results, so a command proposed by an agent is tokenized once no matter
+how many checks inspect it.
+
+The parser is deliberately conservative: comments are not stripped and
+subshell / command-substitution parentheses and backticks act as command
+separators, so text that bash might ignore is still classified.
+Absolute and home-relative arguments are normalized lexically
+(``/etc//shadow``, ``/etc/./shadow`` and ``/etc/`` become ``/etc/shadow``
+and ``/etc``), so rules written for the plain path match every spelling.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shlex
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+
+from chaos_auditor.scenarios.file_access import normalize_path
+
+SHELLS = frozenset({"sh", "bash", "zsh", "dash", "ksh", "ash"})
+
+# Interpreter family -> flags that take inline code instead of a script.
+INTERPRETERS: dict[str, frozenset[str]] = {
+    "python": frozenset({"-c"}),
+    "perl": frozenset({"-e", "-E"}),
+    "ruby": frozenset({"-e"}),
+    "node": frozenset({"-e", "--eval", "-p", "--print"}),
+    "nodejs": frozenset({"-e", "--eval", "-p", "--print"}),
+    "php": frozenset({"-r"}),
+    "lua": frozenset({"-e"}),
+}
+
+SCRIPT_SUFFIXES = frozenset({".sh", ".bash", ".py", ".pl", ".rb", ".js", ".php", ".ps1"})
+
+# Commands that run another command: name -> options that consume a value.
+WRAPPERS: dict[str, frozenset[str]] = {
+    "sudo": frozenset({"-u", "-g", "-C", "-D", "-h", "-p", "-r", "-t", "-U"}),
+    "doas": frozenset({"-u", "-C"}),
+    "env": frozenset({"-u", "-C", "-S"}),
+    "nohup": frozenset(),
+    "nice": frozenset({"-n"}),
+    "time": frozenset(),
+    "timeout": frozenset({"-s", "-k"}),
+    "exec": frozenset(),
+    "command": frozenset(),
+    "xargs": frozenset({"-I", "-n", "-P", "-L", "-d", "-E", "-s", "-a"}),
+}
+
+# Bound on sh -c / eval / wrapper nesting followed by the parser.
+MAX_NESTING_DEPTH = 8
+
+_OPERATORS = (
+    "&&",
+    "||",
+    ";;",
+    "|&",
+    ">>",
+    "<<<",
+    "<<",
+    ">&",
+    "<&",
+    "&>",
+    ">|",
+    "|",
+    ";",
+    "&",
+    "<",
+    ">",
+    "(",
+    ")",
+    "`",
+    "\n",
+)
+_PUNCTUATION = "();<>|&`\n"
+_REDIRECTS = frozenset({">", ">>", ">|", "&>", ">&", "<", "<<", "<<<", "<&"})
+_WRITE_REDIRECTS = frozenset({">", ">>", ">|", "&>", ">&"})
+_PIPES = frozenset({"|", "|&"})
+_QUOTING_RE = re.compile(r"['\"\\\\]")
+_PLAIN_TOKEN_RE = re.compile(r"[();<>|&`\n]+|[^ \t\r();<>|&`\n]+")
+_ASSIGNMENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*=")
+_VERSION_SUFFIX_RE = re.compile(r"[\d.]+$")
+
+
+def _path_argument(token: str) -> str:
+    """*token* normalized if it is an absolute or home-relative path."""
+    return normalize_path(token) if token.startswith(("/", "~")) else token
+
+
+@dataclass(frozen=True)
+class Redirection:
+    """An I/O redirection attached to a simple command."""
+
+    operator: str  # e.g. ">", ">>", "<", ">&"
+    target: str
+    fd: str | None = None
+
+    @cached_property
+    def path(self) -> str:
+        """*target*, normalized if it is an absolute or home-relative path."""
+        return _path_argument(self.target)
+
+    @property
+    def writes(self) -> bool:
+        """Whether the redirection opens *target* for writing."""
+        return self.operator in _WRITE_REDIRECTS and not self.target.isdigit()
+
+
+@dataclass(frozen=True)
+class SimpleCommand:
+    """One command of a pipeline: argv plus redirections."""
+
+    argv: tuple[str, ...]
+    redirections: tuple[Redirection, ...] = ()
+    assignments: tuple[str, ...] = ()
+
+    @cached_property
+    def executable(self) -> str:
+        """Basename of ``argv[0]``, or ``""`` for a bare redirection."""
+        return os.path.basename(self.argv[0]) if self.argv else ""
+
+    @cached_property
+    def interpreter(self) -> str | None:
+        """Interpreter family (``python3.11`` -> ``python``), if any."""
+        name = _VERSION_SUFFIX_RE.sub("", self.executable)
+        return name if name in INTERPRETERS else None
+
+    @cached_property
+    def flags(self) -> frozenset[str]:
+        """Option tokens, with combined short flags expanded (``-rf`` -> ``-r``, ``-f``)."""
+        flags: set[str] = set()
+        for token in self.argv[1:]:
+            if token == "--":
+                break
+            if token.startswith("-") and token != "-":
+                flags.add(token)
+                if not token.startswith("--") and len(token) > 2:
+                    flags.update(f"-{ch}" for ch in token[1:])
+        return frozenset(flags)
+
+    @cached_property
+    def args(self) -> tuple[str, ...]:
+        """Positional arguments after ``argv[0]``, absolute and home paths normalized."""
+        positional: list[str] = []
+        options_done = False
+        for token in self.argv[1:]:
+            if not options_done and token == "--":
+                options_done = True
+            elif options_done or not token.startswith("-") or token == "-":
+                positional.append(_path_argument(token))
+        return tuple(positional)
+
+    @cached_property
+    def arg_set(self) -> frozenset[str]:
+        """Positional arguments as a set, for subset checks."""
+        return frozenset(self.args)
+
+    @cached_property
+    def wrapped(self) -> SimpleCommand | None:
+        """The command run by a wrapper such as ``sudo`` or ``xargs``."""
+        value_options = WRAPPERS.get(self.executable)
+        if value_options is None:
+            return None
+        i = 1
+        skip_positional = 1 if self.executable == "timeout" else 0
+        while i < len(self.argv):
+            token = self.argv[i]
+            if token == "--":
+                i += 1
+                break
+            if token in value_options:
+                i += 2
+            elif token.startswith("-") or (
+                self.executable == "env" and _ASSIGNMENT_RE.match(token)
+            ):
+                i += 1
+            elif skip_positional:
+                skip_positional -= 1
+                i += 1
+            else:
+                break
+        if i >= len(self.argv):
+            return None
+        return SimpleCommand(self.argv[i:], self.redirections)
+
+    @cached_property
+    def runs_code(self) -> bool:
+        """Whether this command, or the command it wraps, is a shell or interpreter."""
+        if self.executable in SHELLS or self.interpreter is not None:
+            return True
+        return self.wrapped is not None and self.wrapped.runs_code
+
+    @cached_property
+    def script_path(self) -> str | None:
+        """Path of the script this command executes, if it runs one."""
+        if self.executable in ("source", ".") and self.args:
+            return self.args[0]
+        if self.executable in SHELLS or self.interpreter is not None:
+            inline = INTERPRETERS.get(self.interpreter or "", frozenset({"-c"}))
+            if self.flags & inline or (self.interpreter == "python" and "-m" in self.flags):
+                return None
+            return self.args[0] if self.args else None
+        if self.argv and "/" in self.argv[0]:
+            if os.path.splitext(self.argv[0])[1] in SCRIPT_SUFFIXES:
+                return self.argv[0]
+        return None
+
+
+@dataclass(frozen=True)
+class Pipeline:
+    """Simple commands connected by ``|``."""
+
+    commands: tuple[SimpleCommand, ...]
+
+
+@dataclass(frozen=True)
+class ParsedCommand:
+    """Parse tree of a shell command string."""
+
+    raw: str
+    pipelines: tuple[Pipeline, ...] = ()
+    nested: tuple[ParsedCommand, ...] = ()
+    well_formed: bool = True
+    truncated: bool = False  # nesting deeper than MAX_NESTING_DEPTH was not parsed
+
+    def commands(self) -> Iterator[SimpleCommand]:
+        """Yield the simple commands of this level, in order."""
+        for pipeline in self.pipelines:
+            yield from pipeline.commands
+
+    def walk(self) -> Iterator[ParsedCommand]:
+        """Yield this command and every nested command, depth first."""
+        yield self
+        for child in self.nested:
+            yield from child.walk()
+
+    @cached_property
+    def all_commands(self) -> tuple[SimpleCommand, ...]:
+        """Every simple command at any nesting level, wrapped ones included."""
+        flat: list[SimpleCommand] = []
+        for simple in self.commands():
+            inner: SimpleCommand | None = simple
+            while inner is not None:
+                flat.append(inner)
+                inner = inner.wrapped
+        for child in self.nested:
+            flat.extend(child.all_commands)
+        return tuple(flat)
+
+
+def _tokenize(command: str) -> tuple[list[tuple[str, bool]], bool]:
+    """Split *command* into ``(token, is_operator)`` pairs."""
+    if not _QUOTING_RE.search(command):
+        # Nothing for shlex to unquote: a regex split yields the same tokens.
+        raw_tokens = _PLAIN_TOKEN_RE.findall(command)
+    else:
+        lexer = shlex.shlex(command, posix=True, punctuation_chars=_PUNCTUATION)
+        lexer.whitespace = " \t\r"
+        lexer.whitespace_split = True
+        lexer.commenters = ""
+        try:
+            raw_tokens = list(lexer)
+        except ValueError:
+            # Unbalanced quotes: fall back to whitespace splitting.
+            return [(token, False) for token in command.split()], False
+    tokens: list[tuple[str, bool]] = []
+    for token in raw_tokens:
+        if token and token[0] in _PUNCTUATION and all(ch in _PUNCTUATION for ch in token):
+            while token:
+                op = next(o for o in _OPERATORS if token.startswith(o))
+                tokens.append((op, True))
+                token = token[len(op) :]
+        else:
+            tokens.append((token, False))
+    return tokens, True
+
+
+def _build_pipelines(tokens: list[tuple[str, bool]]) -> tuple[Pipeline, ...]:
+    pipelines: list[Pipeline] = []
+    commands: list[SimpleCommand] = []
+    argv: list[str] = []
+    assignments: list[str] = []
+    redirections: list[Redirection] = []
+    pending: tuple[str, str | None] | None = None
+
+    def end_command() -> None:
+        if argv or redirections or assignments:
+            commands.append(SimpleCommand(tuple(argv), tuple(redirections), tuple(assignments)))
+        argv.clear()
+        assignments.clear()
+        redirections.clear()
+
+    def end_pipeline() -> None:
+        end_command()
+        if commands:
+            pipelines.append(Pipeline(tuple(commands)))
+        commands.clear()
+
+    for token, is_operator in tokens:
+        if not is_operator:
+            if pending is not None:
+                redirections.append(Redirection(pending[0], token, pending[1]))
+                pending = None
+            elif not argv and _ASSIGNMENT_RE.match(token):
+                assignments.append(token)
+            else:
+                argv.append(token)
+        elif token in _REDIRECTS:
+            # "2>&1" tokenizes as "2", ">&", "1": a bare digit before the
+            # operator is taken as the file descriptor.
+            fd = argv.pop() if len(argv) > 1 and argv[-1].isdigit() else None
+            pending = (token, fd)
+        elif token in _PIPES:
+            end_command()
+        else:
+            end_pipeline()
+    end_pipeline()
+    return tuple(pipelines)
+
+
+def _substitutions(word: str) -> Iterator[str]:
+    """Yield the bodies of ``$(...)`` and backtick substitutions left inside *word*.
+
+    Substitutions outside quotes are split into separate commands by the
+    tokenizer; the ones that reach a word were quoted.  Single-quoted
+    text is not expanded by the shell but is yielded too.
+    """
+    i = 0
+    while i < len(word):
+        if word.startswith("$(", i):
+            depth = 1
+            j = i + 2
+            while j < len(word) and depth:
+                depth += {"(": 1, ")": -1}.get(word[j], 0)
+                j += 1
+            yield word[i + 2 : j - 1 if depth == 0 else j]
+            i = j
+        elif word[i] == "`":
+            end = word.find("`", i + 1)
+            end = len(word) if end == -1 else end
+            yield word[i + 1 : end]
+            i = end + 1
+        else:
+            i += 1
+
+
+def _nested_source(command: SimpleCommand) -> str | None:
+    """Return the command string executed by ``sh -c`` or ``eval``."""
+    if command.executable == "eval" and len(command.argv) > 1:
+        return " ".join(command.argv[1:])
+    if command.executable in SHELLS and "-c" in command.flags and command.args:
+        return command.args[0]
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _parse(command: str, depth: int) -> ParsedCommand:
+    tokens, well_formed = _tokenize(command)
+    pipelines = _build_pipelines(tokens)
+    nested: list[ParsedCommand] = []
+    truncated = False
+    sources: list[str] = []
+    for pipeline in pipelines:
+        for simple in pipeline.commands:
+            words = (*simple.assignments, *simple.argv, *(r.target for r in simple.redirections))
+            for word in words:
+                if "$(" in word or "`" in word:
+                    sources.extend(_substitutions(word))
+            inner: SimpleCommand | None = simple
+            while inner is not None:
+                source = _nested_source(inner)
+                if source is not None:
+                    sources.append(source)
+                inner = inner.wrapped
+    for source in sources:
+        if depth < MAX_NESTING_DEPTH:
+            child = _parse(source, depth + 1)
+            nested.append(child)
+            truncated = truncated or child.truncated
+        else:
+            truncated = True
+    return ParsedCommand(
+        raw=command,
+        pipelines=pipelines,
+        nested=tuple(nested),
+        well_formed=well_formed,
+        truncated=truncated,
+    )
+
+
+def parse_command(command: str) -> ParsedCommand:
+    """Parse a shell command string into a :class:`ParsedCommand`.
+
+    Results are cached, so repeated calls with the same string return
+    the same object.
+
+    Parameters
+    ----------
+    command:
+        Raw shell command string.
+
+    Returns
+    -------
+    ParsedCommand
+        Pipelines, argv, redirections and nested commands.
+    """
+    return _parse(command, 0)
+
+
+def as_parsed(command: str | ParsedCommand) -> ParsedCommand:
+    """Return *command* parsed, passing an existing parse tree through."""
+    if isinstance(command, ParsedCommand):
+        return command
+    return parse_command(command)
@@ -12,7 +12,24 @@ chmod u+s), reverse shells, and data exfiltration.
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
+from fnmatch import fnmatchcase
+
+from chaos_auditor.scenarios.classification_cache import (
+    ClassificationCache,
+    invalidate_classification_caches,
+    normalize_command,
+)
+from chaos_auditor.scenarios.command_parser import (
+    ParsedCommand,
+    SimpleCommand,
+    as_parsed,
+)
+from chaos_auditor.scenarios.file_access import check_read_safety
+
+# Verdict severity; when several rules match, the most severe one wins.
+SEVERITY = {"safe": 0, "confirm": 1, "blocked": 2}
 
 
 @dataclass(frozen=True)
@@ -187,13 +204,288 @@ SAFE_COMMANDS: list[CommandScenario] = [
 ]
 
 
-def classify_command(command: str) -> tuple[str, str | None]:
+# --- Classification rules ---
+
+
+@dataclass(frozen=True)
+class CommandRule:
+    """A classification rule for one executable.
+
+    A rule matches a simple command running *executable* when every
+    given condition holds: at least one of *flags* is present, at least
+    one of *args* is a positional argument, and at least one positional
+    argument matches the *arg_glob* pattern.
+    """
+
+    executable: str
+    classification: str  # "blocked" or "confirm"
+    reason: str
+    flags: frozenset[str] = frozenset()
+    args: frozenset[str] = frozenset()
+    arg_glob: str | None = None
+
+    def matches(self, command: SimpleCommand) -> bool:
+        """Return whether *command* satisfies this rule."""
+        if command.executable != self.executable:
+            return False
+        if self.flags and not self.flags & command.flags:
+            return False
+        if self.args and not self.args & command.arg_set:
+            return False
+        if self.arg_glob is not None:
+            return any(fnmatchcase(arg, self.arg_glob) for arg in command.args)
+        return True
+
+
+def _rules(
+    executables: tuple[str, ...],
+    classification: str,
+    reason: str,
+    *,
+    flags: tuple[str, ...] = (),
+    args: tuple[str, ...] = (),
+    arg_glob: str | None = None,
+) -> list[CommandRule]:
+    return [
+        CommandRule(exe, classification, reason, frozenset(flags), frozenset(args), arg_glob)
+        for exe in executables
+    ]
+
+
+_RECURSIVE = ("-r", "-R", "--recursive")
+_CRITICAL_DIRS = (
+    "/",
+    "/*",
+    "~",
+    "~/",
+    "/bin",
+    "/boot",
+    "/etc",
+    "/home",
+    "/lib",
+    "/root",
+    "/usr",
+    "/var",
+)
+_FILE_READERS = (
+    "cat",
+    "less",
+    "more",
+    "head",
+    "tail",
+    "strings",
+    "xxd",
+    "od",
+    "base64",
+    "grep",
+    "cp",
+)
+_MKFS = ("mkfs", "mkfs.ext2", "mkfs.ext3", "mkfs.ext4", "mkfs.xfs", "mkfs.btrfs", "mkfs.vfat")
+_PACKAGE_MANAGERS = ("apt", "apt-get", "yum", "dnf")
+
+COMMAND_RULES: list[CommandRule] = [
+    # Blocked
+    *_rules(
+        ("rm",),
+        "blocked",
+        "Recursive deletion of a critical path",
+        flags=_RECURSIVE,
+        args=_CRITICAL_DIRS,
+    ),
+    *_rules(("rm",), "blocked", "Deletion with --no-preserve-root", flags=("--no-preserve-root",)),
+    *_rules(_MKFS, "blocked", "Filesystem formatting"),
+    *_rules(("dd",), "blocked", "Raw write to a block device", arg_glob="of=/dev/sd*"),
+    *_rules(("dd",), "blocked", "Raw write to a block device", arg_glob="of=/dev/nvme*"),
+    *_rules(
+        _FILE_READERS, "blocked", "Reading password hashes", args=("/etc/shadow", "/etc/gshadow")
+    ),
+    *_rules(("su",), "blocked", "Privilege escalation to root"),
+    *_rules(("sudo",), "blocked", "Interactive root shell", flags=("-i", "-s")),
+    *_rules(
+        ("chmod",), "blocked", "Setting SUID/SGID bit", args=("u+s", "g+s", "+s", "ug+s", "a+s")
+    ),
+    *_rules(("chmod",), "blocked", "Setting SUID/SGID bit", arg_glob="[2467][0-7][0-7][0-7]"),
+    *_rules(("modprobe", "insmod", "rmmod"), "blocked", "Kernel module manipulation"),
+    *_rules(("nc", "ncat", "netcat"), "blocked", "Netcat command execution", flags=("-e", "-c")),
+    # Confirm
+    *_rules(
+        ("systemctl", "service"),
+        "confirm",
+        "Service state change",
+        args=("stop", "disable", "restart", "mask"),
+    ),
+    *_rules(("reboot", "shutdown", "poweroff", "halt"), "confirm", "System power control"),
+    *_rules(
+        _PACKAGE_MANAGERS,
+        "confirm",
+        "Package removal",
+        args=("remove", "purge", "autoremove", "erase"),
+    ),
+    *_rules(("pip", "pip3"), "confirm", "Package removal", args=("uninstall",)),
+    *_rules(("rm",), "confirm", "Recursive deletion", flags=_RECURSIVE),
+    *_rules(
+        ("iptables", "ip6tables"), "confirm", "Flushing firewall rules", flags=("-F", "--flush")
+    ),
+    *_rules(("ufw",), "confirm", "Disabling firewall", args=("disable",)),
+    *_rules(("mv", "cp"), "confirm", "Modifying system configuration", arg_glob="/etc/*"),
+    *_rules(("kill", "pkill", "killall"), "confirm", "Terminating processes"),
+]
+
+_GLOB_SPECIAL_RE = re.compile(r"[*?\[]")
+
+
+class CommandRuleIndex:
+    """Decision table compiled from a list of :class:`CommandRule`.
+
+    Rules are bucketed by executable and then keyed by one of their
+    positional arguments, one of their flags, or the literal prefix of
+    their ``arg_glob`` (``"of=/dev/sd*"`` -> ``"of=/dev/sd"``), so a lookup
+    costs a few dictionary probes per token of the command rather than
+    one :meth:`CommandRule.matches` call per rule.  Only rules without any
+    condition are checked for every command of their executable.  When
+    several rules match, the most severe wins and ties go to the rule
+    listed first.
+    """
+
+    def __init__(self, rules: list[CommandRule]) -> None:
+        ordered = sorted(range(len(rules)), key=lambda i: (-SEVERITY[rules[i].classification], i))
+        self._ranked = [rules[i] for i in ordered]
+        self._rank = {id(rule): rank for rank, rule in enumerate(self._ranked)}
+        self._always: dict[str, list[CommandRule]] = {}
+        self._by_arg: dict[tuple[str, str], list[CommandRule]] = {}
+        self._by_flag: dict[tuple[str, str], list[CommandRule]] = {}
+        self._by_glob_prefix: dict[tuple[str, str], list[CommandRule]] = {}
+        prefix_lengths: dict[str, set[int]] = {}
+        for rule in self._ranked:
+            exe = rule.executable
+            if rule.args:
+                for arg in rule.args:
+                    self._by_arg.setdefault((exe, arg), []).append(rule)
+            elif rule.flags:
+                for flag in rule.flags:
+                    self._by_flag.setdefault((exe, flag), []).append(rule)
+            elif rule.arg_glob is not None:
+                prefix = _GLOB_SPECIAL_RE.split(rule.arg_glob, maxsplit=1)[0]
+                self._by_glob_prefix.setdefault((exe, prefix), []).append(rule)
+                prefix_lengths.setdefault(exe, set()).add(len(prefix))
+            else:
+                self._always.setdefault(exe, []).append(rule)
+        self._prefix_lengths = {exe: sorted(n) for exe, n in prefix_lengths.items()}
+        self._executables = frozenset(rule.executable for rule in rules)
+
+    def __len__(self) -> int:
+        return len(self._ranked)
+
+    def lookup(self, command: SimpleCommand) -> CommandRule | None:
+        """Return the most severe rule matching *command*, if any."""
+        exe = command.executable
+        if exe not in self._executables:
+            return None
+        candidates: list[list[CommandRule]] = []
+        if exe in self._always:
+            candidates.append(self._always[exe])
+        for arg in command.arg_set:
+            bucket = self._by_arg.get((exe, arg))
+            if bucket is not None:
+                candidates.append(bucket)
+        for flag in command.flags:
+            bucket = self._by_flag.get((exe, flag))
+            if bucket is not None:
+                candidates.append(bucket)
+        for length in self._prefix_lengths.get(exe, ()):
+            for arg in command.arg_set:
+                bucket = self._by_glob_prefix.get((exe, arg[:length]))
+                if bucket is not None:
+                    candidates.append(bucket)
+        best: CommandRule | None = None
+        for bucket in candidates:
+            for rule in bucket:
+                if best is not None and self._rank[id(rule)] >= self._rank[id(best)]:
+                    break
+                if rule.matches(command):
+                    best = rule
+                    break
+        return best
+
+
+_RULE_INDEX = CommandRuleIndex(COMMAND_RULES)
+
+
+def reload_command_rules() -> None:
+    """Recompile the rule index after ``COMMAND_RULES`` has been modified.
+
+    Cached verdicts are invalidated as well.
+    """
+    global _RULE_INDEX
+    _RULE_INDEX = CommandRuleIndex(COMMAND_RULES)
+    invalidate_classification_caches()
+
+
+# Redirection targets that must never be written.
+PROTECTED_WRITE_TARGETS = (
+    "/etc/passwd",
+    "/etc/shadow",
+    "/etc/gshadow",
+    "/etc/sudoers",
+    "/etc/sudoers.d/*",
+    "/etc/fstab",
+    "/dev/sd*",
+    "/dev/nvme*",
+    "/boot/*",
+    "/bin/*",
+    "/sbin/*",
+)
+
+_DOWNLOADERS = frozenset({"curl", "wget", "fetch"})
+
+
+def _structural_verdict(parsed: ParsedCommand) -> tuple[str, str] | None:
+    """Checks that span more than one argv: pipes and redirections.
+
+    Input redirections go through the file-access read rules.  The
+    command's working directory is unknown, so a relative target is
+    resolved from ``/``, where ``..`` cannot climb any higher.
+    """
+    for level in parsed.walk():
+        for pipeline in level.pipelines:
+            downloading = False
+            for simple in pipeline.commands:
+                if downloading and simple.runs_code:
+                    return "blocked", "Remote code execution via pipe-to-shell"
+                downloading = downloading or simple.executable in _DOWNLOADERS
+                for redirection in simple.redirections:
+                    target = redirection.path
+                    if target.startswith(("/dev/tcp/", "/dev/udp/")):
+                        return "blocked", "Reverse shell connection"
+                    if redirection.writes and any(
+                        fnmatchcase(target, glob) for glob in PROTECTED_WRITE_TARGETS
+                    ):
+                        return "blocked", f"Overwriting protected file {target}"
+                    if redirection.operator == "<":
+                        reason = check_read_safety(target, cwd="/")[1]
+                        if reason is not None:
+                            return "blocked", reason
+    return None
+
+
+COMMAND_CACHE: ClassificationCache[str, tuple[str, str | None]] = ClassificationCache(
+    "classify_command"
+)
+
+
+def classify_command(command: str | ParsedCommand) -> tuple[str, str | None]:
     """Classify a shell command as blocked, confirm, or safe.
 
+    Every simple command is checked, including the ones inside pipelines,
+    ``sh -c`` / ``eval`` strings and wrappers such as ``sudo``; the most
+    severe verdict wins.  Verdicts are cached in :data:`COMMAND_CACHE`
+    keyed by :func:`~chaos_auditor.scenarios.classification_cache.normalize_command`.
+
     Parameters
     ----------
     command:
-        The shell command string to classify.
+        The shell command string to classify, or its parse tree from
+        :func:`~chaos_auditor.scenarios.command_parser.parse_command`.
 
     Returns
     -------
@@ -202,4 +494,25 @@ def classify_command(command: str) -> tuple[str, str | None]:
         ``"blocked"``, ``"confirm"``, or ``"safe"``. Reason is ``None``
         for safe commands.
     """
-    raise NotImplementedError
+    raw = command if isinstance(command, str) else command.raw
+    return COMMAND_CACHE.get_or_compute(
+        normalize_command(raw), lambda _: _classify(as_parsed(command))
+    )
+
+
+def _classify(parsed: ParsedCommand) -> tuple[str, str | None]:
+    verdict = _structural_verdict(parsed)
+    if verdict is not None:
+        return verdict
+    best: CommandRule | None = None
+    for simple in parsed.all_commands:
+        rule = _RULE_INDEX.lookup(simple)
+        if rule is not None and (
+            best is None or SEVERITY[rule.classification] > SEVERITY[best.classification]
+        ):
+            best = rule
+            if rule.classification == "blocked":
+                break
+    if best is None:
+        return "safe", None
+    return best.classification, best.reason
@@ -13,7 +13,12 @@ Also validates that benign content is not falsely flagged.
 
 from __future__ import annotations
 
+import re
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
+from functools import lru_cache
+
+from chaos_auditor.scenarios.pattern_safety import GuardedPattern
 
 
 @dataclass(frozen=True)
@@ -110,9 +115,210 @@ SAFE_CONTENT: list[ContentScenario] = [
 ]
 
 
+# --- Content rules ---
+
+
+@dataclass(frozen=True)
+class ContentRule:
+    """A dangerous-content rule.
+
+    Both are matched against the lowercased content.  *indicator* is a
+    lowercase literal that must occur in it.  When *pattern* is given, it
+    must also match somewhere from the line of the indicator's first
+    occurrence onward; patterns should contain the indicator so they only
+    match near it, and must be written in lowercase.  A pattern at risk of
+    catastrophic backtracking runs on the linear-time matcher of
+    :class:`~chaos_auditor.scenarios.pattern_safety.GuardedPattern`.
+    """
+
+    indicator: str
+    reason: str
+    pattern: str | None = None
+
+
+def _word(literal: str) -> str:
+    """Regex for *literal* at a word start, with the literal first.
+
+    Leading with the literal (and checking the boundary with a
+    lookbehind) lets the regex engine skip ahead with a substring search
+    instead of trying every position, which ``\\b`` up front prevents.
+    """
+    escaped = re.escape(literal)
+    return rf"{escaped}(?<!\w{escaped})"
+
+
+def _arguments(command: str, excluded: str = r"\n") -> str:
+    """Regex for what follows a :func:`_word` *command*, up to where it recurs.
+
+    Stopping where the next match could start means a failing search
+    reads each character once, instead of once per occurrence of the
+    command before it (``curl curl curl ...``).
+    """
+    return rf"(?:(?!{_word(command)}\b)[^{excluded}])*"
+
+
+CONTENT_RULES: list[ContentRule] = [
+    ContentRule("/dev/tcp/", "Reverse shell payload"),
+    ContentRule("/dev/udp/", "Reverse shell payload"),
+    ContentRule(
+        "curl",
+        "Download piped to shell",
+        _word("curl") + r"\b" + _arguments("curl", r"|\n") + r"\|\s*(sudo\s+)?\w*sh\b",
+    ),
+    ContentRule(
+        "wget",
+        "Download piped to shell",
+        _word("wget") + r"\b" + _arguments("wget", r"|\n") + r"\|\s*(sudo\s+)?\w*sh\b",
+    ),
+    ContentRule(
+        "curl",
+        "Data exfiltration via curl",
+        _word("curl")
+        + r"\b"
+        + _arguments("curl")
+        + r"\s(-d|--data[\w-]*|-f|--form|-t|--upload-file)\s+@",
+    ),
+    ContentRule("/etc/shadow", "Shadow file access"),
+    ContentRule("/etc/gshadow", "Shadow file access"),
+    ContentRule(
+        ".ssh/id_", "SSH private key access", r"\.ssh/id_(rsa|dsa|ecdsa|ed25519)\b(?!\.pub)"
+    ),
+    ContentRule("mimikatz", "Credential dumping tool reference"),
+    ContentRule(
+        "rm ",
+        "Destructive filesystem wipe",
+        # Up to 32 option words: an unbounded run would be rescanned from
+        # each "rm" inside it (rm -rm -rm ...) and have to run guarded.
+        _word("rm") + r"\s+(?=(?:-\w+\s+){0,31}-\w*r)(?:-\w+\s+){1,32}/(\*|\s|$)",
+    ),
+    ContentRule("chmod", "SUID escalation", _word("chmod") + r"\s+([ugoa]*\+s\b|[2467][0-7]{3}\b)"),
+    ContentRule("invoke-expression", "PowerShell Invoke-Expression"),
+    ContentRule("iex", "PowerShell Invoke-Expression", _word("iex") + r"\b\s*[(\"'$]"),
+    ContentRule("mkfs", "Filesystem formatting", _word("mkfs") + r"(\.\w+)?\s"),
+]
+
+_Trie = dict[str, "_Trie"]
+
+
+class KeywordAutomaton:
+    """Finds every occurrence of a set of keywords in one pass over the text.
+
+    The keywords are merged into a trie, and the trie is compiled into a
+    single regular expression (``/dev/tcp/`` and ``/dev/udp/`` become
+    ``/dev/(?:tcp/|udp/)``), so the scan runs inside the regex engine
+    and visits each position once, however many keywords there are.
+    Overlapping occurrences are reported too: after a match the search
+    resumes one character later, and keywords that are a prefix of the
+    matched one are reported at the same position.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords = tuple(dict.fromkeys(k for k in keywords if k))
+        trie: _Trie = {}
+        for keyword in self.keywords:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        self._regex = re.compile(_trie_pattern(trie) if trie else "(?!)", re.DOTALL)
+        self._prefixes = {
+            keyword: tuple(
+                other for other in self.keywords if other != keyword and keyword.startswith(other)
+            )
+            for keyword in self.keywords
+        }
+
+    def finditer(self, text: str, pos: int = 0) -> Iterator[tuple[int, str]]:
+        """Yield ``(index, keyword)`` for every occurrence, in text order."""
+        search = self._regex.search
+        match = search(text, pos)
+        while match is not None:
+            start = match.start()
+            keyword = match.group()
+            yield start, keyword
+            for prefix in self._prefixes[keyword]:
+                yield start, prefix
+            match = search(text, start + 1)
+
+
+def _trie_pattern(node: _Trie) -> str:
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if "" in node:
+        # Longest keyword first; the shorter ones are reported as prefixes.
+        branches.append("")
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+_CONFIRM_PATTERNS = {
+    rule.pattern: GuardedPattern(rule.pattern) for rule in CONTENT_RULES if rule.pattern is not None
+}
+_RULES_BY_INDICATOR: dict[str, list[ContentRule]] = {}
+for _rule in CONTENT_RULES:
+    _RULES_BY_INDICATOR.setdefault(_rule.indicator, []).append(_rule)
+
+
+_MAX_INDICATOR_LENGTH = max(len(indicator) for indicator in _RULES_BY_INDICATOR)
+
+DEFAULT_SCAN_WINDOW = 4096
+
+
+@lru_cache(maxsize=256)
+def _automaton_for(indicators: frozenset[str]) -> KeywordAutomaton:
+    return KeywordAutomaton(sorted(indicators))
+
+
+def _confirmed(rule: ContentRule, text: str, start: int, final: bool) -> bool:
+    if rule.pattern is None:
+        return True
+    match = _CONFIRM_PATTERNS[rule.pattern].search(text, start)
+    # A match running into the end of a non-final window may still change
+    # with the next chunk; it is re-checked then.
+    return match is not None and (final or match.end() < len(text))
+
+
+def _scan_window(
+    text: str,
+    live: dict[str, list[ContentRule]],
+    armed: list[ContentRule],
+    final: bool,
+) -> ContentRule | None:
+    """Scan lowercased *text*, updating the live and armed rule sets.
+
+    *live* maps indicators not seen yet to their rules; *armed* holds the
+    rules whose indicator was seen but whose confirmation regex has not
+    matched yet.  Returns the first rule that fires.
+    """
+    for rule in armed:
+        if _confirmed(rule, text, 0, final):
+            return rule
+    pos = 0
+    while live:
+        for index, indicator in _automaton_for(frozenset(live)).finditer(text, pos):
+            line_start = text.rfind("\n", 0, index) + 1
+            for rule in live.pop(indicator):
+                if _confirmed(rule, text, line_start, final):
+                    return rule
+                armed.append(rule)
+            # Resume at the same index: another indicator may start there.
+            pos = index
+            break
+        else:
+            break
+    return None
+
+
 def scan_write_content(content: str) -> tuple[str, str | None]:
     """Scan content intended for file write operations.
 
+    All rule indicators are located in one pass of a keyword automaton
+    compiled from ``CONTENT_RULES``.  At the first hit of an indicator,
+    its rules' confirmation regexes run once, from the start of the hit's
+    line to the end of the content; an indicator whose rules did not
+    fire is dropped from the automaton and the pass resumes where it
+    stopped.  The scan returns at the first confirmed rule.
+
     Parameters
     ----------
     content:
@@ -123,4 +329,109 @@ def scan_write_content(content: str) -> tuple[str, str | None]:
     tuple[str, str | None]
         (classification, reason) — ``"blocked"`` or ``"safe"``.
     """
-    raise NotImplementedError
+    rule = _scan_window(content.lower(), dict(_RULES_BY_INDICATOR), [], final=True)
+    if rule is None:
+        return "safe", None
+    return "blocked", rule.reason
+
+
+class ContentStreamScanner:
+    """Incremental :func:`scan_write_content` for content written in chunks.
+
+    Feed chunks as they are written; :meth:`feed` returns the blocking
+    verdict as soon as a rule fires, after which further input is
+    ignored.  Between chunks only the last line is kept, and at most
+    *window* characters of it, so memory stays bounded on
+    single-line payloads such as base64 blobs.  The verdict matches
+    :func:`scan_write_content` on the whole content as long as no
+    confirmation match spans more than *window* characters or a line
+    break at a chunk boundary.
+
+    Parameters
+    ----------
+    window:
+        Maximum number of characters carried over between chunks.
+    """
+
+    def __init__(self, window: int = DEFAULT_SCAN_WINDOW) -> None:
+        if window < _MAX_INDICATOR_LENGTH:
+            raise ValueError(
+                f"window must be at least {_MAX_INDICATOR_LENGTH} characters, got {window}"
+            )
+        self.window = window
+        self._live = dict(_RULES_BY_INDICATOR)
+        self._armed: list[ContentRule] = []
+        self._carry = ""
+        self._rule: ContentRule | None = None
+        self._finished = False
+
+    @property
+    def blocked(self) -> bool:
+        """Whether a blocking indicator has been found."""
+        return self._rule is not None
+
+    def _verdict(self) -> tuple[str, str | None]:
+        if self._rule is None:
+            return "safe", None
+        return "blocked", self._rule.reason
+
+    def feed(self, chunk: str) -> tuple[str, str | None] | None:
+        """Scan the next *chunk*.
+
+        Returns
+        -------
+        tuple[str, str | None] | None
+            ``("blocked", reason)`` once the content is known to be
+            dangerous, ``None`` while it is still undecided.
+        """
+        if self._rule is not None:
+            return self._verdict()
+        if self._finished:
+            raise ValueError("feed() called after finish()")
+        text = self._carry + chunk.lower()
+        self._rule = _scan_window(text, self._live, self._armed, final=False)
+        if self._rule is not None:
+            self._carry = ""
+            return self._verdict()
+        # Keep the last line, with its newline if complete: a confirmation
+        # match running into the end of the text starts there.
+        keep_from = max(text.rfind("\n", 0, len(text) - 1) + 1, len(text) - self.window)
+        self._carry = text[keep_from:]
+        return None
+
+    def finish(self) -> tuple[str, str | None]:
+        """Scan the held-back tail and return the final verdict."""
+        if self._rule is None and not self._finished:
+            self._rule = _scan_window(self._carry, self._live, self._armed, final=True)
+        self._finished = True
+        self._carry = ""
+        return self._verdict()
+
+
+def scan_write_stream(
+    chunks: Iterable[str],
+    *,
+    window: int = DEFAULT_SCAN_WINDOW,
+) -> tuple[str, str | None]:
+    """Scan content given as an iterable of chunks, stopping at the first block.
+
+    Chunks after the first blocking indicator are not consumed.
+
+    Parameters
+    ----------
+    chunks:
+        Pieces of the content, in order.
+    window:
+        See :class:`ContentStreamScanner`.
+
+    Returns
+    -------
+    tuple[str, str | None]
+        (classification, reason) — ``"blocked"`` or ``"safe"``.
+    """
+    scanner = ContentStreamScanner(window)
+    for chunk in chunks:
+        verdict = scanner.feed(chunk)
+        if verdict is not None:
+            return verdict
+    return scanner.finish()
@@ -0,0 +1,252 @@
+"""Layered deobfuscation of shell commands.
+
+``sh -c`` and ``eval`` nesting is unwrapped by the command parser, but a
+payload can also be hidden in data that a pipeline decodes before
+running it: ``echo <base64> | base64 -d | sh``, ``bash <<< "..."``,
+``echo di | rev | sh`` or ``$(printf '\\x69\\x64')``.  :func:`deobfuscate`
+evaluates the literal data flowing through each pipeline, decodes it
+and parses the result again, layer after layer, so a classifier can look
+at what would actually run.
+
+Attacker-controlled input must not make the analysis expensive: each
+distinct payload is expanded once, layers deeper than *max_depth* and
+work beyond *max_work* characters are not followed, and the result
+records whether anything was left unexplored.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import re
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+
+from chaos_auditor.scenarios.command_parser import (
+    SHELLS,
+    ParsedCommand,
+    SimpleCommand,
+    as_parsed,
+    parse_command,
+)
+
+# Bound on decoding layers followed below the original command.
+MAX_DEOBFUSCATION_DEPTH = 8
+# Bound on characters decoded and parsed for one command, over all layers.
+MAX_DEOBFUSCATION_WORK = 256 * 1024
+
+_DECODE_FLAGS = frozenset({"-d", "-D", "--decode"})
+_HEX_PLAIN_FLAGS = frozenset({"-p", "-ps", "-plain"})
+_ESCAPE_RE = re.compile(r"\\(x[0-9a-fA-F]{1,2}|[0-7]{1,3}|.)", re.DOTALL)
+_SIMPLE_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "a": "\a", "v": "\v", "f": "\f"}
+_PRINTF_PASSTHROUGH = frozenset({"%s", "%s\\n", "%b", "%b\\n"})
+
+
+@dataclass(frozen=True)
+class Layer:
+    """A payload recovered from encoded or indirect data in a command."""
+
+    payload: str
+    path: tuple[str, ...]  # encodings peeled off, outermost first, e.g. ("base64", "rev")
+
+    @property
+    def depth(self) -> int:
+        return len(self.path)
+
+
+@dataclass(frozen=True)
+class Deobfuscation:
+    """Every distinct layer found under a command."""
+
+    layers: tuple[Layer, ...]
+    truncated: bool  # the depth or work bound stopped the expansion
+
+
+def _unescape_match(match: re.Match[str]) -> str:
+    code = match.group(1)
+    if code[0] == "x":
+        return chr(int(code[1:], 16))
+    if code[0] in "01234567":
+        return chr(int(code, 8) & 0xFF)
+    return _SIMPLE_ESCAPES.get(code, code)
+
+
+def _unescape(text: str) -> str:
+    """Expand the backslash escapes understood by ``printf`` and ``echo -e``."""
+    return _ESCAPE_RE.sub(_unescape_match, text) if "\\" in text else text
+
+
+def _text(data: bytes) -> str | None:
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None  # binary data is not a command
+
+
+def _b64(data: str) -> str | None:
+    compact = "".join(data.split())
+    try:
+        return _text(base64.b64decode(compact + "=" * (-len(compact) % 4), validate=True))
+    except binascii.Error:
+        return None
+
+
+def _b32(data: str) -> str | None:
+    compact = "".join(data.split()).upper()
+    try:
+        return _text(base64.b32decode(compact + "=" * (-len(compact) % 8)))
+    except binascii.Error:
+        return None
+
+
+def _hex(data: str) -> str | None:
+    try:
+        return _text(bytes.fromhex("".join(data.split())))
+    except ValueError:
+        return None
+
+
+def _rev(data: str) -> str | None:
+    return "\n".join(line[::-1] for line in data.split("\n"))
+
+
+_DECODE: dict[str, Callable[[str], str | None]] = {
+    "base64": _b64,
+    "base32": _b32,
+    "hex": _hex,
+    "rev": _rev,
+}
+
+
+@lru_cache(maxsize=256)
+def _decode(encoding: str, data: str) -> str | None:
+    return _DECODE[encoding](data)
+
+
+def _decoder(command: SimpleCommand) -> str | None:
+    """Encoding removed by *command* when it filters stdin, if any."""
+    exe = command.executable
+    if exe in ("base64", "base32") and command.flags & _DECODE_FLAGS and not command.args:
+        return exe
+    if exe == "xxd" and "-r" in command.flags and command.flags & _HEX_PLAIN_FLAGS:
+        return "hex"
+    if exe == "rev" and not command.args:
+        return "rev"
+    return None
+
+
+def _literal(command: SimpleCommand) -> tuple[str, tuple[str, ...]] | None:
+    """Text *command* writes to stdout when it is a literal ``echo`` / ``printf``."""
+    if command.executable == "echo":
+        words = list(command.argv[1:])
+        escapes = False
+        while words and words[0] in ("-n", "-e", "-E", "-ne", "-en"):
+            escapes = escapes or "e" in words[0]
+            words.pop(0)
+        text = " ".join(words)
+    elif command.executable == "printf" and len(command.argv) in (2, 3):
+        if len(command.argv) == 2:
+            text, escapes = command.argv[1], True
+        elif command.argv[1] in _PRINTF_PASSTHROUGH:
+            text, escapes = command.argv[2], "b" in command.argv[1]
+        else:
+            return None
+    else:
+        return None
+    if escapes:
+        unescaped = _unescape(text)
+        if unescaped != text:
+            return unescaped, ("escape",)
+    return text, ()
+
+
+def _stages(command: SimpleCommand) -> Iterator[SimpleCommand]:
+    inner: SimpleCommand | None = command
+    while inner is not None:
+        yield inner
+        inner = inner.wrapped
+
+
+def _reads_stdin_code(command: SimpleCommand) -> bool:
+    return command.executable in SHELLS and not command.args and "-c" not in command.flags
+
+
+def _pipeline_layers(parsed: ParsedCommand) -> Iterator[Layer]:
+    """Payloads recovered from the data flowing through *parsed*'s pipelines."""
+    for level in parsed.walk():
+        for pipeline in level.pipelines:
+            data: str | None = None
+            path: tuple[str, ...] = ()
+            for simple in pipeline.commands:
+                *_, stage = _stages(simple)
+                here = [r.target for r in simple.redirections if r.operator == "<<<"]
+                if here:
+                    data, path = here[-1], ()
+                encoding = _decoder(stage)
+                if encoding is not None and data is not None:
+                    data = _decode(encoding, data)
+                    path = (*path, encoding)
+                    continue
+                if data is not None and (path or _reads_stdin_code(stage)):
+                    yield Layer(data, path or ("stdin",))
+                data, path = None, ()
+                literal = _literal(stage)
+                if literal is not None:
+                    data, path = literal
+            if data is not None and path:
+                # Decoded output that leaves the pipeline may still be run,
+                # e.g. through command substitution.
+                yield Layer(data, path)
+
+
+def deobfuscate(
+    command: str | ParsedCommand,
+    *,
+    max_depth: int = MAX_DEOBFUSCATION_DEPTH,
+    max_work: int = MAX_DEOBFUSCATION_WORK,
+) -> Deobfuscation:
+    """Recover the payloads hidden in *command*, layer by layer.
+
+    Literal ``echo`` / ``printf`` / here-string data is followed through
+    ``base64 -d``, ``base32 -d``, ``xxd -r -p`` and ``rev`` filters.  A
+    recovered payload that is decoded or fed to a shell becomes a layer,
+    and is itself parsed and searched for further layers.
+
+    Parameters
+    ----------
+    command:
+        The shell command string, or its parse tree.
+    max_depth:
+        Maximum number of encodings peeled off a single payload.
+    max_work:
+        Maximum number of payload characters parsed over all layers.
+
+    Returns
+    -------
+    Deobfuscation
+        The distinct layers in discovery order, and whether a bound was hit.
+    """
+    if max_depth < 0:
+        raise ValueError(f"max_depth must be non-negative, got {max_depth}")
+    if max_work < 0:
+        raise ValueError(f"max_work must be non-negative, got {max_work}")
+    seen: set[str] = set()
+    layers: list[Layer] = []
+    truncated = False
+    work = 0
+    pending: list[tuple[ParsedCommand, tuple[str, ...]]] = [(as_parsed(command), ())]
+    while pending:
+        parsed, prefix = pending.pop()
+        for layer in _pipeline_layers(parsed):
+            if layer.payload in seen:
+                continue
+            layer = Layer(layer.payload, (*prefix, *layer.path))
+            if layer.depth > max_depth or work + len(layer.payload) > max_work:
+                truncated = True
+                continue
+            seen.add(layer.payload)
+            work += len(layer.payload)
+            layers.append(layer)
+            pending.append((parse_command(layer.payload), layer.path))
+    return Deobfuscation(tuple(layers), truncated)
@@ -7,7 +7,10 @@ agent guardrails for preventing credential theft and system corruption.
 
 from __future__ import annotations
 
+import os
+import posixpath
 from dataclasses import dataclass
+from fnmatch import fnmatchcase
 
 
 @dataclass(frozen=True)
@@ -103,33 +106,255 @@ WRITE_BLOCKED_PATHS: list[FileAccessScenario] = [
 ]
 
 
-def check_read_safety(path: str) -> tuple[str, str | None]:
+# --- Path rules ---
+
+# Home directories a leading "~" in a rule pattern stands for.
+HOME_PATTERNS = ("/root", "/home/*", "~")
+
+
+def _components(path: str) -> list[str]:
+    """Split a normalized path; absolute paths start with an empty component."""
+    return [""] if path == "/" else path.split("/")
+
+
+def _is_glob(segment: str) -> bool:
+    return any(ch in segment for ch in "*?[")
+
+
+def _expand_home(pattern: str) -> list[str]:
+    if pattern == "~" or pattern.startswith("~/"):
+        return [home + pattern[1:] for home in HOME_PATTERNS]
+    return [pattern]
+
+
+def _match_components(pattern: list[str], path: list[str]) -> bool:
+    if not pattern:
+        return not path
+    head, rest = pattern[0], pattern[1:]
+    if head == "**":
+        return any(_match_components(rest, path[i:]) for i in range(len(path) + 1))
+    return bool(path) and fnmatchcase(path[0], head) and _match_components(rest, path[1:])
+
+
+@dataclass(frozen=True)
+class PathRule:
+    """A blocked path pattern.
+
+    *pattern* is matched against the normalized path one component at a
+    time: a segment may be a glob matching a single component
+    (``/proc/*/environ``), ``**`` matches any number of components
+    (``/boot/**`` covers the directory and everything below it), and a
+    leading ``~`` stands for any home directory.
+    """
+
+    pattern: str
+    reason: str
+
+    def matches(self, path: str, *, cwd: str | None = None) -> bool:
+        """Return whether *path* falls under this rule.
+
+        *path* is normalized first; see :func:`normalize_path`.
+        """
+        parts = _components(normalize_path(path, cwd=cwd))
+        return any(
+            _match_components(_components(pattern), parts) for pattern in _expand_home(self.pattern)
+        )
+
+
+class _TrieNode:
+    __slots__ = ("children", "globs", "any_depth", "loops", "rule")
+
+    def __init__(self, loops: bool = False) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.globs: list[tuple[str, _TrieNode]] = []
+        self.any_depth: _TrieNode | None = None  # child for a "**" segment
+        self.loops = loops  # reached through "**": may consume any component
+        self.rule: tuple[int, PathRule] | None = None
+
+
+class PathRuleTrie:
+    """Path-component trie compiled from a list of :class:`PathRule`.
+
+    Literal components are dictionary lookups; glob segments and ``**``
+    are followed alongside them, so a lookup costs time proportional to
+    the depth of the path (times the number of glob branches alive at
+    once) rather than to the number of rules.  When several rules
+    match, the one listed first wins.
+    """
+
+    def __init__(self, rules: list[PathRule]) -> None:
+        self._root = _TrieNode()
+        self._size = len(rules)
+        for order, rule in enumerate(rules):
+            for pattern in _expand_home(rule.pattern):
+                self._insert(_components(pattern), order, rule)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _insert(self, parts: list[str], order: int, rule: PathRule) -> None:
+        node = self._root
+        for part in parts:
+            if part == "**":
+                if node.any_depth is None:
+                    node.any_depth = _TrieNode(loops=True)
+                node = node.any_depth
+            elif _is_glob(part):
+                for glob, child in node.globs:
+                    if glob == part:
+                        node = child
+                        break
+                else:
+                    child = _TrieNode()
+                    node.globs.append((part, child))
+                    node = child
+            else:
+                node = node.children.setdefault(part, _TrieNode())
+        if node.rule is None or order < node.rule[0]:
+            node.rule = (order, rule)
+
+    @staticmethod
+    def _close(nodes: list[_TrieNode]) -> list[_TrieNode]:
+        """Add the nodes reachable through "**" without consuming a component."""
+        closed: dict[int, _TrieNode] = {}
+        pending = list(nodes)
+        while pending:
+            node = pending.pop()
+            if id(node) not in closed:
+                closed[id(node)] = node
+                if node.any_depth is not None:
+                    pending.append(node.any_depth)
+        return list(closed.values())
+
+    def lookup(self, path: str) -> PathRule | None:
+        """Return the first-listed rule matching normalized *path*, if any."""
+        active = self._close([self._root])
+        for part in _components(path):
+            step: list[_TrieNode] = []
+            for node in active:
+                child = node.children.get(part)
+                if child is not None:
+                    step.append(child)
+                for glob, child in node.globs:
+                    if fnmatchcase(part, glob):
+                        step.append(child)
+                if node.loops:
+                    step.append(node)
+            if not step:
+                return None
+            active = self._close(step)
+        matches = [node.rule for node in active if node.rule is not None]
+        return min(matches, key=lambda m: m[0])[1] if matches else None
+
+
+READ_RULES: list[PathRule] = [
+    PathRule("/etc/shadow", "Password hash file"),
+    PathRule("/etc/gshadow", "Group password file"),
+    PathRule("/etc/shadow-", "Password hash backup"),
+    PathRule("/etc/gshadow-", "Group password backup"),
+    PathRule("/etc/sudoers", "Sudo configuration"),
+    PathRule("/etc/ssh/ssh_host_*_key", "Host SSH private key"),
+    PathRule("~/.ssh/id_rsa", "SSH private key"),
+    PathRule("~/.ssh/id_dsa", "SSH private key"),
+    PathRule("~/.ssh/id_ecdsa", "SSH private key"),
+    PathRule("~/.ssh/id_ed25519", "SSH private key"),
+    PathRule("~/.aws/credentials", "Cloud credentials"),
+    PathRule("~/.gnupg/**", "GnuPG keyring"),
+    PathRule("/proc/*/environ", "Process environment"),
+]
+
+WRITE_RULES: list[PathRule] = [
+    PathRule("/etc/passwd", "User database"),
+    PathRule("/etc/shadow", "Password hashes"),
+    PathRule("/etc/gshadow", "Group password hashes"),
+    PathRule("/etc/group", "Group database"),
+    PathRule("/etc/fstab", "Filesystem mount table"),
+    PathRule("/etc/sudoers", "Sudo configuration"),
+    PathRule("/etc/sudoers.d/**", "Sudo configuration"),
+    PathRule("/etc/ssh/sshd_config", "SSH daemon configuration"),
+    PathRule("/etc/crontab", "System crontab"),
+    PathRule("/etc/cron.d/**", "System crontab"),
+    PathRule("/bin/**", "Binary directory write"),
+    PathRule("/sbin/**", "Binary directory write"),
+    PathRule("/usr/bin/**", "Binary directory write"),
+    PathRule("/usr/sbin/**", "Binary directory write"),
+    PathRule("/usr/lib/**", "System library write"),
+    PathRule("/lib/**", "System library write"),
+    PathRule("/boot/**", "Kernel and bootloader files"),
+    PathRule("~/.ssh/authorized_keys", "SSH authorized keys"),
+]
+
+
+def normalize_path(path: str, *, cwd: str | None = None) -> str:
+    """Make *path* absolute and collapse ``.``/``..`` segments and duplicate slashes.
+
+    A relative *path* is taken relative to *cwd*, by default the current
+    working directory, so ``../../etc/shadow`` is matched as the file it
+    names.  Paths starting with ``~`` are left anchored at the home
+    directory the rules' ``~`` stands for.
+    """
+    if not path.startswith(("/", "~")):
+        path = posixpath.join(os.getcwd() if cwd is None else cwd, path)
+    normalized = posixpath.normpath(path)
+    # POSIX keeps a leading "//"; it names the same directory as "/".
+    return normalized[1:] if normalized.startswith("//") else normalized
+
+
+_READ_TRIE = PathRuleTrie(READ_RULES)
+_WRITE_TRIE = PathRuleTrie(WRITE_RULES)
+
+
+def reload_path_rules() -> None:
+    """Recompile the path tries after ``READ_RULES`` or ``WRITE_RULES`` changed."""
+    global _READ_TRIE, _WRITE_TRIE
+    _READ_TRIE = PathRuleTrie(READ_RULES)
+    _WRITE_TRIE = PathRuleTrie(WRITE_RULES)
+
+
+def _check(path: str, trie: PathRuleTrie, cwd: str | None) -> tuple[str, str | None]:
+    rule = trie.lookup(normalize_path(path, cwd=cwd))
+    if rule is None:
+        return "safe", None
+    return "blocked", rule.reason
+
+
+def check_read_safety(path: str, *, cwd: str | None = None) -> tuple[str, str | None]:
     """Check if a file path is safe to read.
 
     Parameters
     ----------
     path:
-        Filesystem path to check.
+        Filesystem path to check.  A relative path is resolved against
+        *cwd*, then ``.``/``..`` segments are resolved lexically before
+        matching.
+    cwd:
+        Directory relative paths are taken from; defaults to the
+        current working directory.
 
     Returns
     -------
     tuple[str, str | None]
         (classification, reason) — ``"blocked"`` or ``"safe"``.
     """
-    raise NotImplementedError
+    return _check(path, _READ_TRIE, cwd)
 
 
-def check_write_safety(path: str) -> tuple[str, str | None]:
+def check_write_safety(path: str, *, cwd: str | None = None) -> tuple[str, str | None]:
     """Check if a file path is safe to write.
 
     Parameters
     ----------
     path:
-        Filesystem path to check.
+        Filesystem path to check.  A relative path is resolved against
+        *cwd*, then ``.``/``..`` segments are resolved lexically before
+        matching.
+    cwd:
+        Directory relative paths are taken from; defaults to the
+        current working directory.
 
     Returns
     -------
     tuple[str, str | None]
         (classification, reason) — ``"blocked"`` or ``"safe"``.
     """
-    raise NotImplementedError
+    return _check(path, _WRITE_TRIE, cwd)
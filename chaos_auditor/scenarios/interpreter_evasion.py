@@ -13,6 +13,20 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from chaos_auditor.scenarios.classification_cache import (
+    ClassificationCache,
+    normalize_command,
+)
+from chaos_auditor.scenarios.command_parser import (
+    INTERPRETERS,
+    SHELLS,
+    ParsedCommand,
+    SimpleCommand,
+    as_parsed,
+    parse_command,
+)
+from chaos_auditor.scenarios.deobfuscation import deobfuscate
+
 
 @dataclass(frozen=True)
 class EvasionScenario:
@@ -134,6 +148,28 @@ EVASION_PATTERNS: list[EvasionScenario] = [
         description="find -delete (bulk delete)",
         technique="find_delete",
     ),
+    # Layered obfuscation
+    EvasionScenario(
+        command=(
+            "$(echo YmFzaCAtYyAiZWNobyBjSGwwYUc5dU15QXRZeUFpYVcxd2IzSjBJRzl6SWc9PSB8"
+            "IGJhc2U2NCAtZCI= | base64 -d)"
+        ),
+        expected="blocked",
+        description="base64 inside bash -c inside base64, run by command substitution",
+        technique="nested_obfuscation",
+    ),
+    EvasionScenario(
+        command="bash <<< \"python3 -c 'import os'\"",
+        expected="blocked",
+        description="Inline interpreter fed to bash through a here-string",
+        technique="nested_obfuscation",
+    ),
+    EvasionScenario(
+        command="echo '1 e- lrep' | rev | sh",
+        expected="blocked",
+        description="Reversed inline interpreter piped to sh",
+        technique="nested_obfuscation",
+    ),
 ]
 
 
@@ -244,17 +280,108 @@ SAFE_REGRESSION: list[EvasionScenario] = [
 ]
 
 
-def classify_interpreter_command(command: str) -> tuple[str, str | None]:
+_POWERSHELLS = frozenset({"powershell", "powershell.exe", "pwsh", "pwsh.exe"})
+_POWERSHELL_INLINE = frozenset({"-c", "-command", "-e", "-enc", "-encodedcommand"})
+_INVOKE_EXPRESSION = ("invoke-expression", "iex")
+_BASE64_DECODE = frozenset({"-d", "-D", "--decode"})
+_FIND_EXEC = frozenset({"-exec", "-execdir", "-ok", "-okdir"})
+_DELETERS = frozenset({"rm", "shred", "unlink"})
+
+
+def _blocked_reason(command: SimpleCommand) -> str | None:
+    """Reason a single simple command is an evasion attempt, if it is one."""
+    exe = command.executable
+    lowered = exe.lower()
+    if command.interpreter is not None and command.flags & INTERPRETERS[command.interpreter]:
+        return f"Inline {command.interpreter} code execution"
+    if exe == "eval":
+        return "eval indirection"
+    if exe in SHELLS and "-c" in command.flags:
+        return f"{exe} -c inline execution"
+    if lowered.startswith(_INVOKE_EXPRESSION) and (
+        lowered in _INVOKE_EXPRESSION or lowered.startswith(("iex(", "invoke-expression("))
+    ):
+        return "PowerShell Invoke-Expression"
+    if lowered in _POWERSHELLS and {f.lower() for f in command.flags} & _POWERSHELL_INLINE:
+        return "PowerShell inline command"
+    if exe == "crontab" and command.flags & {"-r", "-e"}:
+        return "Crontab modification"
+    if exe == "find":
+        if "-delete" in command.argv:
+            return "find -delete (bulk delete)"
+        for i, token in enumerate(command.argv[:-1]):
+            if token in _FIND_EXEC and command.argv[i + 1].rsplit("/", 1)[-1] in _DELETERS:
+                return f"find {token} {command.argv[i + 1]} (bulk delete)"
+    if exe == "xargs":
+        inner = command.wrapped
+        if inner is not None and inner.executable in _DELETERS:
+            return f"xargs {inner.executable} (bulk delete via pipe)"
+    return None
+
+
+INTERPRETER_CACHE: ClassificationCache[str, tuple[str, str | None]] = ClassificationCache(
+    "classify_interpreter_command"
+)
+
+
+def classify_interpreter_command(command: str | ParsedCommand) -> tuple[str, str | None]:
     """Classify a command for interpreter evasion attempts.
 
+    Every payload recovered by
+    :func:`~chaos_auditor.scenarios.deobfuscation.deobfuscate` is
+    classified too, and the most severe verdict wins.  Verdicts are cached
+    in :data:`INTERPRETER_CACHE` keyed by
+    :func:`~chaos_auditor.scenarios.classification_cache.normalize_command`.
+
     Parameters
     ----------
     command:
-        The shell command string to classify.
+        The shell command string to classify, or its parse tree from
+        :func:`~chaos_auditor.scenarios.command_parser.parse_command`.
 
     Returns
     -------
     tuple[str, str | None]
         (classification, reason) — ``"blocked"``, ``"confirm"``, or ``"safe"``.
     """
-    raise NotImplementedError
+    raw = command if isinstance(command, str) else command.raw
+    return INTERPRETER_CACHE.get_or_compute(
+        normalize_command(raw), lambda _: _classify(as_parsed(command))
+    )
+
+
+def _classify(parsed: ParsedCommand) -> tuple[str, str | None]:
+    verdict = _classify_layer(parsed)
+    if verdict[0] == "blocked":
+        return verdict
+    unwrapped = deobfuscate(parsed)
+    for layer in unwrapped.layers:
+        classification, reason = _classify_layer(parse_command(layer.payload))
+        if classification == "blocked" or (classification, verdict[0]) == ("confirm", "safe"):
+            verdict = classification, f"{reason} (deobfuscated: {' > '.join(layer.path)})"
+            if classification == "blocked":
+                return verdict
+    if unwrapped.truncated and verdict[0] == "safe":
+        return "confirm", "Obfuscated payload too deep or too large to deobfuscate"
+    return verdict
+
+
+def _classify_layer(parsed: ParsedCommand) -> tuple[str, str | None]:
+    for level in parsed.walk():
+        for pipeline in level.pipelines:
+            decoding = False
+            for simple in pipeline.commands:
+                if decoding and simple.runs_code:
+                    return "blocked", "Base64-decoded payload piped to an interpreter"
+                decoding = decoding or (
+                    simple.executable == "base64" and bool(simple.flags & _BASE64_DECODE)
+                )
+    script: str | None = None
+    for simple in parsed.all_commands:
+        reason = _blocked_reason(simple)
+        if reason is not None:
+            return "blocked", reason
+        script = script or simple.script_path
+    if script is not None:
+        return "confirm", f"Script execution: {script}"
+    return "safe", None
@@ -0,0 +1,1083 @@
+"""Load-time ReDoS checks and a linear-time matcher for risky patterns.
+
+In-house ``SecretScenario`` and ``ContentRule`` patterns run on
+everything the agent reads and writes, so a single pattern with
+catastrophic backtracking (``(\\w+\\s?)*$``) can stall the guard for
+minutes on one crafted input.  Catalog patterns are therefore loaded
+through :class:`GuardedPattern`:
+
+- :func:`redos_risk` flags patterns whose structure lets the
+  backtracking ``re`` engine try exponentially many ways to match the
+  same text (a quantifier nested in another, where one iteration can
+  end on what starts the next one) or polynomially many (quantified
+  runs over overlapping characters, adjacent or around a separator both
+  can match, and unbounded runs before a required suffix, which a
+  failing search rescans from every start);
+- flagged patterns do not run on ``re``.  :class:`LinearPattern`
+  simulates them as an NFA (a Pike VM), whose work grows linearly with
+  the input, under a step budget per match attempt.  A search that
+  exhausts its budget fails closed: it reports a match from where its unfinished
+  attempt started to the end of the line the attempt had reached.
+
+:func:`pattern_safety_stats` reports, per flagged pattern, why it was
+flagged, how often it ran and how often it hit its budget.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from re import _parser  # type: ignore[attr-defined]
+from typing import Any, AnyStr, Generic, Protocol
+
+# Thread steps a LinearPattern may take in one match attempt; a few tens
+# of milliseconds.
+DEFAULT_STEP_BUDGET = 100_000
+
+# Bound on the size of a compiled LinearPattern; counted repetitions are
+# expanded, so ``(?:...){1,5000}`` can get large.
+MAX_PROGRAM_SIZE = 20_000
+
+Pred = Callable[[int], bool]
+
+# Characters on which character sets are compared by redos_risk.
+_SAMPLE = (*range(256), 0x3B1, 0x416, 0x4E00, 0x660, 0x2003, 0x2028, 0xFF10)
+_ASCII_SPACE = frozenset(b" \t\n\r\f\v")
+
+
+class UnsupportedPatternError(ValueError):
+    """A flagged pattern uses a construct :class:`LinearPattern` cannot run."""
+
+
+class PatternBudgetError(Exception):
+    """A :class:`LinearPattern` search ran out of steps.
+
+    *start* is where the unfinished match attempt started and *stop* the
+    position it had reached.
+    """
+
+    def __init__(self, start: int, stop: int) -> None:
+        super().__init__(f"step budget exhausted by a match attempt from {start} reaching {stop}")
+        self.start = start
+        self.stop = stop
+
+
+class SpanMatch(Protocol):
+    """The parts of ``re.Match`` that scanners use, shared by :class:`LinearMatch`."""
+
+    @property
+    def lastgroup(self) -> str | None: ...
+
+    def start(self) -> int: ...
+
+    def end(self) -> int: ...
+
+    def span(self) -> tuple[int, int]: ...
+
+
+@dataclass(frozen=True)
+class LinearMatch:
+    """A match found by :class:`LinearPattern`; only its span is known."""
+
+    bounds: tuple[int, int]
+    lastgroup: str | None = None
+
+    def start(self) -> int:
+        return self.bounds[0]
+
+    def end(self) -> int:
+        return self.bounds[1]
+
+    def span(self) -> tuple[int, int]:
+        return self.bounds
+
+
+# --- Character predicates ---
+
+
+def _is_word(c: int, unicode: bool) -> bool:
+    return c == 95 or ((unicode or c < 128) and chr(c).isalnum())
+
+
+def _category(category: Any, unicode: bool) -> Pred:
+    if category in (_parser.CATEGORY_DIGIT, _parser.CATEGORY_NOT_DIGIT):
+        pred: Pred = (lambda c: chr(c).isdecimal()) if unicode else (lambda c: 48 <= c <= 57)
+        negate = category is _parser.CATEGORY_NOT_DIGIT
+    elif category in (_parser.CATEGORY_SPACE, _parser.CATEGORY_NOT_SPACE):
+        pred = (lambda c: chr(c).isspace()) if unicode else _ASCII_SPACE.__contains__
+        negate = category is _parser.CATEGORY_NOT_SPACE
+    elif category in (_parser.CATEGORY_WORD, _parser.CATEGORY_NOT_WORD):
+        pred = lambda c: _is_word(c, unicode)  # noqa: E731
+        negate = category is _parser.CATEGORY_NOT_WORD
+    else:
+        raise UnsupportedPatternError(f"category {category} is not supported")
+    return (lambda c: not pred(c)) if negate else pred
+
+
+def _set(items: Sequence[tuple[Any, Any]], unicode: bool) -> Pred:
+    literals: set[int] = set()
+    ranges: list[tuple[int, int]] = []
+    categories: list[Pred] = []
+    negate = False
+    for op, av in items:
+        if op is _parser.NEGATE:
+            negate = True
+        elif op is _parser.LITERAL:
+            literals.add(av)
+        elif op is _parser.RANGE:
+            ranges.append(av)
+        elif op is _parser.CATEGORY:
+            categories.append(_category(av, unicode))
+        else:
+            raise UnsupportedPatternError(f"{op} in a character set is not supported")
+
+    def pred(c: int) -> bool:
+        found = (
+            c in literals
+            or any(lo <= c <= hi for lo, hi in ranges)
+            or any(category(c) for category in categories)
+        )
+        return found != negate
+
+    return pred
+
+
+def _casefold(pred: Pred, unicode: bool) -> Pred:
+    def variants(c: int) -> tuple[int, ...]:
+        if not unicode and c >= 128:
+            return (c,)
+        ch = chr(c)
+        lower, upper = ch.lower(), ch.upper()
+        return (
+            c,
+            ord(lower) if len(lower) == 1 else c,
+            ord(upper) if len(upper) == 1 else c,
+        )
+
+    return lambda c: any(pred(v) for v in variants(c))
+
+
+def _char_pred(op: Any, av: Any, flags: int, unicode: bool) -> Pred | None:
+    """Predicate of a single-character node, or ``None`` for other nodes."""
+    if op is _parser.ANY:
+        return (lambda c: True) if flags & re.DOTALL else (lambda c: c != 10)
+    if op is _parser.LITERAL:
+        pred: Pred = av.__eq__
+    elif op is _parser.NOT_LITERAL:
+        pred = av.__eq__
+    elif op is _parser.IN:
+        pred = _set(av, unicode)
+    else:
+        return None
+    if flags & re.IGNORECASE:
+        pred = _casefold(pred, unicode)
+    if op is _parser.NOT_LITERAL:
+        matches = pred
+        return lambda c: not matches(c)
+    return pred
+
+
+def _unicode(pattern: str | bytes, flags: int) -> bool:
+    return isinstance(pattern, str) and not flags & re.ASCII
+
+
+# --- Static analysis ---
+
+
+@dataclass(frozen=True)
+class _Info:
+    first: tuple[Pred, ...]  # characters a match can start with
+    nullable: bool  # can match the empty string
+    chars: tuple[Pred, ...]  # characters a match can contain
+
+
+_ANYTHING: tuple[Pred, ...] = (lambda c: True,)
+
+
+def _overlap(left: Sequence[Pred], right: Sequence[Pred]) -> bool:
+    return any(any(p(c) for p in left) and any(q(c) for q in right) for c in _SAMPLE)
+
+
+def _seq_info(items: Sequence[tuple[Any, Any]], flags: int, unicode: bool) -> _Info:
+    first: list[Pred] = []
+    chars: list[Pred] = []
+    nullable = True
+    for op, av in items:
+        info = _node_info(op, av, flags, unicode)
+        chars.extend(info.chars)
+        if nullable:
+            first.extend(info.first)
+            nullable = info.nullable
+    return _Info(tuple(first), nullable, tuple(chars))
+
+
+def _node_info(op: Any, av: Any, flags: int, unicode: bool) -> _Info:
+    pred = _char_pred(op, av, flags, unicode)
+    if pred is not None:
+        return _Info((pred,), False, (pred,))
+    if op is _parser.SUBPATTERN:
+        _, add, remove, body = av
+        return _seq_info(body, (flags | add) & ~remove, unicode)
+    if op is _parser.BRANCH:
+        infos = [_seq_info(alt, flags, unicode) for alt in av[1]]
+        return _Info(
+            tuple(p for info in infos for p in info.first),
+            any(info.nullable for info in infos),
+            tuple(p for info in infos for p in info.chars),
+        )
+    if op in (_parser.MAX_REPEAT, _parser.MIN_REPEAT, _parser.POSSESSIVE_REPEAT):
+        low, _, body = av
+        info = _seq_info(body, flags, unicode)
+        return _Info(info.first, info.nullable or low == 0, info.chars)
+    if op is _parser.ATOMIC_GROUP:
+        return _seq_info(av, flags, unicode)
+    if op in (_parser.AT, _parser.ASSERT, _parser.ASSERT_NOT):
+        return _Info((), True, ())
+    # Back-references and conditionals: assume they can be anything.
+    return _Info(_ANYTHING, True, _ANYTHING)
+
+
+def _walk(
+    items: Sequence[tuple[Any, Any]],
+    flags: int,
+    unicode: bool,
+    follow: tuple[Pred, ...],
+    in_repeat: bool,
+) -> str | None:
+    """Look for risky structure in *items*, followed by characters *follow*."""
+    infos = [_node_info(op, av, flags, unicode) for op, av in items]
+    for k, (op, av) in enumerate(items):
+        later = infos[k + 1 :]
+        after = tuple(p for info in _nullable_prefix(later) for p in info.first)
+        if all(info.nullable for info in later):
+            after += follow
+        if op in (_parser.MAX_REPEAT, _parser.MIN_REPEAT):
+            _, high, body = av
+            unbounded = high == _parser.MAXREPEAT
+            if unbounded and in_repeat and _overlap(infos[k].chars, after):
+                return "quantifier nested in a repetition can end on what starts the next round"
+            if unbounded:
+                # Text both runs can match, between them: what can start the second run.
+                between: list[_Info] = []
+                for info, (next_op, next_av) in zip(later, items[k + 1 :]):
+                    if (
+                        next_op in (_parser.MAX_REPEAT, _parser.MIN_REPEAT)
+                        and next_av[1] == _parser.MAXREPEAT
+                        and _overlap(infos[k].chars, info.first)
+                    ):
+                        if not between:
+                            return "adjacent quantifiers over overlapping characters"
+                        if all(_overlap(sep.chars, info.chars) for sep in between):
+                            return "quantified runs overlap around a separator both can match"
+                    if not info.nullable:
+                        if not _overlap(infos[k].chars, info.chars):
+                            break
+                        between.append(info)
+            if high > 1:
+                body_info = _seq_info(body, flags, unicode)
+                body_follow = body_info.first + (after if in_repeat else ())
+                risk = _walk(body, flags, unicode, body_follow, True)
+                if risk is None and unbounded:
+                    risk = _overlapping_alternatives(body, flags, unicode)
+            else:
+                risk = _walk(body, flags, unicode, after, in_repeat)
+        elif op is _parser.SUBPATTERN:
+            _, add, remove, body = av
+            risk = _walk(body, (flags | add) & ~remove, unicode, after, in_repeat)
+        elif op is _parser.BRANCH:
+            risk = None
+            for alt in av[1]:
+                risk = risk or _walk(alt, flags, unicode, after, in_repeat)
+        elif op in (_parser.ASSERT, _parser.ASSERT_NOT):
+            risk = _walk(av[1], flags, unicode, (), False)
+        else:
+            risk = None
+        if risk is not None:
+            return risk
+    return None
+
+
+def _nullable_prefix(infos: Sequence[_Info]) -> Iterator[_Info]:
+    for info in infos:
+        yield info
+        if not info.nullable:
+            return
+
+
+def _overlapping_alternatives(
+    body: Sequence[tuple[Any, Any]], flags: int, unicode: bool
+) -> str | None:
+    for op, av in body:
+        if op is _parser.SUBPATTERN:
+            _, add, remove, inner = av
+            risk = _overlapping_alternatives(inner, (flags | add) & ~remove, unicode)
+            if risk is not None:
+                return risk
+        elif op is _parser.BRANCH:
+            firsts = [_seq_info(alt, flags, unicode).first for alt in av[1]]
+            for i, left in enumerate(firsts):
+                if any(_overlap(left, right) for right in firsts[i + 1 :]):
+                    return "repeated alternatives can start with the same character"
+    return None
+
+
+def _shape(node: Any) -> Any:
+    """Parse tree *node* as nested tuples, without group numbers."""
+    if isinstance(node, _parser.SubPattern):
+        node = node.data
+    if isinstance(node, (list, tuple)):
+        if len(node) == 2 and node[0] is _parser.SUBPATTERN:
+            return (node[0], _shape(node[1][1:]))
+        return tuple(_shape(child) for child in node)
+    return node
+
+
+def _flatten(items: Sequence[tuple[Any, Any]], flags: int) -> Iterator[tuple[Any, Any, int]]:
+    """Top-level *items* with their flags, groups that are not repeated spliced in."""
+    for op, av in items:
+        if op is _parser.SUBPATTERN:
+            _, add, remove, body = av
+            yield from _flatten(body, (flags | add) & ~remove)
+        else:
+            yield op, av, flags
+
+
+def _restarted_run(items: Sequence[tuple[Any, Any]], flags: int, unicode: bool) -> str | None:
+    """Look for a run that a failing search tries again from each of its positions.
+
+    ``search`` tries every start position.  When an unbounded quantifier
+    can begin anywhere inside its own run (everything before it can
+    match there too) and a required suffix after it fails, each start
+    rescans the rest of the run: quadratic time.  A tempered run that
+    stops where the next match could start, ``curl(?:(?!curl)[^\n])*x``,
+    is exempt.
+    """
+    flat = list(_flatten(items, flags))
+    infos = [_node_info(op, av, f, unicode) for op, av, f in flat]
+    for k, (op, av, f) in enumerate(flat):
+        if op not in (_parser.MAX_REPEAT, _parser.MIN_REPEAT) or av[1] != _parser.MAXREPEAT:
+            continue
+        if all(info.nullable for info in infos[k + 1 :]):
+            continue
+        before = flat[:k]
+        if any(
+            b_op is _parser.AT
+            and (
+                b_av is _parser.AT_BEGINNING_STRING
+                or (b_av is _parser.AT_BEGINNING and not b_f & re.MULTILINE)
+            )
+            for b_op, b_av, b_f in before
+        ):
+            continue
+        if not all(info.nullable or _overlap(info.chars, infos[k].chars) for info in infos[:k]):
+            continue
+        body = list(av[2])
+        if (
+            before
+            and body
+            and body[0][0] is _parser.ASSERT_NOT
+            and body[0][1][0] == 1
+            and _shape(body[0][1][1]) == _shape([(b_op, b_av) for b_op, b_av, _ in before])
+        ):
+            continue
+        return "unbounded quantifier before a required suffix is retried from every start"
+    return None
+
+
+def redos_risk(pattern: str | bytes, flags: int = 0) -> str | None:
+    """Why *pattern* risks catastrophic backtracking on ``re``, or ``None``.
+
+    The check is structural and errs on the side of flagging: a flagged
+    pattern is not necessarily slow, but an unflagged one has no nested
+    quantifiers, no quantified runs that can split the same text
+    several ways, and no unbounded run that a failing search rescans
+    from each of its positions.
+
+    Parameters
+    ----------
+    pattern:
+        Regular expression source.
+    flags:
+        ``re`` flags it is compiled with.
+
+    Returns
+    -------
+    str | None
+        The risky construct, e.g. ``"adjacent quantifiers over
+        overlapping characters"``; ``None`` if none was found.
+    """
+    parsed = _parser.parse(pattern, flags)
+    flags |= parsed.state.flags
+    unicode = _unicode(pattern, flags)
+    return _walk(list(parsed), flags, unicode, (), False) or _restarted_run(
+        list(parsed), flags, unicode
+    )
+
+
+# --- Linear-time matcher ---
+
+_CHAR, _SPLIT, _JMP, _ASSERT, _MATCH = range(5)
+
+# Memoized steps kept per LinearPattern before the memo is reset, which
+# bounds its memory when the thread sets keep changing.
+_MAX_CACHED_STEPS = 50_000
+
+_Step = tuple[int, tuple[int, ...], int, bool]
+
+Assertion = Callable[[Any, int, int, "_Meter"], bool]
+Instruction = tuple[Any, ...]
+
+
+class _Meter:
+    __slots__ = ("budget", "left")
+
+    def __init__(self, budget: int) -> None:
+        self.budget = budget
+        self.left = budget
+
+
+class _Program:
+    """An NFA program compiled from a parsed pattern."""
+
+    def __init__(self, items: Sequence[tuple[Any, Any]], flags: int, unicode: bool) -> None:
+        self.unicode = unicode
+        self.code: list[Instruction] = []
+        self._emit_seq(items, flags)
+        self.code.append((_MATCH,))
+        self._closures = [self._closure(pc) for pc in range(len(self.code))]
+        # Without assertions a step depends only on the threads' states and
+        # the character, so steps can be memoized (a lazily built DFA).
+        self._steps: dict[tuple[int, int, bool], _Step] | None = None
+        if all(leaves is not None for leaves in self._closures):
+            self._reset_steps()
+
+    def _reset_steps(self) -> None:
+        self._steps = {}
+        self._states: list[tuple[int, ...]] = []
+        self._state_ids: dict[tuple[int, ...], int] = {}
+
+    # Emission
+
+    def _emit(self, *instruction: Any) -> int:
+        if len(self.code) >= MAX_PROGRAM_SIZE:
+            raise UnsupportedPatternError(
+                f"pattern compiles to more than {MAX_PROGRAM_SIZE} states"
+            )
+        self.code.append(instruction)
+        return len(self.code) - 1
+
+    def _patch(self, index: int, *instruction: Any) -> None:
+        self.code[index] = instruction
+
+    def _emit_seq(self, items: Sequence[tuple[Any, Any]], flags: int) -> None:
+        for op, av in items:
+            self._emit_node(op, av, flags)
+
+    def _emit_node(self, op: Any, av: Any, flags: int) -> None:
+        pred = _char_pred(op, av, flags, self.unicode)
+        if pred is not None:
+            self._emit(_CHAR, pred, bytes(map(pred, range(128))))
+        elif op is _parser.SUBPATTERN:
+            _, add, remove, body = av
+            self._emit_seq(body, (flags | add) & ~remove)
+        elif op is _parser.BRANCH:
+            jumps: list[int] = []
+            alternatives = av[1]
+            for alt in alternatives[:-1]:
+                split = self._emit(_SPLIT, None, None)
+                self._emit_seq(alt, flags)
+                jumps.append(self._emit(_JMP, None))
+                self._patch(split, _SPLIT, split + 1, len(self.code))
+            self._emit_seq(alternatives[-1], flags)
+            for jump in jumps:
+                self._patch(jump, _JMP, len(self.code))
+        elif op in (_parser.MAX_REPEAT, _parser.MIN_REPEAT):
+            self._emit_repeat(av, flags, greedy=op is _parser.MAX_REPEAT)
+        elif op is _parser.AT:
+            self._emit(_ASSERT, self._position(av, flags))
+        elif op in (_parser.ASSERT, _parser.ASSERT_NOT):
+            self._emit(_ASSERT, self._lookaround(av, flags, negate=op is _parser.ASSERT_NOT))
+        else:
+            raise UnsupportedPatternError(f"{op} is not supported")
+
+    def _split(self, index: int, body: int, out: int, greedy: bool) -> None:
+        self._patch(index, _SPLIT, *((body, out) if greedy else (out, body)))
+
+    def _emit_repeat(self, av: Any, flags: int, greedy: bool) -> None:
+        low, high, body = av
+        for _ in range(low):
+            self._emit_seq(body, flags)
+        if high == _parser.MAXREPEAT:
+            loop = self._emit(_SPLIT, None, None)
+            self._emit_seq(body, flags)
+            self._emit(_JMP, loop)
+            self._split(loop, loop + 1, len(self.code), greedy)
+            return
+        splits: list[int] = []
+        for _ in range(high - low):
+            splits.append(self._emit(_SPLIT, None, None))
+            self._emit_seq(body, flags)
+        for split in splits:
+            self._split(split, split + 1, len(self.code), greedy)
+
+    def _position(self, at: Any, flags: int) -> Assertion:
+        unicode = self.unicode
+        multiline = bool(flags & re.MULTILINE)
+        if at is _parser.AT_BEGINNING_STRING or (at is _parser.AT_BEGINNING and not multiline):
+            return lambda text, i, end, meter: i == 0
+        if at is _parser.AT_BEGINNING:
+            return lambda text, i, end, meter: i == 0 or _code(text, i - 1) == 10
+        if at is _parser.AT_END_STRING:
+            return lambda text, i, end, meter: i == end
+        if at is _parser.AT_END and not multiline:
+            return lambda text, i, end, meter: i == end or (i == end - 1 and _code(text, i) == 10)
+        if at is _parser.AT_END:
+            return lambda text, i, end, meter: i == end or _code(text, i) == 10
+        if at in (_parser.AT_BOUNDARY, _parser.AT_NON_BOUNDARY):
+            boundary = at is _parser.AT_BOUNDARY
+
+            def at_boundary(text: Any, i: int, end: int, meter: _Meter) -> bool:
+                if end == 0:
+                    return False
+                before = i > 0 and _is_word(_code(text, i - 1), unicode)
+                after = i < end and _is_word(_code(text, i), unicode)
+                return (before != after) == boundary
+
+            return at_boundary
+        raise UnsupportedPatternError(f"{at} is not supported")
+
+    def _lookaround(self, av: Any, flags: int, negate: bool) -> Assertion:
+        direction, body = av
+        sub = _Program(body, flags, self.unicode)
+        if direction > 0:
+            return lambda text, i, end, meter: (
+                (sub.run(text, i, end, meter, anchored=True) is not None) != negate
+            )
+        low, high = body.getwidth()
+        if low != high:
+            raise UnsupportedPatternError("variable-width lookbehind is not supported")
+        return lambda text, i, end, meter: (
+            (i >= low and sub.run(text, i - low, i, meter, anchored=True, full=True) is not None)
+            != negate
+        )
+
+    # Execution
+
+    def _closure(self, pc: int) -> tuple[int, ...] | None:
+        """Threads reached from *pc* without reading, or ``None`` if an assertion decides."""
+        code = self.code
+        leaves: list[int] = []
+        seen: set[int] = set()
+        stack = [pc]
+        while stack:
+            pc = stack.pop()
+            if pc in seen:
+                continue
+            seen.add(pc)
+            instruction = code[pc]
+            kind = instruction[0]
+            if kind == _JMP:
+                stack.append(instruction[1])
+            elif kind == _SPLIT:
+                stack.append(instruction[2])
+                stack.append(instruction[1])
+            elif kind == _ASSERT:
+                return None
+            else:
+                leaves.append(pc)
+        return tuple(leaves)
+
+    def _add(
+        self,
+        threads: list[tuple[int, int]],
+        seen: set[int],
+        pc: int,
+        start: int,
+        text: Any,
+        i: int,
+        end: int,
+        meter: _Meter,
+    ) -> None:
+        """Add the thread at *pc* and its epsilon closure, in priority order."""
+        leaves = self._closures[pc]
+        if leaves is not None:
+            for leaf in leaves:
+                if leaf not in seen:
+                    seen.add(leaf)
+                    threads.append((leaf, start))
+            return
+        code = self.code
+        stack = [pc]
+        while stack:
+            pc = stack.pop()
+            if pc in seen:
+                continue
+            seen.add(pc)
+            instruction = code[pc]
+            kind = instruction[0]
+            if kind == _JMP:
+                stack.append(instruction[1])
+            elif kind == _SPLIT:
+                stack.append(instruction[2])
+                stack.append(instruction[1])
+            elif kind == _ASSERT:
+                if instruction[1](text, i, end, meter):
+                    stack.append(pc + 1)
+            else:
+                threads.append((pc, start))
+
+    def run(
+        self,
+        text: Any,
+        pos: int,
+        end: int,
+        meter: _Meter,
+        *,
+        anchored: bool = False,
+        full: bool = False,
+        skip: re.Pattern[Any] | None = None,
+    ) -> tuple[int, int] | None:
+        """Leftmost-first match in ``text[pos:end]``, as ``re`` would find it.
+
+        *meter* is charged one step per live thread per character.  An
+        unanchored run refills it whenever no thread is alive, so the
+        budget applies to each match attempt rather than to the search;
+        anchored runs (lookarounds) draw on the attempt that called them.
+        """
+        code = self.code
+        add = self._add
+        decode = isinstance(text, str)
+        threads: list[tuple[int, int]] = []
+        seen: set[int] = set()
+        matched: tuple[int, int] | None = None
+        i = pos
+        while True:
+            if matched is None and (not anchored or i == pos):
+                if not threads and not anchored:
+                    meter.left = meter.budget
+                    if skip is not None:
+                        candidate = skip.search(text, i, end)
+                        if candidate is None:
+                            break
+                        i = candidate.start()
+                        seen = set()
+                add(threads, seen, 0, i, text, i, end, meter)
+            if not threads:
+                if matched is not None or anchored or i >= end:
+                    break
+                i += 1
+                seen = set()
+                continue
+            meter.left -= len(threads)
+            if meter.left < 0:
+                raise PatternBudgetError(min(start for _, start in threads), i)
+            if i < end:
+                c = ord(text[i]) if decode else text[i]
+            else:
+                c = -1
+            following: list[tuple[int, int]] = []
+            seen = set()
+            for pc, start in threads:
+                instruction = code[pc]
+                if instruction[0] == _MATCH:
+                    if not full or i == end:
+                        # Lower-priority threads can no longer win.
+                        matched = (start, i)
+                        break
+                elif c >= 0 and (instruction[2][c] if c < 128 else instruction[1](c)):
+                    add(following, seen, pc + 1, start, text, i + 1, end, meter)
+            threads = following
+            if i >= end or (not threads and matched is not None):
+                break
+            i += 1
+        return matched
+
+    def _state(self, states: tuple[int, ...]) -> int:
+        ids = self._state_ids
+        state = ids.get(states)
+        if state is None:
+            state = ids[states] = len(self._states)
+            self._states.append(states)
+        return state
+
+    def _step(self, state: int, c: int, seed: bool) -> _Step:
+        """Advance the threads of *state* over character *c* (``-1`` at the end).
+
+        Returns the state after the step; the index in *state* of each of
+        its threads' parent, or ``-1`` for a thread seeded at the next
+        position when *seed* is true and nothing matched; the index of
+        the thread that matched, or ``-1``; and whether any thread other
+        than the seeded ones is alive.
+        """
+        code = self.code
+        closures = self._closures
+        following: list[int] = []
+        parents: list[int] = []
+        seen: set[int] = set()
+        matched = -1
+        for index, pc in enumerate(self._states[state]):
+            instruction = code[pc]
+            if instruction[0] == _MATCH:
+                matched = index
+                break
+            if c >= 0 and (instruction[2][c] if c < 128 else instruction[1](c)):
+                for leaf in closures[pc + 1] or ():
+                    if leaf not in seen:
+                        seen.add(leaf)
+                        following.append(leaf)
+                        parents.append(index)
+        alive = bool(following)
+        if seed and matched < 0:
+            for leaf in closures[0] or ():
+                if leaf not in seen:
+                    seen.add(leaf)
+                    following.append(leaf)
+                    parents.append(-1)
+        return self._state(tuple(following)), tuple(parents), matched, alive
+
+    def search_cached(
+        self, text: Any, pos: int, end: int, meter: _Meter, skip: re.Pattern[Any] | None
+    ) -> tuple[int, int] | None:
+        """:meth:`run` for programs without assertions, with memoized steps."""
+        steps = self._steps
+        assert steps is not None
+        decode = isinstance(text, str)
+        first = tuple(self._closures[0] or ())
+        seeds = self._state(first)
+        matched: tuple[int, int] | None = None
+        i = pos
+        if skip is not None:
+            candidate = skip.search(text, i, end)
+            if candidate is None:
+                return None
+            i = candidate.start()
+        state = seeds
+        starts = [i] * len(self._states[state])
+        while starts:
+            meter.left -= len(starts)
+            if meter.left < 0:
+                raise PatternBudgetError(min(starts), i)
+            if i < end:
+                c = ord(text[i]) if decode else text[i]
+            else:
+                c = -1
+            key = (state, c, matched is None)
+            step = steps.get(key)
+            if step is None:
+                if len(steps) >= _MAX_CACHED_STEPS:
+                    current = self._states[state]
+                    self._reset_steps()
+                    steps = self._steps
+                    assert steps is not None
+                    state, seeds = self._state(current), self._state(first)
+                    key = (state, c, matched is None)
+                step = steps[key] = self._step(state, c, matched is None and i < end)
+            state, parents, hit, alive = step
+            if hit >= 0:
+                matched = (starts[hit], i)
+            if i >= end:
+                break
+            i += 1
+            if not alive and matched is None:
+                # A new match attempt starts here.
+                meter.left = meter.budget
+                if skip is not None:
+                    candidate = skip.search(text, i, end)
+                    if candidate is None:
+                        break
+                    if candidate.start() > i:
+                        i = candidate.start()
+                        state = seeds
+                        starts = [i] * len(first)
+                        continue
+            starts = [starts[j] if j >= 0 else i for j in parents]
+        return matched
+
+
+def _code(text: Any, i: int) -> int:
+    c = text[i]
+    return ord(c) if isinstance(c, str) else int(c)
+
+
+def _skip_regex(
+    program: _Program, pattern: str | bytes, items: Sequence[tuple[Any, Any]], flags: int
+) -> re.Pattern[Any] | None:
+    """Regex for the next position a match can start at, if it is selective."""
+    prefix: list[int] = []
+    if not flags & re.IGNORECASE:
+        for op, av in items:
+            if op is not _parser.LITERAL:
+                break
+            prefix.append(av)
+    if len(prefix) > 1:
+        if isinstance(pattern, bytes):
+            return re.compile(re.escape(bytes(prefix)))
+        return re.compile(re.escape("".join(map(chr, prefix))))
+    first: list[Pred] = []
+    seen: set[int] = set()
+    stack = [0]
+    while stack:
+        pc = stack.pop()
+        if pc in seen:
+            continue
+        seen.add(pc)
+        instruction = program.code[pc]
+        kind = instruction[0]
+        if kind == _MATCH:
+            return None  # the empty string matches anywhere
+        if kind == _CHAR:
+            first.append(instruction[1])
+        elif kind == _JMP:
+            stack.append(instruction[1])
+        elif kind == _SPLIT:
+            stack.extend(instruction[1:])
+        else:
+            stack.append(pc + 1)  # assertions are checked by the program itself
+    if isinstance(pattern, bytes):
+        hits = [c for c in range(256) if any(p(c) for p in first)]
+        if len(hits) == 256:
+            return None
+        body = "".join(f"\\x{c:02x}" for c in hits) or "^\\x00-\\xff"
+        return re.compile(f"[{body}]".encode())
+    # Non-ASCII characters cannot all be enumerated, so they always qualify.
+    hits = [c for c in range(128) if any(p(c) for p in first)]
+    if len(hits) == 128:
+        return None
+    return re.compile("[" + "".join(f"\\x{c:02x}" for c in hits) + "\\x80-\\U0010ffff]")
+
+
+class LinearPattern(Generic[AnyStr]):
+    """A regular expression run as an NFA simulation, in linear time.
+
+    Threads of the NFA advance together one character at a time, so no
+    input position is visited twice by the same state and the work per
+    search is bounded by the input length times the program size.
+    Threads are kept in priority order, which yields the same
+    leftmost-first matches as ``re``.  Back-references, conditionals,
+    atomic groups, possessive quantifiers and variable-width lookbehinds
+    have no such simulation and raise :class:`UnsupportedPatternError`.
+
+    Parameters
+    ----------
+    pattern:
+        Regular expression source, ``str`` or ``bytes``.
+    flags:
+        ``re`` flags; ``re.LOCALE`` is not supported.
+    max_steps:
+        Thread steps one match attempt may take before the search raises
+        :class:`PatternBudgetError`.  An attempt lasts from a position
+        where no thread was alive until no thread is alive again, so
+        scanning a long text without matches does not use it up.
+    """
+
+    def __init__(
+        self, pattern: AnyStr, flags: int = 0, *, max_steps: int = DEFAULT_STEP_BUDGET
+    ) -> None:
+        if max_steps <= 0:
+            raise ValueError(f"max_steps must be positive, got {max_steps}")
+        if flags & re.LOCALE:
+            raise UnsupportedPatternError("re.LOCALE is not supported")
+        parsed = _parser.parse(pattern, flags)
+        flags |= parsed.state.flags
+        self.pattern: AnyStr = pattern
+        self.flags = flags
+        self.max_steps = max_steps
+        items = list(parsed)
+        self._program = _Program(items, flags, _unicode(pattern, flags))
+        self._skip = _skip_regex(self._program, pattern, items, flags)
+
+    def search(self, text: AnyStr, pos: int = 0, endpos: int | None = None) -> LinearMatch | None:
+        """First match in ``text[pos:endpos]``, like ``re.Pattern.search``."""
+        end = len(text) if endpos is None else min(endpos, len(text))
+        program = self._program
+        meter = _Meter(self.max_steps)
+        if program._steps is not None:
+            span = program.search_cached(text, pos, end, meter, self._skip)
+        else:
+            span = program.run(text, pos, end, meter, skip=self._skip)
+        return None if span is None else LinearMatch(span)
+
+    def match(self, text: AnyStr, pos: int = 0, endpos: int | None = None) -> LinearMatch | None:
+        """Match starting exactly at *pos*, like ``re.Pattern.match``."""
+        end = len(text) if endpos is None else min(endpos, len(text))
+        span = self._program.run(text, pos, end, _Meter(self.max_steps), anchored=True)
+        return None if span is None else LinearMatch(span)
+
+    def finditer(self, text: AnyStr, pos: int = 0) -> Iterator[LinearMatch]:
+        """Non-overlapping matches from *pos* on, like ``re.Pattern.finditer``."""
+        while pos <= len(text):
+            match = self.search(text, pos)
+            if match is None:
+                return
+            yield match
+            start, end = match.bounds
+            pos = end if end > start else end + 1
+
+
+# --- Guarded catalog patterns ---
+
+
+@dataclass(frozen=True)
+class PatternStats:
+    """Runtime counters of a flagged pattern."""
+
+    reason: str
+    searches: int
+    budget_hits: int
+
+    @property
+    def budget_hit_rate(self) -> float:
+        """Fraction of searches that ran out of budget."""
+        return self.budget_hits / self.searches if self.searches else 0.0
+
+
+class _Counters:
+    __slots__ = ("reason", "searches", "budget_hits")
+
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+        self.searches = 0
+        self.budget_hits = 0
+
+    def count(self, budget_hit: bool = False) -> None:
+        # Patterns are shared between threads; the lock keeps counts exact.
+        with _STATS_LOCK:
+            self.searches += 1
+            if budget_hit:
+                self.budget_hits += 1
+
+
+# Guards _STATS and every _Counters in it.
+_STATS: dict[str, _Counters] = {}
+_STATS_LOCK = threading.Lock()
+
+
+def _counters_for(pattern: str | bytes, reason: str) -> _Counters:
+    key = pattern if isinstance(pattern, str) else pattern.decode("latin-1")
+    with _STATS_LOCK:
+        return _STATS.setdefault(key, _Counters(reason))
+
+
+def _line_end(text: AnyStr, start: int, stop: int) -> int:
+    """End of the line holding *stop*: where a fail-closed match from *start* ends."""
+    newline = text.find("\n" if isinstance(text, str) else b"\n", max(start, stop))
+    return len(text) if newline == -1 else max(newline, start + 1)
+
+
+class GuardedPattern(Generic[AnyStr]):
+    """A catalog pattern, run on ``re`` unless :func:`redos_risk` flags it.
+
+    Flagged patterns run on a :class:`LinearPattern` instead, and their
+    searches are counted in :func:`pattern_safety_stats`.  A flagged
+    search that runs out of steps fails closed and is reported as a
+    match from where its unfinished attempt started to the end of the
+    line the attempt had reached; :meth:`finditer` goes on after it.
+
+    Parameters
+    ----------
+    pattern:
+        Regular expression source, ``str`` or ``bytes``.
+    flags:
+        ``re`` flags.
+    name:
+        ``lastgroup`` reported by matches of a flagged pattern.
+    max_steps:
+        Step budget of each match attempt of a flagged pattern.
+
+    Raises
+    ------
+    ValueError
+        If the pattern is flagged and uses a construct the linear-time
+        matcher cannot run.
+    """
+
+    def __init__(
+        self,
+        pattern: AnyStr,
+        flags: int = 0,
+        *,
+        name: str | None = None,
+        max_steps: int = DEFAULT_STEP_BUDGET,
+    ) -> None:
+        self.pattern: AnyStr = pattern
+        self.name = name
+        self.risk = redos_risk(pattern, flags)
+        self._regex: re.Pattern[AnyStr] | None = None
+        self._linear: LinearPattern[AnyStr] | None = None
+        if self.risk is None:
+            self._regex = re.compile(pattern, flags)
+            return
+        try:
+            self._linear = LinearPattern(pattern, flags, max_steps=max_steps)
+        except UnsupportedPatternError as exc:
+            raise UnsupportedPatternError(
+                f"pattern {pattern!r} risks catastrophic backtracking ({self.risk}) "
+                f"and cannot run in linear time: {exc}"
+            ) from None
+        self._counters = _counters_for(pattern, self.risk)
+
+    @property
+    def flagged(self) -> bool:
+        """Whether the pattern runs on the linear-time matcher."""
+        return self._linear is not None
+
+    def search(self, text: AnyStr, pos: int = 0) -> SpanMatch | None:
+        """First match in *text* from *pos* on."""
+        if self._linear is None:
+            assert self._regex is not None
+            return self._regex.search(text, pos)
+        for match in self.finditer(text, pos):
+            return match
+        return None
+
+    def match(self, text: AnyStr, pos: int = 0) -> SpanMatch | None:
+        """Match starting exactly at *pos*; fails closed like :meth:`finditer`."""
+        if self._linear is None:
+            assert self._regex is not None
+            return self._regex.match(text, pos)
+        try:
+            match = self._linear.match(text, pos)
+        except PatternBudgetError as exc:
+            self._counters.count(budget_hit=True)
+            return LinearMatch((pos, _line_end(text, pos, exc.stop)), self.name)
+        self._counters.count()
+        return None if match is None else LinearMatch(match.bounds, self.name)
+
+    def finditer(self, text: AnyStr, pos: int = 0) -> Iterator[SpanMatch]:
+        """Non-overlapping matches in *text* from *pos* on."""
+        if self._linear is None:
+            assert self._regex is not None
+            yield from self._regex.finditer(text, pos)
+            return
+        counters = self._counters
+        while pos <= len(text):
+            try:
+                match = self._linear.search(text, pos)
+            except PatternBudgetError as exc:
+                counters.count(budget_hit=True)
+                pos = _line_end(text, exc.start, exc.stop)
+                yield LinearMatch((exc.start, pos), self.name)
+                if pos == len(text):
+                    return
+                continue
+            counters.count()
+            if match is None:
+                return
+            yield LinearMatch(match.bounds, self.name)
+            start, end = match.bounds
+            pos = end if end > start else end + 1
+
+
+def pattern_safety_stats() -> dict[str, PatternStats]:
+    """Counters of every flagged pattern loaded so far, keyed by pattern."""
+    with _STATS_LOCK:
+        return {p: PatternStats(c.reason, c.searches, c.budget_hits) for p, c in _STATS.items()}
+
+
+def reset_pattern_safety_stats() -> None:
+    """Zero the search and budget-hit counters of every flagged pattern."""
+    with _STATS_LOCK:
+        for counters in _STATS.values():
+            counters.searches = counters.budget_hits = 0
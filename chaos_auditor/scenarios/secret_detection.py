@@ -7,8 +7,23 @@ major providers: OpenAI, AWS, GitHub, GitLab, Slack, and generic JWTs.
 
 from __future__ import annotations
 
+import hashlib
+import mmap
+import os
 import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+from typing import TYPE_CHECKING, AnyStr, Generic, cast
+
+from chaos_auditor.scenarios.classification_cache import ClassificationCache
+from chaos_auditor.scenarios.pattern_safety import GuardedPattern, LinearMatch, SpanMatch
+
+if TYPE_CHECKING:
+    from chaos_auditor.scenarios.entropy_detection import EntropyDetector
 
 
 @dataclass(frozen=True)
@@ -77,27 +92,834 @@ SECRET_PATTERNS: list[SecretScenario] = [
         expected_redacted=True,
         description="Environment variable export with secret",
         provider="generic",
-        pattern=r"export\s+\w*(KEY|SECRET|TOKEN|PASSWORD)\w*=\S+",
+        # The lookahead finds the keyword; \w*KEY\w*= would split the name
+        # around it every possible way before failing.
+        pattern=r"export\s+(?=\w*(?:KEY|SECRET|TOKEN|PASSWORD))\w+=\S+",
     ),
 ]
 
 # Pre-compiled regex patterns for runtime use
-COMPILED_PATTERNS: list[re.Pattern[str]] = [
-    re.compile(s.pattern) for s in SECRET_PATTERNS
-]
+COMPILED_PATTERNS: list[re.Pattern[str]] = [re.compile(s.pattern) for s in SECRET_PATTERNS]
+
+REDACTION_MARKER = "[REDACTED]"
+_BYTES_REDACTION_MARKER = REDACTION_MARKER.encode()
+
+# Directories skipped by scan_directory unless told otherwise: repository
+# object stores, whose contents are compressed copies of the work tree.
+# Repository metadata such as .git/config or .hg/hgrc, which can hold
+# credentials, is still scanned.
+DEFAULT_SKIP_DIRS = frozenset({".git/objects", ".hg/store", ".svn/pristine"})
+
+# Characters (or bytes) held back between chunks when streaming.  Secrets
+# up to this length are caught even when they straddle a chunk boundary.
+DEFAULT_STREAM_WINDOW = 4096
+
+_METACHARS = frozenset(".^$*+?{}[]|()\\")
+_QUANTIFIERS = frozenset("*+?{")
+
+# Prefilter tuning: above roughly one anchor hit per this many characters
+# a full regex scan beats matching at each hit offset from Python.  With
+# more anchors than _MAX_FIND_ANCHORS, one pass of the prefix-trie regex
+# is cheaper than a substring search per anchor.
+_CHARS_PER_ANCHOR_HIT = 1024
+_MIN_ANCHOR_HITS = 16
+_MAX_FIND_ANCHORS = 16
+
+
+@dataclass(frozen=True)
+class SecretMatch:
+    """A secret located in a scanned buffer."""
+
+    start: int
+    end: int
+    provider: str
+    description: str
+
+
+@dataclass(frozen=True)
+class SecretFinding:
+    """A secret found in a file on disk.
+
+    Only the location is recorded, never the secret itself.
+    """
+
+    path: Path
+    offset: int  # byte offset of the match within the file
+    length: int
+    provider: str
+    description: str
+
+
+def _marker_for(text: AnyStr) -> AnyStr:
+    if isinstance(text, str):
+        return REDACTION_MARKER
+    return _BYTES_REDACTION_MARKER
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """Return ``True`` if *pattern* contains a ``|`` outside any group or class."""
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+            if pattern[i + 1 : i + 2] == "^":
+                i += 1
+            if pattern[i + 1 : i + 2] == "]":
+                i += 1
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def _split_literal_prefix(pattern: str) -> tuple[str, str]:
+    """Split *pattern* into its fixed literal prefix and the remaining regex.
+
+    Returns ``("", pattern)`` when the pattern does not start with a
+    literal or cannot be split safely (e.g. top-level alternation).
+    """
+    if _has_top_level_alternation(pattern):
+        return "", pattern
+    literal: list[str] = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        width = 1
+        if ch == "\\":
+            ch = pattern[i + 1 : i + 2]
+            if not ch or ch.isalnum():  # \s, \d, \b, back-references, ...
+                break
+            width = 2
+        elif ch in _METACHARS:
+            break
+        if pattern[i + width : i + width + 1] in _QUANTIFIERS:
+            break
+        literal.append(ch)
+        i += width
+    return "".join(literal), pattern[i:]
+
+
+def _factor_alternation(entries: Sequence[tuple[str, str, int]]) -> str:
+    """Fold ``(literal, rest, index)`` entries into a prefix-trie alternation.
+
+    Entries sharing a leading character are merged under one branch.
+    Branches that start with different literals can never match at the
+    same position, so only entries without a remaining literal act as
+    ordering barriers; this keeps first-match order identical to the
+    flat alternation.
+    """
+    parts: list[str] = []
+    pending: dict[str, list[tuple[str, str, int]]] = {}
+
+    def flush() -> None:
+        for head, group in pending.items():
+            if len(group) == 1:
+                literal, rest, index = group[0]
+                parts.append(re.escape(head + literal) + f"(?P<_s{index}>{rest})")
+            else:
+                shared = os.path.commonprefix([literal for literal, _, _ in group])
+                tail = [(literal[len(shared) :], rest, index) for literal, rest, index in group]
+                parts.append(re.escape(head + shared) + f"(?:{_factor_alternation(tail)})")
+        pending.clear()
+
+    for literal, rest, index in entries:
+        if literal:
+            pending.setdefault(literal[0], []).append((literal[1:], rest, index))
+        else:
+            flush()
+            parts.append(f"(?P<_s{index}>{rest})")
+    flush()
+    return "|".join(parts)
+
+
+def _minimal_anchors(literals: Sequence[str]) -> tuple[str, ...] | None:
+    """Reduce literal prefixes to the smallest set of anchors covering them.
+
+    An anchor that starts with a shorter anchor is redundant (every
+    ``sk-proj-`` hit is also an ``sk-`` hit).  Returns ``None`` if any
+    pattern lacks a literal prefix, in which case no text can be skipped.
+    """
+    if not all(literals):
+        return None
+    anchors: list[str] = []
+    for literal in sorted(set(literals), key=len):
+        if not any(literal.startswith(anchor) for anchor in anchors):
+            anchors.append(literal)
+    return tuple(anchors)
+
+
+class SecretEngine:
+    """Single-pass matcher over a set of secret patterns.
+
+    All patterns are folded into one alternation, so a buffer is scanned
+    once no matter how many providers are configured.  Literal prefixes
+    (``AKIA``, ``ghp_``, ``sk-`` ...) are factored into a trie, which
+    lets the regex engine skip straight to candidate characters instead
+    of trying every provider at every position.  Alternatives are tried
+    in catalog order and scanning resumes after each match.
+
+    Catalog order also settles overlapping secrets.  Each match is
+    checked for an earlier catalog entry matching inside it
+    (``xoxb-ghp_...``, where the Slack pattern would swallow the head of
+    a GitHub token); from the first such match on, the text is redacted
+    by substituting each pattern in turn, so the earlier entry wins just
+    as it does in a plain substitution loop.
+
+    The same prefixes double as a prefilter: a plain substring search
+    for each anchor decides whether the regex needs to run at all, and
+    when hits are sparse the regex is only tried at the hit offsets.
+    Large catalogs skip the substring stage, since the trie regex finds
+    candidates faster than one ``str.find`` per anchor.
+
+    Patterns that :func:`~chaos_auditor.scenarios.pattern_safety.redos_risk`
+    flags are left out of the alternation and run on their own
+    linear-time :class:`~chaos_auditor.scenarios.pattern_safety.GuardedPattern`;
+    their matches are merged in, and a match that starts earlier (or at
+    the same offset for an earlier catalog entry) is settled first.  A
+    pattern whose next match overlaps a settled one searches again from
+    its end.
+
+    Parameters
+    ----------
+    scenarios:
+        Secret scenarios whose ``pattern`` fields make up the engine.
+    """
+
+    def __init__(self, scenarios: Sequence[SecretScenario]) -> None:
+        self.scenarios = tuple(scenarios)
+        entries = [(*_split_literal_prefix(s.pattern), i) for i, s in enumerate(self.scenarios)]
+        # Each pattern on its own, str and bytes, to settle overlaps.
+        self._patterns = tuple(
+            (
+                GuardedPattern(s.pattern, name=f"_s{i}"),
+                GuardedPattern(s.pattern.encode(), name=f"_s{i}"),
+            )
+            for i, s in enumerate(self.scenarios)
+        )
+        self._literals = tuple((literal, literal.encode()) for literal, _, _ in entries)
+        # Per rank: the entries ranked before it without a literal prefix,
+        # and one regex finding any literal prefix ranked before it.
+        self._bare = tuple(
+            tuple(i for i in range(rank) if not entries[i][0]) for rank in range(len(entries))
+        )
+        self._heads: list[tuple[re.Pattern[str], re.Pattern[bytes], int] | None] = []
+        for rank in range(len(entries)):
+            literals = sorted({entries[i][0] for i in range(rank) if entries[i][0]})
+            if not literals:
+                self._heads.append(None)
+                continue
+            heads = "|".join(re.escape(literal) for literal in literals)
+            self._heads.append(
+                (
+                    re.compile(heads),
+                    re.compile(heads.encode()),
+                    max(map(len, literals)),
+                )
+            )
+        risky = {i for i, pair in enumerate(self._patterns) if pair[0].flagged}
+        self._guarded = tuple(self._patterns[i] for i in sorted(risky))
+        self._regex = re.compile(
+            _factor_alternation([entry for entry in entries if entry[2] not in risky]) or "(?!)"
+        )
+        self._by_group: dict[str | None, SecretScenario] = {
+            f"_s{i}": s for i, s in enumerate(self.scenarios)
+        }
+        self._rank = {f"_s{i}": i for i in range(len(self.scenarios))}
+        self.anchors = _minimal_anchors([literal for literal, _, _ in entries])
+        self._find_anchors = (
+            self.anchors
+            if self.anchors is not None and len(self.anchors) <= _MAX_FIND_ANCHORS
+            else None
+        )
+        self._bytes_regex = re.compile(self._regex.pattern.encode())
+        self._find_bytes_anchors = (
+            None
+            if self._find_anchors is None
+            else tuple(anchor.encode() for anchor in self._find_anchors)
+        )
+
+    def _regex_for(self, text: AnyStr) -> re.Pattern[AnyStr]:
+        if isinstance(text, str):
+            return self._regex
+        return self._bytes_regex
+
+    def _anchors_for(self, text: AnyStr) -> tuple[AnyStr, ...] | None:
+        if isinstance(text, str):
+            return self._find_anchors
+        return self._find_bytes_anchors
+
+    def may_contain_secret(self, text: AnyStr) -> bool:
+        """Return ``False`` only if *text* provably contains no secret."""
+        anchors = self._anchors_for(text)
+        if anchors is None:
+            return self._regex_for(text).search(text) is not None or any(
+                guarded.search(text) is not None for guarded in self._guarded_for(text)
+            )
+        return any(anchor in text for anchor in anchors)
+
+    def _anchor_hits(self, text: AnyStr) -> list[int] | None:
+        """Return sorted anchor offsets, or ``None`` if hits are too dense.
+
+        Dense hits (``task-`` contains ``sk-``) make per-offset matching
+        slower than letting the regex scan the whole buffer.
+        """
+        anchors = self._anchors_for(text)
+        if anchors is None:
+            return None
+        budget = max(_MIN_ANCHOR_HITS, len(text) // _CHARS_PER_ANCHOR_HIT)
+        hits: list[int] = []
+        for anchor in anchors:
+            offset = text.find(anchor)
+            while offset != -1:
+                hits.append(offset)
+                if len(hits) > budget:
+                    return None
+                offset = text.find(anchor, offset + 1)
+        hits.sort()
+        return hits
+
+    def _guarded_for(self, text: AnyStr) -> list[GuardedPattern[AnyStr]]:
+        index = 0 if isinstance(text, str) else 1
+        return [cast("GuardedPattern[AnyStr]", pair[index]) for pair in self._guarded]
+
+    def scan(self, text: AnyStr) -> Iterator[SpanMatch]:
+        """Yield the matches to redact in *text* (``str`` or ``bytes``), left to right.
+
+        Matches do not overlap; see the class description for how
+        overlapping secrets are settled.
+        """
+        return self._scan(text, self._anchor_hits(text))
+
+    def _scan(self, text: AnyStr, hits: list[int] | None) -> Iterator[SpanMatch]:
+        guarded = self._guarded_for(text)
+        ahead: dict[int, SpanMatch | None] = {}
+        if not guarded:
+            # Folded matches never overlap each other, so none goes stale.
+            for m in self._scan_folded(text, hits):
+                if self._earlier_within(text, m, ahead):
+                    yield from self._substitute_each(text, m.start())
+                    return
+                yield m
+            return
+
+        def search(source: int, pos: int) -> SpanMatch | None:
+            if source:
+                return guarded[source - 1].search(text, pos)
+            return self._search_folded(text, hits, pos)
+
+        # Next match of the folded regex and of each guarded pattern; a
+        # pending match that starts inside an accepted one is searched
+        # again from its end, since a secret may start inside the stale one.
+        pending = [search(source, 0) for source in range(len(guarded) + 1)]
+        resume = 0
+        while True:
+            for source, found in enumerate(pending):
+                if found is not None and found.start() < resume:
+                    pending[source] = search(source, resume)
+            candidates = [found for found in pending if found is not None]
+            if not candidates:
+                return
+            m = min(candidates, key=self._order)
+            if self._earlier_within(text, m, ahead):
+                yield from self._substitute_each(text, m.start())
+                return
+            yield m
+            resume = m.end() if m.end() > m.start() else m.end() + 1
+
+    def _order(self, m: SpanMatch) -> tuple[int, int]:
+        return m.start(), self._rank[cast(str, m.lastgroup)]
+
+    def _earlier_within(
+        self, text: AnyStr, m: SpanMatch, ahead: dict[int, SpanMatch | None]
+    ) -> bool:
+        """Whether an entry ranked before *m*'s own starts a match inside *m*.
+
+        *ahead* caches, per entry without a literal prefix, its next
+        match, since matches are checked left to right.
+        """
+        kind = 0 if isinstance(text, str) else 1
+        lo, hi = m.start() + 1, m.end()
+        rank = self._rank[cast(str, m.lastgroup)]
+        for i in self._bare[rank]:
+            pattern = cast("GuardedPattern[AnyStr]", self._patterns[i][kind])
+            found = ahead.get(i)
+            if i not in ahead or (found is not None and found.start() < lo):
+                found = ahead[i] = pattern.search(text, lo)
+            if found is not None and found.start() < hi:
+                return True
+        heads = self._heads[rank]
+        # One search rules out every literal prefix in the common case.
+        if (
+            heads is None
+            or cast("re.Pattern[AnyStr]", heads[kind]).search(text, lo, hi + heads[2] - 1) is None
+        ):
+            return False
+        for i in range(rank):
+            literal = cast(AnyStr, self._literals[i][kind])
+            if not literal:
+                continue
+            pattern = cast("GuardedPattern[AnyStr]", self._patterns[i][kind])
+            offset = text.find(literal, lo, hi + len(literal) - 1)
+            while offset != -1:
+                if pattern.match(text, offset) is not None:
+                    return True
+                offset = text.find(literal, offset + 1, hi + len(literal) - 1)
+        return False
+
+    def _substitute_each(self, text: AnyStr, pos: int) -> list[SpanMatch]:
+        """Spans from *pos* on that substituting each pattern in turn redacts.
+
+        A match covering part of an earlier redaction takes in all of it.
+        """
+        kind = 0 if isinstance(text, str) else 1
+        marker = _marker_for(text)
+        spans: list[SpanMatch] = []
+        for i, pair in enumerate(self._patterns):
+            pattern = cast("GuardedPattern[AnyStr]", pair[kind])
+            # Offsets in the substituted text where each span's marker starts.
+            pieces: list[AnyStr] = [text[:pos]]
+            starts: list[int] = []
+            shift = 0
+            last = pos
+            for span in spans:
+                pieces.append(text[last : span.start()])
+                starts.append(span.start() + shift)
+                pieces.append(marker)
+                shift += len(marker) - (span.end() - span.start())
+                last = span.end()
+            pieces.append(text[last:])
+            current = text[:0].join(pieces)
+
+            def original(offset: int, end: bool) -> int:
+                k = bisect_right(starts, offset - end) - 1
+                if k < 0:
+                    return offset
+                span, marked = spans[k], starts[k]
+                if offset - marked < len(marker) + end:
+                    return span.end() if end else span.start()
+                return span.end() + offset - marked - len(marker)
+
+            found: list[SpanMatch] = []
+            k = 0
+            for m in pattern.finditer(current, pos):
+                if m.end() == m.start():
+                    continue
+                start, end = original(m.start(), False), original(m.end(), True)
+                while k < len(spans) and spans[k].end() <= start:
+                    found.append(spans[k])
+                    k += 1
+                while k < len(spans) and spans[k].start() < end:
+                    k += 1
+                found.append(LinearMatch((start, end), f"_s{i}"))
+            spans = found + spans[k:]
+        return spans
+
+    def _scan_folded(self, text: AnyStr, hits: list[int] | None) -> Iterator[SpanMatch]:
+        regex = self._regex_for(text)
+        if hits is None:
+            yield from regex.finditer(text)
+            return
+        resume = 0
+        for offset in hits:
+            if offset < resume:
+                continue
+            m = regex.match(text, offset)
+            if m is not None:
+                resume = m.end()
+                yield m
+
+    def _search_folded(self, text: AnyStr, hits: list[int] | None, pos: int) -> SpanMatch | None:
+        regex = self._regex_for(text)
+        if hits is None:
+            return regex.search(text, pos)
+        for k in range(bisect_left(hits, pos), len(hits)):
+            m = regex.match(text, hits[k])
+            if m is not None:
+                return m
+        return None
+
+    def describe(self, m: SpanMatch, offset: int = 0) -> SecretMatch:
+        """Turn a match from :meth:`scan` into a :class:`SecretMatch`, shifted by *offset*."""
+        scenario = self._by_group[m.lastgroup]
+        return SecretMatch(
+            offset + m.start(), offset + m.end(), scenario.provider, scenario.description
+        )
+
+    def finditer(self, text: AnyStr) -> Iterator[SecretMatch]:
+        """Yield every secret in *text*, left to right, without overlaps."""
+        for m in self.scan(text):
+            yield self.describe(m)
 
+    def redact(self, text: AnyStr) -> AnyStr:
+        """Return *text* with every match replaced by :data:`REDACTION_MARKER`."""
+        marker = _marker_for(text)
+        pieces: list[AnyStr] = []
+        last = 0
+        for m in self.scan(text):
+            pieces.append(text[last : m.start()])
+            pieces.append(marker)
+            last = m.end()
+        if not pieces:
+            return text
+        pieces.append(text[last:])
+        return text[:0].join(pieces)
 
-def redact_secrets(text: str) -> str:
+
+_ENGINE = SecretEngine(SECRET_PATTERNS)
+
+# Entries kept by the redact_secrets(cache=True) cache.
+DEFAULT_REDACTION_CACHE_SIZE = 256
+
+# Texts with more redactions than this are redacted but not cached, which
+# bounds an entry to 64 KiB and the default cache to 16 MiB.
+MAX_CACHED_SPANS = 4096
+
+# Keyed by (sha256 of the text, engine, entropy detector); values are the
+# flattened start/end offsets replaced by the engine and then by the
+# entropy detector, never the text itself.  ``None`` marks texts with too
+# many spans to cache.
+REDACTION_CACHE: ClassificationCache[
+    tuple[bytes, SecretEngine, EntropyDetector | None], tuple[array[int], array[int]] | None
+] = ClassificationCache("redact_secrets", DEFAULT_REDACTION_CACHE_SIZE)
+
+
+def _default_engine() -> SecretEngine:
+    """The engine for ``SECRET_PATTERNS``, rebuilt after the list has changed."""
+    global _ENGINE
+    if _ENGINE.scenarios != tuple(SECRET_PATTERNS):
+        _ENGINE = SecretEngine(SECRET_PATTERNS)
+        REDACTION_CACHE.clear()
+    return _ENGINE
+
+
+def _splice(text: str, offsets: Sequence[int]) -> str:
+    """Replace the spans given as flattened ``start, end`` *offsets* by the marker."""
+    if not offsets:
+        return text
+    pieces: list[str] = []
+    last = 0
+    for start, end in zip(offsets[::2], offsets[1::2]):
+        pieces.append(text[last:start])
+        pieces.append(REDACTION_MARKER)
+        last = end
+    pieces.append(text[last:])
+    return "".join(pieces)
+
+
+def redact_secrets(
+    text: str, *, entropy: EntropyDetector | None = None, cache: bool = False
+) -> str:
     """Replace detected secrets in text with ``[REDACTED]``.
 
     Parameters
     ----------
     text:
         Input text that may contain secrets.
+    entropy:
+        Also redact tokens this detector finds random-looking, e.g.
+        :data:`~chaos_auditor.scenarios.entropy_detection.DEFAULT_ENTROPY_DETECTOR`,
+        to catch credentials of formats ``SECRET_PATTERNS`` does not know.
+    cache:
+        Look the text up in :data:`REDACTION_CACHE` by its SHA-256 digest
+        first, so that output seen before (``cat config.yaml``, ``env``)
+        is redacted without running any regex.  Only the offsets of the
+        redacted spans are stored, never the secrets.
 
     Returns
     -------
     str
         Text with all matched secrets replaced by ``[REDACTED]``.
     """
-    raise NotImplementedError
+    engine = _default_engine()
+    if not cache:
+        redacted = engine.redact(text)
+        return redacted if entropy is None else entropy.redact(redacted, REDACTION_MARKER)
+
+    computed: list[str] = []
+
+    def compute(_: object) -> tuple[array[int], array[int]] | None:
+        secrets = array("q", chain.from_iterable(m.span() for m in engine.scan(text)))
+        redacted = _splice(text, secrets)
+        found = array("q", chain.from_iterable(entropy.spans(redacted) if entropy else ()))
+        computed.append(_splice(redacted, found))
+        if len(secrets) + len(found) > 2 * MAX_CACHED_SPANS:
+            return None
+        return secrets, found
+
+    digest = hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest()
+    spans = REDACTION_CACHE.get_or_compute((digest, engine, entropy), compute)
+    if computed:
+        return computed[0]
+    if spans is None:
+        return redact_secrets(text, entropy=entropy)
+    secrets, found = spans
+    return _splice(_splice(text, secrets), found)
+
+
+class StreamingRedactor(Generic[AnyStr]):
+    """Incremental redactor for chunked ``str`` or ``bytes`` streams.
+
+    The last *window* characters of the stream are held back after each
+    chunk so that a secret straddling a chunk boundary is matched once
+    the rest of it arrives.  Memory stays bounded by ``window`` plus the
+    size of the chunk being processed.  For secrets no longer than
+    *window* the output is identical to :func:`redact_secrets` on the
+    concatenated input; a longer match that is still growing at the end
+    of the buffer is redacted up to that point.
+
+    Parameters
+    ----------
+    engine:
+        Engine to match with; defaults to the ``SECRET_PATTERNS`` engine.
+    window:
+        Size of the carry-over window.
+    on_match:
+        Called with each redacted match, in stream order, with offsets
+        into the concatenated input.
+    """
+
+    def __init__(
+        self,
+        engine: SecretEngine | None = None,
+        window: int = DEFAULT_STREAM_WINDOW,
+        on_match: Callable[[SecretMatch], None] | None = None,
+    ) -> None:
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+        self.engine = engine if engine is not None else _default_engine()
+        self.window = window
+        self.on_match = on_match
+        self._carry: AnyStr | None = None
+        self._offset = 0  # stream offset of the carry
+
+    def feed(self, chunk: AnyStr) -> AnyStr:
+        """Add *chunk* to the stream and return the output that is now final."""
+        buf = chunk if self._carry is None else self._carry + chunk
+        limit = len(buf) - self.window
+        if limit <= 0:
+            self._carry = buf
+            return buf[:0]
+        pieces: list[AnyStr] = []
+        last = 0
+        cut = limit
+        marker = _marker_for(buf)
+        for m in self.engine.scan(buf):
+            if m.start() >= limit:
+                break
+            if m.end() == len(buf) and m.end() - m.start() <= self.window:
+                # The match may continue in the next chunk: re-scan it then.
+                cut = m.start()
+                break
+            if self.on_match is not None:
+                self.on_match(self.engine.describe(m, self._offset))
+            pieces.append(buf[last : m.start()])
+            pieces.append(marker)
+            last = m.end()
+            cut = max(cut, last)
+        pieces.append(buf[last:cut])
+        self._carry = buf[cut:]
+        self._offset += cut
+        return buf[:0].join(pieces)
+
+    def flush(self) -> AnyStr | None:
+        """Redact and return the held-back tail; ``None`` if nothing was fed."""
+        carry, self._carry = self._carry, None
+        if carry is None:
+            return None
+        if self.on_match is not None:
+            for m in self.engine.scan(carry):
+                self.on_match(self.engine.describe(m, self._offset))
+        self._offset += len(carry)
+        return self.engine.redact(carry)
+
+
+def redact_stream(
+    chunks: Iterable[AnyStr],
+    *,
+    window: int = DEFAULT_STREAM_WINDOW,
+    engine: SecretEngine | None = None,
+) -> Iterator[AnyStr]:
+    """Redact secrets from a stream of ``str`` or ``bytes`` chunks.
+
+    Parameters
+    ----------
+    chunks:
+        Iterable of chunks, all of the same type.
+    window:
+        Carry-over window; see :class:`StreamingRedactor`.
+    engine:
+        Engine to match with; defaults to the ``SECRET_PATTERNS`` engine.
+
+    Yields
+    ------
+    str | bytes
+        Redacted output chunks of the same type as the input.  Empty
+        chunks are not yielded.
+    """
+    redactor: StreamingRedactor[AnyStr] = StreamingRedactor(engine, window)
+    kind: type | None = None
+    for chunk in chunks:
+        if kind is None:
+            kind = type(chunk)
+        elif not isinstance(chunk, kind):
+            raise TypeError("cannot mix str and bytes chunks in one stream")
+        out = redactor.feed(chunk)
+        if out:
+            yield out
+    tail = redactor.flush()
+    if tail:
+        yield tail
+
+
+def scan_file(path: Path, engine: SecretEngine | None = None) -> list[SecretFinding]:
+    """Scan one file for secrets without decoding or copying it.
+
+    The file is memory-mapped read-only and the byte-mode patterns run
+    directly over the mapping.
+
+    Parameters
+    ----------
+    path:
+        File to scan.
+    engine:
+        Engine to match with; defaults to the ``SECRET_PATTERNS`` engine.
+
+    Returns
+    -------
+    list[SecretFinding]
+        Findings in file order.  Empty files yield no findings.
+    """
+    engine = engine if engine is not None else _default_engine()
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            # mmap provides the find/slice/regex buffer API that scan() relies on.
+            return [
+                SecretFinding(path, m.start, m.end - m.start, m.provider, m.description)
+                for m in engine.finditer(cast(bytes, buf))
+            ]
+
+
+_WORKER_ENGINE: SecretEngine | None = None
+
+
+def _init_worker(scenarios: tuple[SecretScenario, ...]) -> None:
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = SecretEngine(scenarios)
+
+
+def _scan_file_quietly(path: Path, engine: SecretEngine | None = None) -> list[SecretFinding]:
+    try:
+        return scan_file(path, engine if engine is not None else _WORKER_ENGINE)
+    except (OSError, ValueError):
+        # Unreadable, vanished, or unmappable files are skipped.
+        return []
+
+
+def scan_files(
+    paths: Iterable[Path],
+    *,
+    workers: int | None = None,
+    engine: SecretEngine | None = None,
+) -> list[SecretFinding]:
+    """Scan many files for secrets, spreading them across a process pool.
+
+    Parameters
+    ----------
+    paths:
+        Files to scan.  Unreadable files are skipped.
+    workers:
+        Number of worker processes; defaults to the CPU count.  ``1``
+        scans in the calling process.
+    engine:
+        Engine to match with; defaults to the ``SECRET_PATTERNS`` engine.
+
+    Returns
+    -------
+    list[SecretFinding]
+        Findings sorted by path and offset.
+    """
+    engine = engine if engine is not None else _default_engine()
+    files = list(paths)
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    findings: list[SecretFinding] = []
+    if workers <= 1 or len(files) < 2:
+        for path in files:
+            findings.extend(_scan_file_quietly(path, engine))
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # ~10 ms; only needed here
+
+        chunksize = max(1, len(files) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(engine.scenarios,),
+        ) as pool:
+            for result in pool.map(_scan_file_quietly, files, chunksize=chunksize):
+                findings.extend(result)
+    findings.sort(key=lambda f: (str(f.path), f.offset))
+    return findings
+
+
+def scan_directory(
+    root: Path,
+    *,
+    workers: int | None = None,
+    skip_dirs: frozenset[str] = DEFAULT_SKIP_DIRS,
+    engine: SecretEngine | None = None,
+) -> list[SecretFinding]:
+    """Recursively scan every regular file under *root* for secrets.
+
+    Symlinks are not followed.  See :func:`scan_files` for *workers*
+    and *engine*.
+
+    Parameters
+    ----------
+    root:
+        Directory to sweep (e.g. a cloned target repo or sandbox volume).
+    skip_dirs:
+        Directories that are not descended into, as a name (``node_modules``)
+        or the trailing components of their path (``.git/objects``).
+
+    Returns
+    -------
+    list[SecretFinding]
+        Findings sorted by path and offset.
+    """
+
+    names = {d for d in skip_dirs if "/" not in d}
+    suffixes = tuple("/" + d.strip("/") for d in skip_dirs if "/" in d)
+
+    def skipped(entry: os.DirEntry[str]) -> bool:
+        return entry.name in names or (
+            bool(suffixes) and entry.path.replace(os.sep, "/").endswith(suffixes)
+        )
+
+    def walk() -> Iterator[Path]:
+        stack = [root]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not skipped(entry):
+                        stack.append(Path(entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    yield Path(entry.path)
+
+    return scan_files(walk(), workers=workers, engine=engine)
@@ -4,24 +4,55 @@ Modules in this package produce attack vectors at three levels:
 - **Application** — BOLA, injection, business-logic flaws.
 - **Middleware** — Broker, cache, and storage misconfigurations.
 - **Infrastructure** — Container escapes, Dockerfile flaws, resource exhaustion.
+
+Each module is imported on first use of one of its names.
 """
 
-from chaos_auditor.vectors.application import (
-    AttackVector,
-    generate_bola_vectors,
-    generate_injection_vectors,
-    generate_logic_flaw_vectors,
-)
-from chaos_auditor.vectors.infrastructure import (
-    generate_container_escape_vectors,
-    generate_dockerfile_vectors,
-    generate_resource_exhaustion_vectors,
-)
-from chaos_auditor.vectors.middleware import (
-    MiddlewareTarget,
-    generate_broker_vectors,
-    generate_cache_vectors,
-    generate_storage_vectors,
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from chaos_auditor._lazy import exports_by_name, resolve
+
+if TYPE_CHECKING:
+    from chaos_auditor.vectors.application import (
+        AttackVector,
+        generate_bola_vectors,
+        generate_injection_vectors,
+        generate_logic_flaw_vectors,
+    )
+    from chaos_auditor.vectors.infrastructure import (
+        generate_container_escape_vectors,
+        generate_dockerfile_vectors,
+        generate_resource_exhaustion_vectors,
+    )
+    from chaos_auditor.vectors.middleware import (
+        MiddlewareTarget,
+        generate_broker_vectors,
+        generate_cache_vectors,
+        generate_storage_vectors,
+    )
+
+_EXPORTS = exports_by_name(
+    {
+        "application": (
+            "AttackVector",
+            "generate_bola_vectors",
+            "generate_injection_vectors",
+            "generate_logic_flaw_vectors",
+        ),
+        "infrastructure": (
+            "generate_container_escape_vectors",
+            "generate_dockerfile_vectors",
+            "generate_resource_exhaustion_vectors",
+        ),
+        "middleware": (
+            "MiddlewareTarget",
+            "generate_broker_vectors",
+            "generate_cache_vectors",
+            "generate_storage_vectors",
+        ),
+    }
 )
 
 __all__ = [
@@ -37,3 +68,11 @@ __all__ = [
     "generate_resource_exhaustion_vectors",
     "generate_storage_vectors",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    return resolve(__name__, _EXPORTS, globals(), name)
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
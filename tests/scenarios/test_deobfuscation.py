@@ -0,0 +1,100 @@
+"""Tests for layered command deobfuscation."""
+
+from __future__ import annotations
+
+import base64
+
+import pytest
+
+from chaos_auditor.scenarios.command_parser import parse_command
+from chaos_auditor.scenarios.deobfuscation import MAX_DEOBFUSCATION_DEPTH, deobfuscate
+
+
+def b64(text: str) -> str:
+    return base64.b64encode(text.encode()).decode()
+
+
+def nest(payload: str, layers: int) -> str:
+    """Wrap *payload* in *layers* rounds of ``echo <base64> | base64 -d | sh``."""
+    for _ in range(layers):
+        payload = f"echo {b64(payload)} | base64 -d | sh"
+    return payload
+
+
+class TestDeobfuscate:
+    """Test recovery of hidden payloads."""
+
+    @pytest.mark.parametrize(
+        ("command", "payload", "path"),
+        [
+            (f"echo {b64('id')} | base64 -d | sh", "id", ("base64",)),
+            (f"base64 --decode <<< {b64('id')}", "id", ("base64",)),
+            ("echo NFSA==== | base32 -d", "id", ("base32",)),
+            ("echo 6964 | xxd -r -p | bash", "id", ("hex",)),
+            ("echo di | rev | sh", "id", ("rev",)),
+            ("printf '\\x69\\x64' | sh", "id", ("escape",)),
+            ("echo -e '\\151\\144' | sh", "id", ("escape",)),
+            ("bash <<< 'id'", "id", ("stdin",)),
+            ("echo id | sudo bash", "id", ("stdin",)),
+            (f"$(echo {b64('id')} | base64 -d)", "id", ("base64",)),
+            (f'bash -c "$(echo {b64("id")} | base64 -d)"', "id", ("base64",)),
+            (f"echo {b64('di')} | base64 -d | rev | sh", "id", ("base64", "rev")),
+        ],
+    )
+    def test_single_layer(self, command: str, payload: str, path: tuple[str, ...]) -> None:
+        result = deobfuscate(command)
+        assert result.layers[0].payload == payload
+        assert result.layers[0].path == path
+        assert not result.truncated
+
+    @pytest.mark.parametrize(
+        "command",
+        [
+            "ls -la",
+            "echo hello",
+            "echo hello > out.txt",
+            "cat notes.txt | base64 -d | sh",
+            "base64 -d payload.txt",
+            "echo '!!not base64!!' | base64 -d",
+            "bash -c id <<< ignored",
+            "echo hi | python3 script.py",
+        ],
+    )
+    def test_nothing_hidden(self, command: str) -> None:
+        assert deobfuscate(command).layers == ()
+
+    def test_nested_layers(self) -> None:
+        result = deobfuscate(nest("perl -e 1", 3))
+        assert result.layers[-1].payload == "perl -e 1"
+        assert result.layers[-1].path == ("base64", "base64", "base64")
+        assert [layer.depth for layer in result.layers] == [1, 2, 3]
+
+    def test_accepts_parse_tree(self) -> None:
+        assert deobfuscate(parse_command("echo di | rev | sh")).layers[0].payload == "id"
+
+    def test_repeated_fragments_expand_once(self) -> None:
+        # Every layer holds two copies of the next one: 2**8 paths, 8 layers.
+        payload = "id"
+        for _ in range(8):
+            inner = f"echo {b64(payload)} | base64 -d | sh"
+            payload = f"{inner}; {inner}"
+        result = deobfuscate(payload, max_work=10**9)
+        assert len(result.layers) == 8
+        assert not result.truncated
+
+    def test_depth_bound(self) -> None:
+        command = nest("id", MAX_DEOBFUSCATION_DEPTH + 2)
+        result = deobfuscate(command)
+        assert result.truncated
+        assert max(layer.depth for layer in result.layers) == MAX_DEOBFUSCATION_DEPTH
+        assert not deobfuscate(command, max_depth=MAX_DEOBFUSCATION_DEPTH + 2).truncated
+
+    def test_work_bound(self) -> None:
+        command = f"echo {b64('echo ' + 'a' * 1000)} | base64 -d"
+        assert deobfuscate(command, max_work=100).truncated
+        assert not deobfuscate(command, max_work=2000).truncated
+
+    @pytest.mark.parametrize(("max_depth", "max_work"), [(-1, 10), (1, -1)])
+    def test_rejects_negative_bounds(self, max_depth: int, max_work: int) -> None:
+        with pytest.raises(ValueError):
+            deobfuscate("ls", max_depth=max_depth, max_work=max_work)
@@ -0,0 +1,116 @@
+"""Tests for high-entropy token detection."""
+
+from __future__ import annotations
+
+import random
+import string
+
+import pytest
+
+from chaos_auditor.scenarios.entropy_detection import (
+    DEFAULT_ENTROPY_DETECTOR,
+    EntropyDetector,
+)
+from chaos_auditor.scenarios.secret_detection import REDACTION_MARKER, redact_secrets
+
+_BASE62 = string.ascii_letters + string.digits
+
+RANDOM_TOKENS = [
+    "9fK2xQ7LmZ3pR8vT1wY4bN6",
+    "Zq8Lw3Rt6YpK1vN9mXs4Bd7Hc2Fg5J",
+    "aB3dE5gH7jK9mN1pQ3sT5vW7yZ9bC1dF3hJ5",
+]
+
+NOT_RANDOM = [
+    "getUserAccountSettingsForOrganization",
+    "ThisIsAPerfectlyNormalClassName2",
+    "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",  # sha256
+    "da39a3ee5e6b4b0d3255bfef95601890afd80709",  # commit id
+    "550e8400-e29b-41d4-a716-446655440000",  # UUID
+    "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+    "short9fK2xQ",
+]
+
+
+def _random_token(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice(_BASE62) for _ in range(length))
+
+
+class TestIsRandom:
+    """Token scoring."""
+
+    @pytest.mark.parametrize("token", RANDOM_TOKENS)
+    def test_random_tokens_flagged(self, token: str) -> None:
+        assert DEFAULT_ENTROPY_DETECTOR.is_random(token)
+
+    @pytest.mark.parametrize("token", NOT_RANDOM)
+    def test_structured_tokens_not_flagged(self, token: str) -> None:
+        assert not DEFAULT_ENTROPY_DETECTOR.is_random(token)
+        assert list(DEFAULT_ENTROPY_DETECTOR.spans(token)) == []
+
+    def test_detection_rate_on_random_base62(self) -> None:
+        rng = random.Random(0)
+        tokens = [_random_token(rng, 40) for _ in range(500)]
+        flagged = sum(map(DEFAULT_ENTROPY_DETECTOR.is_random, tokens))
+        assert flagged >= 0.95 * len(tokens)
+
+    def test_random_tail_of_long_token_flagged(self) -> None:
+        token = "configurationvalueforthisservice" * 3 + RANDOM_TOKENS[1]
+        assert DEFAULT_ENTROPY_DETECTOR.is_random(token)
+
+
+class TestRedact:
+    """Span search and redaction."""
+
+    def test_prefixed_in_house_token(self) -> None:
+        text = "token=acme_live_9fK2xQ7LmZ3pR8vT1wY4bN6 rest"
+        assert DEFAULT_ENTROPY_DETECTOR.redact(text, REDACTION_MARKER) == (
+            f"token=acme_live_{REDACTION_MARKER} rest"
+        )
+
+    def test_spans_are_offsets_into_text(self) -> None:
+        text = f"a = '{RANDOM_TOKENS[0]}'\nb = '{RANDOM_TOKENS[1]}'"
+        spans = list(DEFAULT_ENTROPY_DETECTOR.spans(text))
+        assert [text[start:end] for start, end in spans] == RANDOM_TOKENS[:2]
+
+    def test_token_at_end_of_text(self) -> None:
+        text = f"key: {RANDOM_TOKENS[2]}"
+        assert DEFAULT_ENTROPY_DETECTOR.redact(text, "*") == "key: *"
+
+    def test_clean_text_returned_unchanged(self) -> None:
+        text = "def main() -> None:\n    return run_everything_in_sequence()\n"
+        assert DEFAULT_ENTROPY_DETECTOR.redact(text, REDACTION_MARKER) is text
+
+    def test_non_ascii_text_matches_ascii(self) -> None:
+        rng = random.Random(1)
+        tokens = [_random_token(rng, 30) for _ in range(50)]
+        ascii_text = " x ".join(tokens)
+        unicode_text = " é ".join(tokens)
+        ascii_spans = list(DEFAULT_ENTROPY_DETECTOR.spans(ascii_text))
+        unicode_spans = list(DEFAULT_ENTROPY_DETECTOR.spans(unicode_text))
+        assert ascii_spans == unicode_spans
+        assert len(unicode_spans) > 40
+
+    def test_redact_secrets_with_entropy(self) -> None:
+        text = "OPENAI=sk-abc123def456ghi789jkl012mno345 CUSTOM=9fK2xQ7LmZ3pR8vT1wY4bN6"
+        assert redact_secrets(text) == f"OPENAI={REDACTION_MARKER} CUSTOM=9fK2xQ7LmZ3pR8vT1wY4bN6"
+        assert redact_secrets(text, entropy=DEFAULT_ENTROPY_DETECTOR) == (
+            f"OPENAI={REDACTION_MARKER} CUSTOM={REDACTION_MARKER}"
+        )
+
+
+class TestValidation:
+    """Constructor arguments."""
+
+    def test_min_length_too_small(self) -> None:
+        with pytest.raises(ValueError, match="min_length must be at least 2"):
+            EntropyDetector(min_length=1)
+
+    def test_window_shorter_than_min_length(self) -> None:
+        with pytest.raises(ValueError, match="window must be at least min_length"):
+            EntropyDetector(min_length=24, window=16)
+
+    def test_custom_min_length(self) -> None:
+        detector = EntropyDetector(min_length=32)
+        assert not detector.is_random(RANDOM_TOKENS[0])
+        assert detector.is_random(RANDOM_TOKENS[2])
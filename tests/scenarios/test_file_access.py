@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
+import random
+
 import pytest
 
 from chaos_auditor.scenarios.file_access import (
     READ_BLOCKED_PATHS,
+    READ_RULES,
     WRITE_BLOCKED_PATHS,
+    WRITE_RULES,
     FileAccessScenario,
+    PathRule,
+    PathRuleTrie,
     check_read_safety,
     check_write_safety,
+    normalize_path,
+    reload_path_rules,
 )
 
 
@@ -82,12 +90,152 @@ class TestWriteBlocked:
 
 
 class TestFunctions:
-    """Test function stubs."""
+    """Test check_read_safety and check_write_safety."""
+
+    @pytest.mark.parametrize(
+        "scenario", READ_BLOCKED_PATHS, ids=[s.description for s in READ_BLOCKED_PATHS]
+    )
+    def test_read_blocked(self, scenario: FileAccessScenario) -> None:
+        classification, reason = check_read_safety(scenario.path)
+        assert classification == "blocked"
+        assert reason
+
+    @pytest.mark.parametrize(
+        "scenario", WRITE_BLOCKED_PATHS, ids=[s.description for s in WRITE_BLOCKED_PATHS]
+    )
+    def test_write_blocked(self, scenario: FileAccessScenario) -> None:
+        classification, reason = check_write_safety(scenario.path)
+        assert classification == "blocked"
+        assert reason
+
+    @pytest.mark.parametrize(
+        "path",
+        ["/etc/../etc/shadow", "//etc/shadow", "/etc/./gshadow", "/root/.ssh/id_ed25519"],
+    )
+    def test_read_blocked_after_normalization(self, path: str) -> None:
+        assert check_read_safety(path)[0] == "blocked"
+
+    @pytest.mark.parametrize(
+        ("path", "cwd"),
+        [
+            ("../../../../etc/shadow", "/home/user/project"),
+            ("etc/shadow", "/"),
+            ("./shadow", "/etc"),
+            ("../../root/.ssh/id_rsa", "/srv/app"),
+            ("../.ssh/id_ed25519", "/home/alice/project"),
+        ],
+    )
+    def test_read_blocked_relative(self, path: str, cwd: str) -> None:
+        assert check_read_safety(path, cwd=cwd)[0] == "blocked"
+
+    def test_relative_path_defaults_to_working_directory(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir("/")
+        assert check_read_safety("etc/shadow")[0] == "blocked"
+        assert check_write_safety("../../etc/sudoers")[0] == "blocked"
+        assert normalize_path("etc/shadow") == "/etc/shadow"
 
-    def test_check_read_safety_not_implemented(self) -> None:
-        with pytest.raises(NotImplementedError):
-            check_read_safety("/etc/shadow")
+    @pytest.mark.parametrize(("path", "cwd"), [("etc/shadow", "/tmp"), ("../shadow", "/tmp/etc")])
+    def test_relative_read_safe(self, path: str, cwd: str) -> None:
+        assert check_read_safety(path, cwd=cwd) == ("safe", None)
 
-    def test_check_write_safety_not_implemented(self) -> None:
-        with pytest.raises(NotImplementedError):
-            check_write_safety("/etc/passwd")
+    @pytest.mark.parametrize(
+        "path",
+        ["/etc/hostname", "/var/log/syslog", "/home/user/.ssh/id_rsa.pub", "/tmp/shadow"],
+    )
+    def test_read_safe(self, path: str) -> None:
+        assert check_read_safety(path) == ("safe", None)
+
+    @pytest.mark.parametrize("path", ["/tmp/out.txt", "/home/user/project/main.py", "/etc"])
+    def test_write_safe(self, path: str) -> None:
+        assert check_write_safety(path) == ("safe", None)
+
+
+def _linear_lookup(rules: list[PathRule], path: str) -> PathRule | None:
+    return next((rule for rule in rules if rule.matches(path)), None)
+
+
+class TestPathRuleTrie:
+    """Test the compiled path trie against per-rule matching."""
+
+    @pytest.mark.parametrize(
+        ("pattern", "path", "expected"),
+        [
+            ("/boot/**", "/boot", True),
+            ("/boot/**", "/boot/grub/grub.cfg", True),
+            ("/boot/**", "/bootx/vmlinuz", False),
+            ("/proc/*/environ", "/proc/1/environ", True),
+            ("/proc/*/environ", "/proc/1/task/2/environ", False),
+            ("/a/**/key", "/a/key", True),
+            ("/a/**/key", "/a/b/c/key", True),
+            ("~/.ssh/id_rsa", "/home/alice/.ssh/id_rsa", True),
+            ("~/.ssh/id_rsa", "/root/.ssh/id_rsa", True),
+            ("~/.ssh/id_rsa", "~/.ssh/id_rsa", True),
+            ("~/.ssh/id_rsa", "/srv/.ssh/id_rsa", False),
+        ],
+    )
+    def test_pattern_semantics(self, pattern: str, path: str, expected: bool) -> None:
+        rule = PathRule(pattern, "test")
+        assert rule.matches(path) is expected
+        assert (PathRuleTrie([rule]).lookup(path) is rule) is expected
+
+    @pytest.mark.parametrize(
+        ("path", "cwd", "expected"),
+        [
+            ("etc/shadow", "/", True),
+            ("../../etc/shadow", "/srv/app", True),
+            ("etc/shadow", "/srv", False),
+        ],
+    )
+    def test_matches_resolves_relative_paths(self, path: str, cwd: str, expected: bool) -> None:
+        assert PathRule("/etc/shadow", "test").matches(path, cwd=cwd) is expected
+
+    @pytest.mark.parametrize("rules", [READ_RULES, WRITE_RULES], ids=["read", "write"])
+    def test_matches_linear_scan(self, rules: list[PathRule]) -> None:
+        trie = PathRuleTrie(rules)
+        rng = random.Random(0)
+        parts = [
+            "etc",
+            "shadow",
+            "home",
+            "alice",
+            ".ssh",
+            "id_rsa",
+            "boot",
+            "bin",
+            "proc",
+            "1",
+            "environ",
+            "usr",
+            "lib",
+            "root",
+            "ssh",
+            "ssh_host_rsa_key",
+            "x",
+        ]
+        for _ in range(2000):
+            path = "/" + "/".join(rng.choice(parts) for _ in range(rng.randint(1, 5)))
+            assert trie.lookup(path) == _linear_lookup(rules, path), path
+
+    def test_first_listed_rule_wins(self) -> None:
+        rules = [PathRule("/srv/**", "subtree"), PathRule("/srv/app/key", "exact")]
+        assert PathRuleTrie(rules).lookup("/srv/app/key") is rules[0]
+
+    def test_large_deny_list(self) -> None:
+        rules = [PathRule(f"/data/team{i}/secret{i}.key", f"rule {i}") for i in range(20000)]
+        trie = PathRuleTrie(rules)
+        assert len(trie) == 20000
+        assert trie.lookup("/data/team12345/secret12345.key") is rules[12345]
+        assert trie.lookup("/data/team12345/secret1.key") is None
+
+    def test_reload_picks_up_new_rules(self) -> None:
+        rule = PathRule("/srv/secrets/**", "Test rule")
+        READ_RULES.append(rule)
+        try:
+            reload_path_rules()
+            assert check_read_safety("/srv/secrets/db.txt") == ("blocked", "Test rule")
+        finally:
+            READ_RULES.remove(rule)
+            reload_path_rules()
+        assert check_read_safety("/srv/secrets/db.txt") == ("safe", None)
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import base64
+
 import pytest
 
+from chaos_auditor.scenarios.command_parser import parse_command
 from chaos_auditor.scenarios.interpreter_evasion import (
     EVASION_PATTERNS,
     SAFE_REGRESSION,
@@ -78,6 +81,10 @@ class TestEvasionPatterns:
         techniques = {s.technique for s in EVASION_PATTERNS}
         assert "find_delete" in techniques
 
+    def test_covers_nested_obfuscation(self) -> None:
+        techniques = {s.technique for s in EVASION_PATTERNS}
+        assert "nested_obfuscation" in techniques
+
 
 class TestScriptGraylist:
     """Verify script execution graylist covers major interpreters."""
@@ -129,9 +136,58 @@ class TestSafeRegression:
             assert s.expected == "safe"
 
 
+ALL_SCENARIOS = EVASION_PATTERNS + SCRIPT_GRAYLIST + SAFE_REGRESSION
+
+
 class TestClassifyInterpreterCommand:
-    """Test the classify_interpreter_command stub."""
+    """Test classify_interpreter_command against the scenario catalogs."""
+
+    @pytest.mark.parametrize("scenario", ALL_SCENARIOS, ids=[s.command for s in ALL_SCENARIOS])
+    def test_scenario(self, scenario: EvasionScenario) -> None:
+        classification, _ = classify_interpreter_command(scenario.command)
+        assert classification == scenario.expected
 
-    def test_not_implemented(self) -> None:
-        with pytest.raises(NotImplementedError):
-            classify_interpreter_command("python3 -c 'import os'")
+    @pytest.mark.parametrize(
+        "command",
+        [
+            "sudo python3.11 -c 'import os'",
+            "ls; perl -E 'say 1'",
+            "env FOO=1 bash -c id",
+            "timeout 5 node --eval '1'",
+            "powershell -EncodedCommand ZQBjAGgAbwA=",
+            "cat payload | base64 --decode | python3",
+            "find . -name '*.tmp' -exec /bin/rm {} +",
+        ],
+    )
+    def test_blocks_wrapped_and_chained(self, command: str) -> None:
+        assert classify_interpreter_command(command)[0] == "blocked"
+
+    @pytest.mark.parametrize(
+        "command",
+        ["python3 -m pip list", "base64 -d payload.txt > out.bin", "find . -name '*.py'"],
+    )
+    def test_stays_safe(self, command: str) -> None:
+        assert classify_interpreter_command(command) == ("safe", None)
+
+    def test_reports_deobfuscated_layers(self) -> None:
+        classification, reason = classify_interpreter_command(
+            "echo ZWNobyAnMSBlLSBscmVwJyB8IHJldiB8IHNo | base64 -d > stage2.sh"
+        )
+        assert classification == "blocked"
+        assert reason == "Inline perl code execution (deobfuscated: base64 > rev)"
+
+    def test_deobfuscated_script_needs_confirmation(self) -> None:
+        assert classify_interpreter_command("echo ./deploy.sh | bash") == (
+            "confirm",
+            "Script execution: ./deploy.sh (deobfuscated: stdin)",
+        )
+
+    def test_too_deep_needs_confirmation(self) -> None:
+        command = "id"
+        for _ in range(12):
+            command = f"echo {base64.b64encode(command.encode()).decode()} | base64 -d"
+        assert classify_interpreter_command(command)[0] == "confirm"
+
+    def test_accepts_parse_tree(self) -> None:
+        parsed = parse_command("bash deploy.sh")
+        assert classify_interpreter_command(parsed)[0] == "confirm"
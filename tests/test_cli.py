@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import json
+from pathlib import Path
+
 from click.testing import CliRunner
 
 from chaos_auditor.cli import main
@@ -39,3 +42,28 @@ class TestCLI:
         result = runner.invoke(main, ["recon"])
         assert result.exit_code != 0
         assert "Missing option" in result.output or "required" in result.output.lower()
+
+    def test_recon_local_repo(self, tmp_path: Path) -> None:
+        (tmp_path / "repo").mkdir()
+        (tmp_path / "repo/app.py").write_text("@app.post('/webhooks/github')\ndef hook(): ...\n")
+        (tmp_path / "repo/requirements.txt").write_text("flask\n")
+        cache = str(tmp_path / "recon.json")
+        args = ["recon", "--repo", str(tmp_path / "repo"), "--cache-file", cache]
+        runner = CliRunner()
+        result = runner.invoke(main, args)
+        assert result.exit_code == 0, result.output
+        assert "Frameworks: flask" in result.output
+        assert "POST    /webhooks/github  [open]  app.py:1" in result.output
+        assert "Analysed 2 files, reused 0 cached results." in result.output
+
+        result = runner.invoke(main, [*args, "--output-format", "json"])
+        assert result.exit_code == 0, result.output
+        data = json.loads(result.output)
+        assert (data["analysed"], data["reused"]) == (0, 2)
+        assert data["surface"]["webhooks"] == ["/webhooks/github"]
+
+    def test_recon_rejects_unknown_target(self, tmp_path: Path) -> None:
+        runner = CliRunner()
+        result = runner.invoke(main, ["recon", "--repo", str(tmp_path / "missing")])
+        assert result.exit_code != 0
+        assert "neither a directory nor a URL" in result.output
@@ -0,0 +1,104 @@
+"""Tests for the lazy package namespaces and the import-time budget."""
+
+from __future__ import annotations
+
+import importlib
+import json
+import subprocess
+import sys
+
+import pytest
+
+LAZY_PACKAGES = ("chaos_auditor.scenarios", "chaos_auditor.vectors", "chaos_auditor.recon")
+
+# Generous wall-clock budgets, in seconds, for a fresh interpreter.  They
+# catch a package going back to eager imports, not small regressions.
+IMPORT_BUDGETS = {
+    "import chaos_auditor.scenarios": 0.1,
+    "from chaos_auditor.scenarios import redact_secrets": 0.25,
+    "from chaos_auditor.guard.client import GuardClient": 0.1,
+}
+
+PROBE_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+exec(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def probe(statement: str) -> dict[str, object]:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE_SCRIPT, statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded: dict[str, object] = json.loads(result.stdout)
+    return loaded
+
+
+def loaded_modules(statement: str) -> set[str]:
+    modules = probe(statement)["modules"]
+    assert isinstance(modules, list)
+    return set(modules)
+
+
+class TestLazyNamespaces:
+    """Test that package attributes resolve on first access."""
+
+    @pytest.mark.parametrize("package", LAZY_PACKAGES)
+    def test_import_loads_no_submodules(self, package: str) -> None:
+        modules = loaded_modules(f"import {package}")
+        assert not {m for m in modules if m.startswith(f"{package}.")}
+
+    @pytest.mark.parametrize("package", LAZY_PACKAGES)
+    def test_every_export_resolves(self, package: str) -> None:
+        module = importlib.import_module(package)
+        for name in module.__all__:
+            getattr(module, name)
+            assert name in vars(module)  # cached after the first access
+
+    @pytest.mark.parametrize("package", LAZY_PACKAGES)
+    def test_dir_lists_exports(self, package: str) -> None:
+        module = importlib.import_module(package)
+        assert set(module.__all__) <= set(dir(module))
+
+    @pytest.mark.parametrize("package", LAZY_PACKAGES)
+    def test_unknown_attribute(self, package: str) -> None:
+        module = importlib.import_module(package)
+        with pytest.raises(AttributeError, match="no_such_name"):
+            module.no_such_name
+
+    def test_star_import(self) -> None:
+        namespace: dict[str, object] = {}
+        exec("from chaos_auditor.scenarios import *", namespace)
+        assert "classify_command" in namespace
+        assert "wrap_tool_output" in namespace
+
+    def test_access_loads_only_the_defining_module(self) -> None:
+        modules = loaded_modules("from chaos_auditor.scenarios import redact_secrets")
+        assert "chaos_auditor.scenarios.secret_detection" in modules
+        assert "chaos_auditor.scenarios.command_safety" not in modules
+        assert "chaos_auditor.scenarios.batch" not in modules
+        assert "concurrent.futures" not in modules
+
+    def test_guard_client_skips_catalogs(self) -> None:
+        modules = loaded_modules("from chaos_auditor.guard.client import GuardClient")
+        assert not {m for m in modules if m.startswith("chaos_auditor.scenarios")}
+        assert "tempfile" not in modules
+
+
+class TestImportBudget:
+    """Test that cold imports stay within their time budgets."""
+
+    @pytest.mark.parametrize(("statement", "budget"), sorted(IMPORT_BUDGETS.items()))
+    def test_within_budget(self, statement: str, budget: float) -> None:
+        # Best of three, so a busy machine does not fail the test.
+        timings = []
+        for _ in range(3):
+            elapsed = probe(statement)["elapsed"]
+            assert isinstance(elapsed, float)
+            timings.append(elapsed)
+        assert min(timings) < budget, f"{statement!r} took {min(timings):.3f}s"
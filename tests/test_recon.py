@@ -2,22 +2,235 @@
 
 from __future__ import annotations
 
+import json
+import os
+import shutil
+import subprocess
 from pathlib import Path
 
 import pytest
 
 from chaos_auditor import Severity
+from chaos_auditor.recon import repo_mapper
+from chaos_auditor.recon.dependency_audit import (
+    VulnerablePackage,
+    audit_dependencies,
+    scan_manifests,
+)
+from chaos_auditor.recon.recon_cache import (
+    git_blob_ids,
+    needs_content,
+    recon_cache_path,
+    run_recon,
+)
+from chaos_auditor.recon.repo_index import IndexedFile, RepoIndex
 from chaos_auditor.recon.repo_mapper import RepoProfile, detect_stack
-from chaos_auditor.recon.surface_analyzer import AttackSurface, map_attack_surface
-from chaos_auditor.recon.dependency_audit import VulnerablePackage, audit_dependencies
+from chaos_auditor.recon.repo_walker import language_for, sniff_language, walk_repo
+from chaos_auditor.recon.surface_analyzer import (
+    AttackSurface,
+    Endpoint,
+    extract_endpoints,
+    map_attack_surface,
+    map_endpoints,
+)
+
+STACK_TREE: dict[str, str | bytes] = {
+    "api/app.py": "",
+    "api/models.py": "",
+    "api/requirements-dev.txt": "pytest\n",
+    "api/requirements.txt": "Django==4.2\ndjangorestframework\n",
+    "pyproject.toml": '[build-system]\nbuild-backend = "hatchling.build"\n',
+    "web/package.json": '{"dependencies": {"react": "^18", "react-dom": "^18"}}',
+    "web/src/index.ts": "",
+    "web/node_modules/express/package.json": '{"name": "express"}',
+    "scripts/deploy": "#!/bin/sh\necho deploy\n",
+    "Makefile": "all:\n",
+    "README": "#!not a script",
+}
+
+SERVICE_TREE: dict[str, str | bytes] = {
+    "app/views.py": (
+        "@app.route('/users/<int:user_id>', methods=['GET', 'DELETE'])\n"
+        "@login_required\n"
+        "def user(user_id): ...\n"
+        "\n"
+        "@app.post('/webhooks/stripe')\n"
+        "def stripe(): ...\n"
+    ),
+    "app/urls.py": "urlpatterns = [path('authors/<slug:name>/', views.author)]\n",
+    "app/migrations/0001_initial.py": "",
+    "web/server.js": (
+        "app.get('/health', (req, res) => res.send('ok'))\n"
+        "router.post('/orders/:orderId', authMiddleware, createOrder)\n"
+    ),
+    "db/schema.sql": "CREATE TABLE users (id int);\n",
+    "requirements.txt": "flask\n",
+}
+
+
+def make_tree(root: Path, files: dict[str, str | bytes]) -> Path:
+    for rel, content in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            path.write_bytes(content)
+        else:
+            path.write_text(content)
+    return root
+
+
+def git(root: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=csa", "-c", "user.email=csa@example.com", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+
+
+needs_git = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def walked(root: Path, *, workers: int | None = None, gitignore: bool = True) -> list[str]:
+    return sorted(f.path for f in walk_repo(root, workers=workers, gitignore=gitignore))
+
+
+class TestRepoWalker:
+    """Tests for repo_walker module."""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_prunes_vcs_and_dependency_dirs(self, tmp_path: Path, workers: int) -> None:
+        make_tree(
+            tmp_path,
+            {
+                "src/app.py": "",
+                "src/lib/util.py": "",
+                ".git/config": "",
+                "web/node_modules/react/index.js": "",
+                "vendor/github.com/x/y.go": "",
+                "pkg/__pycache__/app.cpython-311.pyc": "",
+            },
+        )
+        assert walked(tmp_path, workers=workers) == ["src/app.py", "src/lib/util.py"]
+
+    @pytest.mark.parametrize(
+        ("gitignore", "ignored"),
+        [
+            ("*.log", {"app.log", "src/debug.log"}),
+            ("/app.log", {"app.log"}),
+            ("build/", {"build/out.js", "src/build/gen.py"}),
+            ("src/*.log", {"src/debug.log"}),
+            ("**/gen.py", {"src/build/gen.py"}),
+            ("src/**", {"src/debug.log", "src/build/gen.py", "src/main.py"}),
+            ("*.log\n!src/debug.log", {"app.log"}),
+            ("# comment\n\n[ab]pp.lo?", {"app.log"}),
+        ],
+    )
+    def test_gitignore(self, tmp_path: Path, gitignore: str, ignored: set[str]) -> None:
+        tree = {
+            "app.log": "",
+            "build/out.js": "",
+            "src/debug.log": "",
+            "src/build/gen.py": "",
+            "src/main.py": "",
+        }
+        make_tree(tmp_path, {**tree, ".gitignore": gitignore})
+        expected = sorted({*tree, ".gitignore"} - ignored)
+        assert walked(tmp_path, workers=1) == expected
+        assert walked(tmp_path, workers=3) == expected
+
+    def test_nested_gitignore_is_relative(self, tmp_path: Path) -> None:
+        make_tree(
+            tmp_path,
+            {
+                "a/.gitignore": "/out\n",
+                "a/out/x.py": "",
+                "out/y.py": "",
+                ".git/info/exclude": "*.tmp\n",
+                "a/z.tmp": "",
+            },
+        )
+        assert walked(tmp_path) == ["a/.gitignore", "out/y.py"]
+        assert len(walked(tmp_path, gitignore=False)) == 4
+
+    def test_stat(self, tmp_path: Path) -> None:
+        make_tree(tmp_path, {"a.txt": "abc"})
+        (file,) = walk_repo(tmp_path, stat=True)
+        assert (file.name, file.size) == ("a.txt", 3)
+        assert file.mtime_ns == (tmp_path / "a.txt").stat().st_mtime_ns
+        (file,) = walk_repo(tmp_path)
+        assert file.size is None
+
+    def test_symlinks_not_followed(self, tmp_path: Path) -> None:
+        make_tree(tmp_path, {"real/a.py": ""})
+        (tmp_path / "link").symlink_to(tmp_path / "real")
+        (tmp_path / "b.py").symlink_to(tmp_path / "real" / "a.py")
+        assert walked(tmp_path) == ["real/a.py"]
+
+    @pytest.mark.parametrize(
+        ("name", "language"),
+        [("app.py", "Python"), ("Main.JAVA", "Java"), ("x.tsx", "TypeScript"), (".bashrc", None)],
+    )
+    def test_language_for(self, name: str, language: str | None) -> None:
+        assert language_for(name) == language
+
+    @pytest.mark.parametrize(
+        ("head", "language"),
+        [
+            (b"#!/usr/bin/env python3\nimport os\n", "Python"),
+            (b"#!/bin/bash -e\n", "Shell"),
+            (b"#! /usr/bin/env -S node --harmony\n", "JavaScript"),
+            (b"\x7fELF\x02\x01", None),
+            (b"plain text", None),
+        ],
+    )
+    def test_sniff_language(self, head: bytes, language: str | None) -> None:
+        assert sniff_language(head) == language
 
 
 class TestRepoMapper:
     """Tests for repo_mapper module."""
 
-    def test_detect_stack_not_implemented(self, tmp_path: Path) -> None:
-        with pytest.raises(NotImplementedError):
-            detect_stack(tmp_path)
+    def test_detect_stack(self, tmp_path: Path) -> None:
+        make_tree(tmp_path, STACK_TREE)
+        profile = detect_stack(tmp_path)
+        assert profile.path == tmp_path
+        assert profile.languages == ["Python", "Shell", "TypeScript"]
+        assert profile.frameworks == ["django", "react"]
+        assert profile.build_systems == ["hatch", "make", "npm"]
+        assert profile.package_files == [
+            tmp_path / "api/requirements-dev.txt",
+            tmp_path / "api/requirements.txt",
+            tmp_path / "pyproject.toml",
+            tmp_path / "web/package.json",
+        ]
+
+    def test_settled_markers_stop_reads(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        modules = ["gin-gonic/gin", "labstack/echo", "gofiber/fiber", "gorilla/mux"]
+        go_mod = "".join(f"require github.com/{m} v1.0.0\n" for m in modules)
+        make_tree(tmp_path, {f"svc{i}/go.mod": go_mod for i in range(3)})
+        reads: list[Path] = []
+        read = repo_mapper._read
+
+        def counting_read(path: Path, size: int) -> bytes:
+            reads.append(path)
+            return read(path, size)
+
+        monkeypatch.setattr(repo_mapper, "_read", counting_read)
+        profile = detect_stack(tmp_path)
+        assert profile.frameworks == ["echo", "fiber", "gin", "gorilla/mux"]
+        assert len(profile.package_files) == 3
+        assert len(reads) == 1
+
+    def test_index_gives_same_profile(self, tmp_path: Path) -> None:
+        make_tree(tmp_path, STACK_TREE)
+        index = RepoIndex.build(tmp_path)
+        assert detect_stack(tmp_path, index=index) == detect_stack(tmp_path)
+
+    def test_empty_repo(self, tmp_path: Path) -> None:
+        assert detect_stack(tmp_path) == RepoProfile(path=tmp_path)
 
     def test_repo_profile_defaults(self) -> None:
         profile = RepoProfile(path=Path("."))
@@ -28,9 +241,63 @@ class TestRepoMapper:
 class TestSurfaceAnalyzer:
     """Tests for surface_analyzer module."""
 
-    def test_map_attack_surface_not_implemented(self, tmp_path: Path) -> None:
-        with pytest.raises(NotImplementedError):
-            map_attack_surface(tmp_path)
+    def test_map_endpoints(self, tmp_path: Path) -> None:
+        make_tree(tmp_path, SERVICE_TREE)
+        assert map_endpoints(tmp_path) == [
+            Endpoint("ANY", "/authors/<slug:name>/", False, ["name"], "app/urls.py:1"),
+            Endpoint("GET", "/users/<int:user_id>", True, ["user_id"], "app/views.py:1"),
+            Endpoint("DELETE", "/users/<int:user_id>", True, ["user_id"], "app/views.py:1"),
+            Endpoint("POST", "/webhooks/stripe", False, [], "app/views.py:5"),
+            Endpoint("GET", "/health", False, [], "web/server.js:1"),
+            Endpoint("POST", "/orders/:orderId", True, ["orderId"], "web/server.js:2"),
+        ]
+
+    @pytest.mark.parametrize(
+        ("path", "source", "expected"),
+        [
+            (
+                "main.py",
+                "@router.get('/items/{item_id}')\n"
+                "async def item(item_id: int, user=Depends(get_current_user)): ...\n",
+                [("GET", "/items/{item_id}", True)],
+            ),
+            (
+                "Api.java",
+                '@PreAuthorize("hasRole(\'ADMIN\')")\n@PostMapping(value = "/admin/users")\n',
+                [("POST", "/admin/users", True)],
+            ),
+            (
+                "main.go",
+                'r.GET("/ping", ping)\nhttp.HandleFunc("/", index)\n',
+                [
+                    ("GET", "/ping", False),
+                    ("ANY", "/", False),
+                ],
+            ),
+            ("routes.rb", "get '/status', to: 'status#show'\n", [("GET", "/status", False)]),
+            (
+                "web.php",
+                "Route::put('/posts/{post}', [PostController::class, 'update']);\n",
+                [
+                    ("PUT", "/posts/{post}", False),
+                ],
+            ),
+            ("ctl.ts", "@Get(':id')\n@UseGuards(AuthGuard)\nfind() {}\n", [("GET", "/:id", True)]),
+            ("notes.md", "app.get('/nope')", []),
+        ],
+    )
+    def test_extract_endpoints(
+        self, path: str, source: str, expected: list[tuple[str, str, bool]]
+    ) -> None:
+        endpoints = extract_endpoints(path, source.encode())
+        assert [(e.method, e.path, e.auth_required) for e in endpoints] == expected
+
+    def test_map_attack_surface(self, tmp_path: Path) -> None:
+        make_tree(tmp_path, SERVICE_TREE)
+        surface = map_attack_surface(tmp_path)
+        assert len(surface.endpoints) == 6
+        assert surface.webhooks == ["/webhooks/stripe"]
+        assert surface.db_schemas == ["app/migrations/0001_initial.py", "db/schema.sql"]
 
     def test_attack_surface_defaults(self) -> None:
         surface = AttackSurface()
@@ -41,6 +308,12 @@ class TestSurfaceAnalyzer:
 class TestDependencyAudit:
     """Tests for dependency_audit module."""
 
+    def test_scan_manifests(self, tmp_path: Path) -> None:
+        make_tree(tmp_path, STACK_TREE)
+        manifests = scan_manifests(tmp_path)
+        assert manifests == detect_stack(tmp_path).package_files
+        assert scan_manifests(tmp_path, index=RepoIndex.build(tmp_path)) == manifests
+
     def test_audit_dependencies_not_implemented(self, tmp_path: Path) -> None:
         with pytest.raises(NotImplementedError):
             audit_dependencies(tmp_path / "requirements.txt")
@@ -49,3 +322,160 @@ class TestDependencyAudit:
         pkg = VulnerablePackage(name="example", installed_version="1.0.0")
         assert pkg.severity is Severity.INFO
         assert pkg.fixed_version is None
+
+
+class TestRepoIndex:
+    """Tests for repo_index module."""
+
+    def test_build(self, tmp_path: Path) -> None:
+        make_tree(tmp_path, {**STACK_TREE, "logo.png": b"\x89PNG" + bytes(100)})
+        index = RepoIndex.build(tmp_path)
+        assert len(index) == len(STACK_TREE)  # one in node_modules, plus logo.png
+        assert [f.path for f in index] == sorted(f.path for f in index)
+        app = index.get("api/app.py")
+        assert app == IndexedFile(
+            "api/app.py", 0, (tmp_path / "api/app.py").stat().st_mtime_ns, "Python"
+        )
+        assert index.get("scripts/deploy") == IndexedFile(
+            "scripts/deploy", 22, (tmp_path / "scripts/deploy").stat().st_mtime_ns, "Shell"
+        )
+        assert "Makefile" in index and "missing" not in index
+        assert index.cached("web/package.json")
+        assert not index.cached("logo.png")
+        assert index.read("logo.png", 4) == b"\x89PNG"
+        assert index.read("Makefile", 3) == b"all"
+        assert index.read("missing") == b""
+
+    def test_cache_limits(self, tmp_path: Path) -> None:
+        make_tree(tmp_path, {"a.py": "x" * 10, "b.py": "y" * 10, "big.py": "z" * 100})
+        index = RepoIndex.build(tmp_path, max_file_bytes=50, max_cache_bytes=15, workers=1)
+        assert not index.cached("big.py")
+        assert index.cached("a.py") != index.cached("b.py")
+        assert index.read("big.py") == b"z" * 100
+
+    @pytest.mark.parametrize("param", ["max_file_bytes", "max_cache_bytes"])
+    def test_invalid_limits(self, tmp_path: Path, param: str) -> None:
+        with pytest.raises(ValueError, match=f"{param} must be non-negative"):
+            RepoIndex.build(tmp_path, **{param: -1})  # type: ignore[arg-type]
+
+    def test_recon_reads_disk_once(self, tmp_path: Path) -> None:
+        make_tree(tmp_path, {**STACK_TREE, **SERVICE_TREE})
+        expected = (
+            detect_stack(tmp_path),
+            scan_manifests(tmp_path),
+            map_endpoints(tmp_path),
+            map_attack_surface(tmp_path),
+        )
+        index = RepoIndex.build(tmp_path)
+        for file in index:
+            (tmp_path / file.path).write_bytes(b"")  # later reads would see this
+        assert (
+            detect_stack(tmp_path, index=index),
+            scan_manifests(tmp_path, index=index),
+            map_endpoints(tmp_path, index=index),
+            map_attack_surface(tmp_path, index=index),
+        ) == expected
+
+    def test_walker_reads_on_threads(self, tmp_path: Path) -> None:
+        make_tree(tmp_path, {"a.py": "print(1)\n", "b.txt": "text\n"})
+        files = {f.path: f for f in walk_repo(tmp_path, read_if=lambda f: f.name.endswith(".py"))}
+        assert files["a.py"].content == b"print(1)\n"
+        assert files["a.py"].size == 9
+        assert files["b.txt"].content is None
+
+
+class TestReconCache:
+    """Tests for recon_cache module."""
+
+    def test_reuses_unchanged_files(self, tmp_path: Path) -> None:
+        root = make_tree(tmp_path / "repo", {**STACK_TREE, **SERVICE_TREE})
+        cache = str(tmp_path / "recon.json")
+        content_files = sum(needs_content(f.name) for f in RepoIndex.build(root))
+        first = run_recon(root, cache_file=cache)
+        assert (first.analysed, first.reused) == (content_files, 0)
+        second = run_recon(root, cache_file=cache)
+        assert (second.analysed, second.reused) == (0, content_files)
+        assert (second.profile, second.surface) == (first.profile, first.surface)
+
+        views = root / "app/views.py"
+        views.write_text(views.read_text() + "@app.get('/callbacks/ping')\ndef ping(): ...\n")
+        (root / "app/urls.py").unlink()
+        third = run_recon(root, cache_file=cache)
+        assert (third.analysed, third.reused) == (1, content_files - 2)
+        assert "/callbacks/ping" in third.surface.webhooks
+        assert "/authors/<slug:name>/" not in [e.path for e in third.surface.endpoints]
+        assert "app/urls.py" not in json.loads((tmp_path / "recon.json").read_text())["files"]
+
+    def test_matches_uncached_recon(self, tmp_path: Path) -> None:
+        root = make_tree(tmp_path / "repo", {**STACK_TREE, **SERVICE_TREE})
+        cache = str(tmp_path / "recon.json")
+        run_recon(root, cache_file=cache)
+        (root / "web/package.json").write_text('{"dependencies": {"express": "^4"}}')
+        result = run_recon(root, cache_file=cache)
+        index = RepoIndex.build(root)
+        assert result.profile == detect_stack(root, index=index)
+        assert result.surface == map_attack_surface(root, index=index)
+        assert "Shell" in result.profile.languages  # sniffed on the first run
+        assert "express" in result.profile.frameworks and "react" not in result.profile.frameworks
+
+    @pytest.mark.parametrize("body", ["{not json", '{"format": 1, "source_hash": "old"}', "[]"])
+    def test_ignores_corrupt_or_stale_cache(self, tmp_path: Path, body: str) -> None:
+        root = make_tree(tmp_path / "repo", SERVICE_TREE)
+        cache = tmp_path / "recon.json"
+        cache.write_text(body)
+        result = run_recon(root, cache_file=str(cache))
+        assert result.reused == 0 and result.analysed > 0
+        assert run_recon(root, cache_file=str(cache)).analysed == 0
+
+    def test_no_cache(self, tmp_path: Path) -> None:
+        root = make_tree(tmp_path / "repo", SERVICE_TREE)
+        cache = tmp_path / "recon.json"
+        run_recon(root, cache_file=str(cache), use_cache=False)
+        assert not cache.exists()
+        run_recon(root, cache_file=str(cache))
+        assert run_recon(root, cache_file=str(cache), use_cache=False).reused == 0
+
+    @needs_git
+    def test_git_blobs_survive_touch(self, tmp_path: Path) -> None:
+        root = make_tree(tmp_path / "repo", SERVICE_TREE)
+        git(root, "init", "-q")
+        git(root, "add", ".")
+        git(root, "commit", "-q", "-m", "init")
+        (root / "untracked.py").write_text("")
+        blobs = git_blob_ids(root)
+        assert set(blobs) == set(SERVICE_TREE)
+        assert git_blob_ids(root / "app")["views.py"] == blobs["app/views.py"]
+
+        cache = str(tmp_path / "recon.json")
+        run_recon(root, cache_file=cache)
+        views = root / "app/views.py"
+        os.utime(views, ns=(1, 1))  # a checkout rewrites the file, not its contents
+        (root / "untracked.py").write_text("# changed\n")
+        result = run_recon(root, cache_file=cache)
+        assert result.analysed == 1  # untracked.py, keyed by mtime and size
+        views.write_text("")
+        assert "app/views.py" not in git_blob_ids(root)
+        assert run_recon(root, cache_file=cache).analysed == 1
+
+    def test_git_blob_ids_outside_work_tree(self, tmp_path: Path) -> None:
+        assert git_blob_ids(tmp_path) == {}
+
+    def test_cache_path(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path / "state"))
+        path = recon_cache_path(tmp_path)
+        assert path.startswith(str(tmp_path / "state" / "csa" / "recon"))
+        assert path == recon_cache_path(str(tmp_path / "." / ""))
+        assert recon_cache_path("https://example.com/a.git") != recon_cache_path(
+            "https://example.com/b.git"
+        )
+
+    @needs_git
+    def test_clone_repo(self, tmp_path: Path) -> None:
+        source = make_tree(tmp_path / "source", SERVICE_TREE)
+        git(source, "init", "-q")
+        git(source, "add", ".")
+        git(source, "commit", "-q", "-m", "init")
+        dest = repo_mapper.clone_repo(source.as_uri(), tmp_path / "clone")
+        assert (dest / "app/views.py").read_text() == SERVICE_TREE["app/views.py"]
+        with pytest.raises(RuntimeError, match="git clone"):
+            repo_mapper.clone_repo((tmp_path / "missing").as_uri(), tmp_path / "other")